@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+CPU latency and memory of the episodic embedder backends.
+
+Each backend runs in a fresh subprocess so import time and peak RSS are
+its own. Reports load time (import + model load), peak RSS, p50 latency
+for one short utterance (the per-turn case) and for a batch of 32, and the
+minimum cosine similarity of its vectors against the first backend listed,
+i.e. whether existing stores stay searchable without re-embedding.
+
+Needs sentence-transformers for 'torch' and onnxruntime + tokenizers plus
+scripts/download_embedder.sh for the ONNX backends.
+
+Usage:
+    python memorylib/benchmarks/bench_embedders.py --onnx-dir models/all-MiniLM-L6-v2
+    python memorylib/benchmarks/bench_embedders.py --onnx-dir ... --backends onnx onnx-int8
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+SENTENCES = [
+    "Kabir: tell me a joke Robot: Why did the dinosaur cross the road?",
+    "Kabir: my dog Biscuit likes to chase balls Robot: Biscuit sounds fun!",
+    "Kabir: I am scared of the dark Robot: Lots of people are, even grown-ups.",
+    "Kabir: what is the biggest truck Robot: Mining trucks are the biggest!",
+] * 8
+
+_CHILD = r"""
+import json, resource, sys, time
+import numpy as np
+sys.path.insert(0, {src!r})
+start = time.perf_counter()
+backend = {backend!r}
+if backend == "torch":
+    from memorylib.embedders import SentenceTransformerEmbedder
+    model = SentenceTransformerEmbedder()
+else:
+    from memorylib.embedders import OnnxEmbedder
+    model = OnnxEmbedder({onnx_dir!r}, quantized=backend == "onnx-int8")
+model.encode("warm up")
+load = time.perf_counter() - start
+sentences = {sentences!r}
+single = []
+for s in sentences:
+    t = time.perf_counter(); model.encode(s); single.append(time.perf_counter() - t)
+batch = []
+for _ in range(5):
+    t = time.perf_counter(); vectors = model.encode(sentences, batch_size=32); batch.append(time.perf_counter() - t)
+np.save({out!r}, np.asarray(vectors, dtype=np.float32))
+rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps({{"load": load, "single": float(np.median(single)), "batch": float(np.median(batch)), "rss": rss_mb}}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx", "onnx-int8"])
+    parser.add_argument("--onnx-dir", default=os.path.join("models", "all-MiniLM-L6-v2"))
+    args = parser.parse_args()
+
+    src = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+    reference = None
+    print(f"{'backend':>10} {'load':>8} {'peak RSS':>10} {'1 text':>10} {'32 texts':>10} {'min cos':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in args.backends:
+            out = os.path.join(tmp, f"{backend}.npy")
+            code = _CHILD.format(src=src, backend=backend, onnx_dir=args.onnx_dir, sentences=SENTENCES, out=out)
+            proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+            if proc.returncode != 0:
+                print(f"{backend:>10} failed: {proc.stderr.strip().splitlines()[-1]}")
+                continue
+            r = json.loads(proc.stdout.strip().splitlines()[-1])
+            vectors = np.load(out)
+            if reference is None:
+                reference = vectors
+            cos = float(np.min(np.sum(vectors * reference, axis=1)))
+            print(f"{backend:>10} {r['load']:>7.2f}s {r['rss']:>8.0f}MB {r['single'] * 1e3:>8.2f}ms "
+                  f"{r['batch'] * 1e3:>8.1f}ms {cos:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
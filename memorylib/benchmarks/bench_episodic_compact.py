@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Compaction of a large synthetic episodic log.
+
+Writes a log of -n turns in which a share are exact repeats, a share are
+near-duplicates of the previous turn (same text with different
+punctuation, vector nudged) and a few have non-finite embeddings. Reports
+startup time and on-disk size before compaction, compact() time and its
+counts, and startup time and size afterwards.
+
+Usage:
+    python memorylib/benchmarks/bench_episodic_compact.py
+    python memorylib/benchmarks/bench_episodic_compact.py -n 200000 --dim 384
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+from common import DIM, clustered_unit_rows
+
+from memorylib import EpisodicStore
+from memorylib.episodic import _Entry
+
+_BLOCK = 50_000
+
+
+def _fill(store: EpisodicStore, n: int, dim: int, repeats: float, near: float, broken: float) -> None:
+    rng = np.random.default_rng(0)
+    for start in range(0, n, _BLOCK):
+        count = min(_BLOCK, n - start)
+        vectors = clustered_unit_rows(count, dim, seed=start)
+        texts = [f"Kabir: tell me about thing {start + i} Robot: thing {start + i} is great" for i in range(count)]
+        roll = rng.random(count)
+        for i in np.flatnonzero(roll < repeats):
+            texts[i], vectors[i] = "Kabir: tell me a joke Robot: why did the robot cross the road?", vectors[0]
+        for i in np.flatnonzero((roll >= repeats) & (roll < repeats + near))[1:]:
+            texts[i] = texts[i - 1] + "!"
+            vectors[i] = vectors[i - 1] + 0.01 * rng.standard_normal(dim).astype(np.float32)
+            vectors[i] /= np.linalg.norm(vectors[i])
+        vectors[roll > 1 - broken] = np.nan
+        store._add([_Entry("2026-01-01T00:00:00", t) for t in texts], vectors)
+
+
+def _size_mb(directory: str) -> float:
+    return sum(os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory)) / 1e6
+
+
+def _startup(path: str) -> float:
+    start = time.perf_counter()
+    EpisodicStore(path)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=1_000_000, help="log lines")
+    parser.add_argument("--dim", type=int, default=DIM)
+    parser.add_argument("--repeats", type=float, default=0.10, help="share of exact repeated turns")
+    parser.add_argument("--near", type=float, default=0.05, help="share of near-duplicate turns")
+    parser.add_argument("--broken", type=float, default=0.005, help="share of non-finite embeddings")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "episodic.jsonl")
+        start = time.perf_counter()
+        _fill(EpisodicStore(path), args.n, args.dim, args.repeats, args.near, args.broken)
+        print(f"wrote {args.n} lines (dim={args.dim}) in {time.perf_counter() - start:.1f}s")
+
+        print(f"before: startup {_startup(path):6.2f}s, {_size_mb(tmp):8.1f} MB on disk")
+        store = EpisodicStore(path)
+        start = time.perf_counter()
+        stats = store.compact()
+        print(f"compact(): {time.perf_counter() - start:6.2f}s  {stats}")
+        del store
+        print(f"after:  startup {_startup(path):6.2f}s, {_size_mb(tmp):8.1f} MB on disk")
+
+
+if __name__ == "__main__":
+    main()
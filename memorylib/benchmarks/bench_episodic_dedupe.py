@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Cost and effect of near-duplicate suppression in EpisodicStore.store().
+
+Prefills a store, then replays a play session where a share of turns
+repeat one of the last few turns ("again! again!") and a share repeat a
+turn from much earlier, each with a slightly perturbed vector. Reports
+store() latency with and without dedupe and how many repeats of each kind
+were suppressed (old repeats are only reachable through the LSH buckets).
+
+Usage:
+    python memorylib/benchmarks/bench_episodic_dedupe.py
+    python memorylib/benchmarks/bench_episodic_dedupe.py --sizes 100000 --threshold 0.9
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+from common import DIM, clustered_unit_rows, fmt_us
+
+from memorylib import EpisodicStore
+from memorylib.episodic import _Entry
+
+
+class _SessionModel:
+    """Returns the vector planned for each session turn."""
+
+    def __init__(self, vectors: dict):
+        self.vectors = vectors
+
+    def encode(self, text, **kwargs):
+        return self.vectors[text]
+
+
+def _session(matrix: np.ndarray, turns: int, recent: float, old: float, noise: float, seed: int = 0):
+    """Plan (text, vector, kind) per turn; kind is 'fresh', 'recent' or 'old'."""
+    rng = np.random.default_rng(seed)
+    fresh = clustered_unit_rows(turns, seed=seed + 100)
+    plan = []
+    for t in range(turns):
+        roll = rng.random()
+        if roll < recent and plan:
+            kind, base = "recent", plan[-1 - rng.integers(min(4, len(plan)))][1]
+        elif roll < recent + old and len(matrix) > 1000:
+            kind, base = "old", matrix[rng.integers(len(matrix) - 1000)]
+        else:
+            kind, base = "fresh", fresh[t]
+        vec = base + noise * rng.standard_normal(len(base)).astype(np.float32)
+        plan.append((f"turn {t}", (vec / np.linalg.norm(vec)).astype(np.float32), kind))
+    return plan
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--turns", type=int, default=500)
+    parser.add_argument("--recent", type=float, default=0.3, help="share of turns repeating a recent turn")
+    parser.add_argument("--old", type=float, default=0.1, help="share of turns repeating an old turn")
+    parser.add_argument("--noise", type=float, default=0.01, help="per-dimension perturbation of repeats")
+    parser.add_argument("--threshold", type=float, default=0.95)
+    args = parser.parse_args()
+
+    print(f"{'entries':>10} {'dedupe':>7} {'store p50':>14} {'suppressed':>11} {'recent':>8} {'old':>8}")
+    for n in args.sizes:
+        matrix = clustered_unit_rows(n)
+        plan = _session(matrix, args.turns, args.recent, args.old, args.noise)
+        for threshold in (None, args.threshold):
+            with tempfile.TemporaryDirectory() as tmp:
+                store = EpisodicStore(os.path.join(tmp, "episodic.jsonl"), dedupe=threshold, cache_size=0)
+                store._add([_Entry("2026-01-01T00:00:00", f"prefill {i}") for i in range(n)], matrix)
+                store._model = _SessionModel({text: vec for text, vec, _ in plan})
+                latencies, caught = [], {"recent": 0, "old": 0}
+                for text, _, kind in plan:
+                    before = len(store)
+                    start = time.perf_counter()
+                    store.store(text)
+                    latencies.append(time.perf_counter() - start)
+                    if kind in caught and len(store) == before:
+                        caught[kind] += 1
+                planned = {k: sum(1 for *_, kind in plan if kind == k) for k in caught}
+                rate = store.dedupe_stats()["suppression_rate"]
+                print(f"{n:>10} {str(threshold or 'off'):>7} {fmt_us(float(np.median(latencies))):>14} "
+                      f"{rate:>11.0%} {caught['recent'] / max(planned['recent'], 1):>8.0%} "
+                      f"{caught['old'] / max(planned['old'], 1):>8.0%}")
+    print(f"(dim={DIM}; 'recent'/'old' = share of planted repeats suppressed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Prompt size of the episodic context with and without MMR diversity.
+
+Builds a store of topics, each discussed in a few distinct exchanges
+("facets") that are repeated several times with small variations, as a
+child asking the same question again would. For every topic it queries
+the way MemoryManager.build_context does and reports how many distinct
+facets the top k turns cover, and how many prompt characters it takes
+to show k distinct facets: plain relevance order has to walk down past
+the repeats, MMR gets there in k turns.
+
+Usage:
+    python memorylib/benchmarks/bench_episodic_diversity.py
+    python memorylib/benchmarks/bench_episodic_diversity.py --topics 500 --diversity 0.5
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+from common import DIM, StubModel, fmt_us, random_unit_rows
+
+from memorylib import EpisodicStore
+from memorylib.episodic import _Entry
+
+_MAX_DEPTH = 50  # deepest top_k tried when looking for k distinct facets
+
+
+class _TopicModel(StubModel):
+    """Encodes "topic N" queries to that topic's centre; anything else like StubModel."""
+
+    def __init__(self, centres: np.ndarray):
+        super().__init__()
+        self.centres = centres
+
+    def encode(self, text, normalize_embeddings=False, **kwargs):
+        if isinstance(text, str) and text.startswith("topic "):
+            return self.centres[int(text.split()[1])]
+        return super().encode(text, normalize_embeddings, **kwargs)
+
+
+def _normalized(m: np.ndarray) -> np.ndarray:
+    return (m / np.linalg.norm(m, axis=-1, keepdims=True)).astype(np.float32)
+
+
+def _fill(store: EpisodicStore, centres: np.ndarray, facets: int, max_repeats: int, rng) -> dict:
+    """Add repeated facet turns; return text -> (topic, facet)."""
+    entries, vectors, labels = [], [], {}
+    for topic, centre in enumerate(centres):
+        for facet in range(facets):
+            base = _normalized(centre + 0.8 * rng.standard_normal(DIM) / np.sqrt(DIM))
+            for repeat in range(int(rng.integers(1, max_repeats + 1))):
+                text = (f"Kabir: tell me about topic {topic}, part {facet} (take {repeat}) "
+                        f"Robot: here is everything about part {facet} of topic {topic}!")
+                entries.append(_Entry("2026-03-01T09:00:00", text))
+                vectors.append(_normalized(base + 0.15 * rng.standard_normal(DIM) / np.sqrt(DIM)))
+                labels[text] = (topic, facet)
+    order = rng.permutation(len(entries))
+    store._add([entries[i] for i in order], np.stack(vectors)[order])
+    return labels
+
+
+def _context(episodes: list[str]) -> str:
+    """The episodic part of MemoryManager.build_context."""
+    return "Relevant past exchanges:\n" + "\n".join(f"- {e}" for e in episodes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topics", type=int, default=200)
+    parser.add_argument("--facets", type=int, default=4, help="distinct exchanges per topic")
+    parser.add_argument("--repeats", type=int, default=6, help="max repeats of each exchange")
+    parser.add_argument("-k", type=int, default=3)
+    parser.add_argument("--diversity", type=float, default=0.3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    centres = random_unit_rows(args.topics)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EpisodicStore(os.path.join(tmp, "episodic.jsonl"), cache_size=0)
+        store._model = _TopicModel(centres)
+        labels = _fill(store, centres, args.facets, args.repeats, rng)
+        store._ensure_lexical()
+
+        print(f"{len(store)} entries, {args.topics} topics x {args.facets} facets, k={args.k}")
+        print(f"{'diversity':>10} {'p50 latency':>14} {'facets@k':>9} {'turns for k facets':>19} {'prompt chars':>13}")
+        for diversity in (None, args.diversity):
+            latencies, covered, depths, sizes = [], [], [], []
+            for topic in range(args.topics):
+                query = f"topic {topic}"
+                start = time.perf_counter()
+                top = store.search(query, top_k=args.k, diversity=diversity)
+                latencies.append(time.perf_counter() - start)
+                covered.append(len({labels[t] for t in top}))
+                # Smallest prefix of the ranking that shows k distinct facets.
+                ranked = top if covered[-1] >= args.k else store.search(query, top_k=_MAX_DEPTH, diversity=diversity)
+                seen: set = set()
+                for depth, text in enumerate(ranked, 1):
+                    seen.add(labels[text])
+                    if len(seen) >= args.k:
+                        break
+                depths.append(depth)
+                sizes.append(len(_context(ranked[:depth])))
+            label = "off" if diversity is None else f"{diversity:.2f}"
+            print(f"{label:>10} {fmt_us(float(np.median(latencies))):>14} {np.mean(covered):>9.2f} "
+                  f"{np.mean(depths):>19.2f} {np.mean(sizes):>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
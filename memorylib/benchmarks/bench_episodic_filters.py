@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Per-speaker episodic search: columnar mask vs post-filtering the ranking.
+
+Fills a store with turns spread over several speakers (the rarest speaker
+owns ~1% of them) and times vector search for each speaker two ways: with
+search(speaker=...), which masks rows before the matrix product, and with an
+unfiltered search over a deep candidate list filtered in Python afterwards
+(the only option before filters existed). Also reports how often the
+post-filter fails to fill top_k.
+
+Usage:
+    python memorylib/benchmarks/bench_episodic_filters.py
+    python memorylib/benchmarks/bench_episodic_filters.py -n 500000 --index int8
+"""
+
+import argparse
+import os
+import tempfile
+
+import numpy as np
+from common import StubModel, clustered_unit_rows, fmt_us, timed
+
+from memorylib import EpisodicStore
+from memorylib.episodic import _Entry
+
+_SPEAKERS = {"Kabir": 0.6, "Mama": 0.25, "Dada": 0.14, "Grandma": 0.01}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=200_000, help="entries")
+    parser.add_argument("-k", type=int, default=3)
+    parser.add_argument("--depth", type=int, default=100, help="candidates ranked before post-filtering")
+    parser.add_argument("--index", default="exact", help="episodic index backend")
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    names = rng.choice(list(_SPEAKERS), size=args.n, p=list(_SPEAKERS.values()))
+    queries = clustered_unit_rows(args.queries, seed=7)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EpisodicStore(os.path.join(tmp, "episodic.jsonl"), index=args.index, cache_size=0)
+        store._model = StubModel()
+        entries = [_Entry("2026-01-01T00:00:00", f"turn {i}", {"speaker": str(name)}) for i, name in enumerate(names)]
+        store._add(entries, clustered_unit_rows(args.n))
+
+        print(f"{args.n} entries, index={args.index}, top_k={args.k}, post-filter depth={args.depth}")
+        print(f"{'speaker':>10} {'share':>7} {'masked p50':>14} {'post-filter p50':>16} {'short':>7}")
+        for speaker, share in _SPEAKERS.items():
+            masked, post, short = [], [], 0
+            for q in queries:
+                store._embed = lambda text, q=q: q
+                masked.append(timed(store.search, "q", args.k, mode="vector", speaker=speaker))
+
+                def post_filter():
+                    rows, _ = store._index.search(store._matrix, q, args.depth, exclude=store._orphans)
+                    ids = store._row_entries.view()[rows, 0]
+                    return [i for i in ids if store._entries[i].metadata["speaker"] == speaker][:args.k]
+                post.append(timed(post_filter))
+                short += len(post_filter()) < args.k
+            print(f"{speaker:>10} {share:>7.0%} {fmt_us(np.median(masked)):>14} "
+                  f"{fmt_us(np.median(post)):>16} {short / len(queries):>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Latency and exact-name hit rate of vector, lexical and hybrid episodic search.
+
+Fills a store with synthetic turns, a few of which mention a pet by name,
+then queries for each name. Reports the one-off BM25 build time, median
+query latency per mode, and how often the turn naming the pet is in the
+top k. The embedding cache is disabled so every vector and hybrid query
+pays for encoding. With the default stub encoder
+the vector hit rate is chance level; pass --model all-MiniLM-L6-v2 to
+compare against real embeddings.
+
+Usage:
+    python memorylib/benchmarks/bench_episodic_hybrid.py
+    python memorylib/benchmarks/bench_episodic_hybrid.py --model all-MiniLM-L6-v2 -n 5000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+from common import fmt_us, load_model
+
+from memorylib import EpisodicStore
+
+_PETS = ["Biscuit", "Noodle", "Pickle", "Waffles", "Ziggy", "Mochi", "Pepper", "Tofu"]
+_TOPICS = ["dinosaurs", "space", "the weather", "trains", "drawing", "the park", "bath time", "a bedtime story"]
+
+
+def _texts(n: int) -> list[str]:
+    return [f"Kabir: tell me about {_TOPICS[i % len(_TOPICS)]} {i} Robot: that sounds fun, number {i}!"
+            for i in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=50_000, help="background entries")
+    parser.add_argument("-k", type=int, default=3)
+    parser.add_argument("--model", default="stub", help="'stub' or a sentence-transformers model name")
+    args = parser.parse_args()
+
+    model = load_model(args.model)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EpisodicStore(os.path.join(tmp, "episodic.jsonl"), cache_size=0)
+        store._model = model
+        store.store_many(_texts(args.n), batch_size=128)
+        targets = {}
+        for pet in _PETS:
+            text = f"Kabir: my dog {pet} chased a squirrel Robot: {pet} sounds very fast!"
+            store.store(text)
+            targets[pet] = text
+
+        start = time.perf_counter()
+        store._ensure_lexical()
+        build = time.perf_counter() - start
+
+        print(f"{len(store)} entries, model={args.model}; BM25 built in {build * 1e3:.0f} ms")
+        print(f"{'mode':>10} {'p50 latency':>14} {'name hit@' + str(args.k):>12}")
+        for mode in ("vector", "lexical", "hybrid"):
+            latencies, hits = [], 0
+            for pet, text in targets.items():
+                query = f"what did {pet} do?"
+                start = time.perf_counter()
+                results = store.search(query, top_k=args.k, mode=mode)
+                latencies.append(time.perf_counter() - start)
+                hits += text in results
+            print(f"{mode:>10} {fmt_us(float(np.median(latencies))):>14} {hits / len(targets):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
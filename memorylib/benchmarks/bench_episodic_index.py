@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Recall and latency of the IVF episodic index against exact search.
+
+Builds clustered synthetic embeddings of each size, trains IVFIndex once,
+and reports recall@k and median query latency for several nprobe values
+next to the brute-force ExactIndex.
+
+Usage:
+    python memorylib/benchmarks/bench_episodic_index.py
+    python memorylib/benchmarks/bench_episodic_index.py --sizes 50000 --nprobe 4 16
+"""
+
+import argparse
+import time
+
+import numpy as np
+from common import clustered_unit_rows, fmt_us, recall_at_k, timed
+
+from memorylib.index import ExactIndex, IVFIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 8, 16, 32])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        matrix = clustered_unit_rows(n)
+        queries = clustered_unit_rows(args.queries, seed=7)
+        exact = ExactIndex()
+        exact.sync(matrix)
+        truth = [exact.search(matrix, q, args.k)[0] for q in queries]
+        exact_t = np.median([timed(exact.search, matrix, q, args.k) for q in queries])
+
+        start = time.perf_counter()
+        ivf = IVFIndex(min_train=0)
+        ivf.sync(matrix)
+        train = time.perf_counter() - start
+
+        print(f"\n{n} rows — IVF trained with {len(ivf._centroids)} cells in {train:.2f}s")
+        print(f"{'backend':>12} {'recall@' + str(args.k):>10} {'p50 latency':>14}")
+        print(f"{'exact':>12} {1.0:>10.3f} {fmt_us(exact_t):>14}")
+        for nprobe in args.nprobe:
+            ivf.nprobe = nprobe
+            recall = np.mean([recall_at_k(ivf.search(matrix, q, args.k)[0], t) for q, t in zip(queries, truth)])
+            latency = np.median([timed(ivf.search, matrix, q, args.k) for q in queries])
+            print(f"{'ivf/' + str(nprobe):>12} {recall:>10.3f} {fmt_us(latency):>14}")
+
+
+if __name__ == "__main__":
+    main()
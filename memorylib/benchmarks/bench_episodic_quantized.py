@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Search quality and memory footprint of quantised episodic indexes.
+
+Writes clustered synthetic embeddings to a memory-mapped sidecar and, for
+each backend (exact float32, int8, binary), reports recall@k against exact
+search, median latency, and the memory a query has to touch:
+
+    scan MB        structure scanned in full on every query (the float
+                   matrix for exact, the codes otherwise) — this is what
+                   must stay resident for search to be fast
+    rerank KB      float32 rows read back from the sidecar per query
+
+Everything is memory-mapped, so none of it is anonymous process memory;
+the figures are the page-cache working set the device must keep warm.
+Clustered random data is a hard case for 1-bit codes — real sentence
+embeddings have more separated neighbours.
+
+Usage:
+    python memorylib/benchmarks/bench_episodic_quantized.py
+    python memorylib/benchmarks/bench_episodic_quantized.py --size 200000 -k 3
+"""
+
+import argparse
+import os
+import tempfile
+
+import numpy as np
+from common import clustered_unit_rows, fmt_us, recall_at_k, timed
+
+from memorylib.buffer import MappedEmbeddingBuffer
+from memorylib.index import BinaryIndex, ExactIndex, Int8Index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "episodic.f32")
+        MappedEmbeddingBuffer(path).extend(clustered_unit_rows(args.size))
+        matrix = MappedEmbeddingBuffer(path).view()
+        queries = clustered_unit_rows(args.queries, seed=7)
+        truth = [ExactIndex._exact(matrix, q, args.k, ())[0] for q in queries]
+        row_bytes = matrix.shape[1] * matrix.itemsize
+
+        print(f"{args.size} rows, dim {matrix.shape[1]}, k={args.k}")
+        print(f"{'backend':>8} {'recall':>8} {'p50 latency':>14} {'scan MB':>9} {'rerank KB':>10}")
+        for cls in (ExactIndex, Int8Index, BinaryIndex):
+            index = cls()
+            index.load(os.path.join(tmp, "episodic.index.npz"))
+            index.sync(matrix)
+            if cls is ExactIndex:
+                scan_mb, rerank_kb = matrix.nbytes / 1e6, 0.0
+            else:
+                scan_mb = index.nbytes / 1e6
+                rerank_kb = max(args.k * index.rerank, index.min_candidates) * row_bytes / 1e3
+            recall = np.mean([recall_at_k(index.search(matrix, q, args.k)[0], t) for q, t in zip(queries, truth)])
+            latency = np.median([timed(index.search, matrix, q, args.k) for q in queries])
+            print(f"{cls.name:>8} {recall:>8.3f} {fmt_us(latency):>14} {scan_mb:>9.1f} {rerank_kb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
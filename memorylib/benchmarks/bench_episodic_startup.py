@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+EpisodicStore cold-start time: inline-embedding JSONL vs memory-mapped sidecar.
+
+Writes a synthetic store of each size in the old format (embedding lists in
+every JSONL line), times the one-time migration, then times reopening the
+migrated store and a first search over it.
+
+Usage:
+    python memorylib/benchmarks/bench_episodic_startup.py
+    python memorylib/benchmarks/bench_episodic_startup.py --sizes 1000 50000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from common import StubModel, random_unit_rows
+
+from memorylib import EpisodicStore
+
+
+def _write_legacy(path: str, n: int) -> None:
+    rows = random_unit_rows(n)
+    with open(path, "w") as f:
+        for i in range(n):
+            entry = {"id": "2025-01-01T00:00:00", "text": f"turn {i}", "embedding": rows[i].tolist()}
+            f.write(json.dumps(entry) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'entries':>10} {'legacy MB':>10} {'migrate':>10} {'reopen':>10} {'1st search':>11}")
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "episodic.jsonl")
+            _write_legacy(path, n)
+            legacy_mb = os.path.getsize(path) / 1e6
+
+            start = time.perf_counter()
+            EpisodicStore(path)
+            migrate = time.perf_counter() - start
+
+            start = time.perf_counter()
+            store = EpisodicStore(path)
+            reopen = time.perf_counter() - start
+
+            store._model = StubModel()
+            start = time.perf_counter()
+            store.search("hello", top_k=3)
+            search = time.perf_counter() - start
+            print(f"{n:>10} {legacy_mb:>10.1f} {migrate:>9.3f}s {reopen:>9.3f}s {search:>10.3f}s")
+
+
+if __name__ == "__main__":
+    main()
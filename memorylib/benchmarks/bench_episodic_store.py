@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+EpisodicStore.store latency as the store grows.
+
+Prefills the store to each size with random rows, then times individual
+store() calls. With the growable buffer the per-call cost should stay flat;
+--legacy also times the old full np.stack rebuild for comparison.
+
+Usage:
+    python memorylib/benchmarks/bench_episodic_store.py
+    python memorylib/benchmarks/bench_episodic_store.py --sizes 1000 10000 --legacy
+"""
+
+import argparse
+import tempfile
+
+import numpy as np
+from common import DIM, StubModel, fmt_us, random_unit_rows, timed
+
+from memorylib import EpisodicStore
+from memorylib.episodic import _Entry
+
+
+def _prefill(store: EpisodicStore, n: int) -> None:
+    store._add([_Entry("prefill", f"prefill {i}") for i in range(n)], random_unit_rows(n))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 500_000])
+    parser.add_argument("--calls", type=int, default=200, help="store() calls timed per size")
+    parser.add_argument("--legacy", action="store_true", help="also time a full matrix rebuild per call")
+    args = parser.parse_args()
+
+    print(f"{'entries':>10} {'store p50':>14} {'store p99':>14}" + (f" {'rebuild':>14}" if args.legacy else ""))
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = EpisodicStore(f"{tmp}/episodic.jsonl")
+            store._model = StubModel()
+            _prefill(store, n)
+            samples = [timed(store.store, f"turn {i}") for i in range(args.calls)]
+            line = f"{n:>10} {fmt_us(np.percentile(samples, 50)):>14} {fmt_us(np.percentile(samples, 99)):>14}"
+            if args.legacy:
+                matrix = store._matrix
+                rebuild = timed(lambda: np.stack([np.asarray(r, dtype=np.float32) for r in matrix]), repeat=3)
+                line += f" {fmt_us(rebuild):>14}"
+            print(line)
+            del store
+
+    print(f"(dim={DIM}; store() includes the stub encode and the JSONL append)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Bulk-import throughput: store() in a loop vs store_many() at several batch sizes.
+
+Reports entries per second for importing the same synthetic transcript.
+With the default stub encoder this isolates the store's own overhead (one
+file open + append per entry vs one buffered write per batch); pass
+--model all-MiniLM-L6-v2 to include real batched transformer encoding.
+
+Usage:
+    python memorylib/benchmarks/bench_episodic_store_many.py
+    python memorylib/benchmarks/bench_episodic_store_many.py --model all-MiniLM-L6-v2 -n 2000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from common import load_model
+
+from memorylib import EpisodicStore
+
+
+def _texts(n: int) -> list[str]:
+    return [f"Kabir: tell me about dinosaur number {i} Robot: dinosaur {i} was very big!" for i in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=20_000, help="entries to import")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[8, 32, 128])
+    parser.add_argument("--model", default="stub", help="'stub' or a sentence-transformers model name")
+    args = parser.parse_args()
+
+    model = load_model(args.model)
+    texts = _texts(args.n)
+
+    def run(label, fn):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = EpisodicStore(os.path.join(tmp, "episodic.jsonl"))
+            store._model = model
+            start = time.perf_counter()
+            fn(store)
+            elapsed = time.perf_counter() - start
+            print(f"{label:>22} {args.n / elapsed:>12.0f} entries/s")
+
+    print(f"{args.n} entries, model={args.model}")
+    run("store() loop", lambda s: [s.store(t) for t in texts])
+    for bs in args.batch_sizes:
+        run(f"store_many(batch={bs})", lambda s, bs=bs: s.store_many(texts, batch_size=bs))
+
+
+if __name__ == "__main__":
+    main()
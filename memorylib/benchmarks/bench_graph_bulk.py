@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Graph load throughput: GraphStore.import_ (Kuzu COPY / LOAD FROM) vs upserts.
+
+Writes a synthetic graph (--entities, --relations with a weight) as the
+CSV files export() produces, then loads it into fresh stores: import_()
+from CSV and, after an export() round trip, from Parquet, both through
+COPY into empty tables; import_() into a store that already has rows
+(LOAD FROM + MERGE); and, on the first --upsert-limit relations, the
+batched upsert_entities / upsert_relations path and the row-by-row
+upsert_entity / upsert_relation path that seeding used to replay. Also
+times export() itself. Every load is checked to produce the same graph.
+
+Usage:
+    python memorylib/benchmarks/bench_graph_bulk.py
+    python memorylib/benchmarks/bench_graph_bulk.py --entities 50000 --relations 200000 --upsert-limit 2000
+"""
+
+import argparse
+import csv
+import gc
+import os
+import tempfile
+import time
+
+import common  # noqa: F401 — puts memorylib on sys.path
+import numpy as np
+
+from memorylib import GraphStore
+
+_RELATIONS = ["likes", "has_pet", "called", "sibling_of", "visited", "plays_with"]
+
+
+def _graph(entities: int, relations: int, seed: int = 0) -> tuple[list, list]:
+    """(name, type) rows and (from, to, rel_type, weight) rows with unique (from, rel_type, to)."""
+    rng = np.random.default_rng(seed)
+    nodes = [(f"entity{i}", ("person", "topic", "value")[i % 3]) for i in range(entities)]
+    edges: dict = {}
+    while len(edges) < relations:
+        s, o, r = rng.integers(0, entities), rng.integers(0, entities), rng.integers(0, len(_RELATIONS))
+        edges[(f"entity{s}", _RELATIONS[r], f"entity{o}")] = float(rng.integers(0, 100))
+    return nodes, [(s, o, r, weight) for (s, r, o), weight in edges.items()]
+
+
+def _write_csv(directory: str, nodes: list, edges: list) -> None:
+    os.makedirs(directory, exist_ok=True)
+    header = ["from", "to", "rel_type", "weight", "first_seen", "last_seen", "count", "source", "extra"]
+    relations = [(s, o, r, weight, "", "", "", "", "") for s, o, r, weight in edges]
+    for name, header, rows in (("entities", ["name", "type"], nodes), ("relations", header, relations)):
+        with open(os.path.join(directory, f"{name}.csv"), "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+
+
+def _timed_load(path: str, load) -> tuple[float, GraphStore]:
+    graph = GraphStore(path)
+    start = time.perf_counter()
+    load(graph)
+    return time.perf_counter() - start, graph
+
+
+def _row_by_row(graph: GraphStore, nodes: dict, edges: list) -> None:
+    for s, o, r, weight in edges:
+        graph.upsert_entity(s, nodes[s])
+        graph.upsert_entity(o, nodes[o])
+        graph.upsert_relation(s, r, o, {"weight": weight})
+
+
+def _batched(graph: GraphStore, nodes: dict, edges: list, batch: int = 5000) -> None:
+    for start in range(0, len(edges), batch):
+        chunk = edges[start:start + batch]
+        graph.upsert_entities((name, nodes[name]) for s, o, _, _ in chunk for name in (s, o))
+        graph.upsert_relations((s, r, o, {"weight": weight}) for s, o, r, weight in chunk)
+
+
+def _report(label: str, rows: int, seconds: float) -> None:
+    print(f"{label:>28} {rows:>9} {seconds:>9.2f} {rows / seconds:>11.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entities", type=int, default=10_000)
+    parser.add_argument("--relations", type=int, default=30_000)
+    parser.add_argument("--upsert-limit", type=int, default=1_000,
+                        help="relations loaded through the upsert paths (they are slow)")
+    args = parser.parse_args()
+
+    nodes, edges = _graph(args.entities, args.relations)
+    types = dict(nodes)
+    print(f"{len(nodes)} entities, {len(edges)} relations")
+    print(f"{'path':>28} {'rows':>9} {'seconds':>9} {'rows/s':>11}")
+    rows = len(nodes) + len(edges)
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_csv(os.path.join(tmp, "csv"), nodes, edges)
+
+        seconds, graph = _timed_load(os.path.join(tmp, "csv.db"), lambda g: g.import_(os.path.join(tmp, "csv")))
+        _report("import_ csv (COPY)", rows, seconds)
+        reference = graph.all_relations()
+        start = time.perf_counter()
+        graph.export(os.path.join(tmp, "parquet"))
+        _report("export parquet", rows, time.perf_counter() - start)
+        del graph
+
+        seconds, graph = _timed_load(os.path.join(tmp, "parquet.db"),
+                                     lambda g: g.import_(os.path.join(tmp, "parquet")))
+        _report("import_ parquet (COPY)", rows, seconds)
+        assert graph.all_relations() == reference
+        del graph
+
+        def merge(g):
+            g.upsert_entities(nodes[:100])
+            g.import_(os.path.join(tmp, "parquet"))
+        seconds, graph = _timed_load(os.path.join(tmp, "merge.db"), merge)
+        _report("import_ non-empty (MERGE)", rows, seconds)
+        assert graph.all_relations() == reference
+        del graph
+        gc.collect()  # release the databases before opening more
+
+        sample = edges[:args.upsert_limit]
+        sample_rows = len({name for s, o, _, _ in sample for name in (s, o)}) + len(sample)
+        seconds, graph = _timed_load(os.path.join(tmp, "batched.db"), lambda g: _batched(g, types, sample))
+        _report("upsert_entities/relations", sample_rows, seconds)
+        del graph
+        seconds, graph = _timed_load(os.path.join(tmp, "rows.db"), lambda g: _row_by_row(g, types, sample))
+        _report("upsert_entity/relation", sample_rows, seconds)
+
+
+if __name__ == "__main__":
+    main()
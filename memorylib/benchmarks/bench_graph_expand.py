@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+k-hop neighbourhood latency: GraphStore.expand vs a per-node get_neighbors walk.
+
+Builds random graphs of growing size (average out-degree --degree, a few
+relation types) and, for a sample of start entities, collects every edge
+within k hops three ways: a breadth-first walk issuing one get_neighbors
+query per visited node (how context builders used to nest their
+lookups), one expand() query, and expand() served by the in-process
+mirror. Reports p50 latency and the mean number of edges returned.
+
+Usage:
+    python memorylib/benchmarks/bench_graph_expand.py
+    python memorylib/benchmarks/bench_graph_expand.py --sizes 1000 20000 --hops 1 2 3 --starts 50
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+
+import numpy as np
+from common import fmt_us, timed
+
+from memorylib import GraphStore
+
+_RELATIONS = ["likes", "has_pet", "knows", "visited"]
+
+
+def _fill(graph: GraphStore, entities: int, degree: float, seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    n = int(entities * degree)
+    subj, obj = rng.integers(0, entities, (2, n))
+    rel = rng.integers(0, len(_RELATIONS), n)
+    graph.upsert_entities((f"entity{i}", "entity") for i in range(entities))
+    facts = [(f"entity{s}", _RELATIONS[r], f"entity{o}") for s, r, o in zip(subj, rel, obj)]
+    for start in range(0, len(facts), 5000):
+        graph.upsert_relations(facts[start:start + 5000])
+
+
+def _nested(graph: GraphStore, name: str, hops: int) -> list:
+    """One get_neighbors round trip per node reached, level by level."""
+    edges, seen, frontier = {}, {name}, [name]
+    for _ in range(hops):
+        reached = []
+        for node in frontier:
+            for other, _, rel, _ in graph.get_neighbors(node):
+                edges[(node, rel, other)] = None
+                if other not in seen:
+                    seen.add(other)
+                    reached.append(other)
+        frontier = reached
+    return list(edges)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 4_000], help="entities")
+    parser.add_argument("--degree", type=float, default=3.0, help="average out-degree")
+    parser.add_argument("--hops", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--starts", type=int, default=10, help="start entities sampled per size")
+    args = parser.parse_args()
+
+    print(f"{'entities':>9} {'hops':>5} {'edges':>7} {'nested':>14} {'expand':>14} {'mirror':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = os.path.join(tmp, f"graph{size}.db")
+            graph = GraphStore(path)
+            _fill(graph, size, args.degree)
+            mirrored = GraphStore(path, mirror=True)
+            starts = [f"entity{i}" for i in np.random.default_rng(1).choice(size, args.starts, replace=False)]
+            for hops in args.hops:
+                graph.expand(starts[0], hops=hops)  # prepare outside the timing
+                sizes, nested, single, mirror = [], [], [], []
+                for name in starts:
+                    expected = set(graph.expand(name, hops=hops))
+                    assert set(_nested(graph, name, hops)) == expected == set(mirrored.expand(name, hops=hops))
+                    sizes.append(len(expected))
+                    nested.append(timed(_nested, graph, name, hops, repeat=3))
+                    single.append(timed(graph.expand, name, hops=hops, repeat=3))
+                    mirror.append(timed(mirrored.expand, name, hops=hops, repeat=3))
+                print(f"{size:>9} {hops:>5} {np.mean(sizes):>7.0f} {fmt_us(float(np.median(nested)))} "
+                      f"{fmt_us(float(np.median(single)))} {fmt_us(float(np.median(mirror)))}")
+            del graph, mirrored
+            gc.collect()  # release each database before building the next
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Read latency of GraphStore with and without the in-process adjacency mirror.
+
+Fills one database with a user and a spread of facts (family, pets,
+preferences, plus background entities linked at random), then opens it
+twice: as a plain GraphStore whose reads are Kuzu queries, and with
+mirror=True, whose reads are dict lookups. Reports p50 latency per read,
+the cost of loading the mirror at open and of a write with write-through.
+
+Usage:
+    python memorylib/benchmarks/bench_graph_mirror.py
+    python memorylib/benchmarks/bench_graph_mirror.py --entities 20000 --relations 100000
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+
+import numpy as np
+from common import fmt_us, timed
+
+from memorylib import GraphStore
+
+_RELATIONS = ["likes", "visited", "plays_with", "knows"]
+
+
+def _fill(graph: GraphStore, entities: int, relations: int, seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    graph.upsert_entities([("Kabir", "person"), ("Mama", "person"), ("Mira", "person"), ("Jetty", "pet"),
+                           ("fish", "value")] + [(f"entity{i}", "entity") for i in range(entities)])
+    facts = [("Mama", "parent_of", "Kabir"), ("Mira", "sibling_of", "Kabir"), ("Kabir", "has_pet", "Jetty"),
+             ("Jetty", "pet_type", "fish")] + [("Kabir", "likes", f"entity{i}") for i in range(30)]
+    subj, obj = rng.integers(0, entities, (2, relations))
+    rel = rng.integers(0, len(_RELATIONS), relations)
+    facts += [(f"entity{s}", _RELATIONS[r], f"entity{o}") for s, r, o in zip(subj, rel, obj)]
+    for start in range(0, len(facts), 5000):
+        graph.upsert_relations(facts[start:start + 5000])
+
+
+_READS = [
+    ("get_entity", lambda g: g.get_entity("Kabir")),
+    ("get_neighbors out", lambda g: g.get_neighbors("Kabir")),
+    ("get_neighbors rel", lambda g: g.get_neighbors("Kabir", rel_type="has_pet")),
+    ("get_neighbors in", lambda g: g.get_neighbors("Kabir", rel_type="parent_of", direction="in")),
+    ("get_neighbors both", lambda g: g.get_neighbors("Jetty", direction="both")),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entities", type=int, default=2_000)
+    parser.add_argument("--relations", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "graph.db")
+        graph = GraphStore(path)
+        _fill(graph, args.entities, args.relations)
+        del graph
+        gc.collect()  # close the database before reopening it
+
+        start = time.perf_counter()
+        graph = GraphStore(path, mirror=True)
+        load = time.perf_counter() - start
+        edges = len(graph.all_relations())
+        print(f"{len(graph.all_entities())} entities, {edges} edges; mirror loaded in {load * 1e3:.0f} ms")
+
+        def unmirrored(op):
+            mirror, graph._mirror = graph._mirror, None
+            try:
+                return op(graph)
+            finally:
+                graph._mirror = mirror
+
+        print(f"{'operation':>20} {'kuzu':>14} {'mirror':>14} {'speed-up':>9}")
+        reads = _READS + [("all_relations", lambda g: g.all_relations())]
+        for name, op in reads:
+            unmirrored(op)  # prepare outside the timing
+            repeat = args.repeat if name != "all_relations" else max(1, args.repeat // 50)
+            before = timed(lambda g: unmirrored(op), graph, repeat=repeat)
+            after = timed(op, graph, repeat=repeat)
+            print(f"{name:>20} {fmt_us(before)} {fmt_us(after)} {before / after:>8.0f}x")
+
+        write = lambda g: g.upsert_relation("Kabir", "has_pet", "Jetty")  # noqa: E731
+        before = timed(lambda g: unmirrored(write), graph, repeat=args.repeat)
+        after = timed(write, graph, repeat=args.repeat)
+        print(f"{'upsert_relation':>20} {fmt_us(before)} {fmt_us(after)} {before / after:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
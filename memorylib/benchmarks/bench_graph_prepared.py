@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Parse/plan time saved per GraphStore operation by prepared statements.
+
+Times each operation on a small family graph twice: through GraphStore,
+which prepares its statements once and reuses them, and through a
+subclass that hands the same Cypher text to Connection.execute every
+time, so Kuzu parses, binds and plans it on each call (the previous
+behaviour). The difference is the per-call parse/plan cost.
+
+Usage:
+    python memorylib/benchmarks/bench_graph_prepared.py
+    python memorylib/benchmarks/bench_graph_prepared.py --repeat 2000
+"""
+
+import argparse
+import os
+import tempfile
+
+from common import fmt_us, timed
+
+from memorylib import GraphStore
+
+
+class _Unprepared(GraphStore):
+    """GraphStore as it was: every call re-parses and re-plans its Cypher."""
+
+    def _execute(self, cypher, params=None):
+        return self._conn.execute(cypher, params or {})
+
+    def query(self, cypher, params=None):
+        return self._collect(self._conn.execute(cypher, params or {}))
+
+
+def _fill(graph: GraphStore) -> None:
+    graph.upsert_entities([("Kabir", "person"), ("Mama", "person"), ("Jetty", "pet"), ("fish", "value")]
+                          + [(f"topic{i}", "topic") for i in range(30)])
+    graph.upsert_relations([("Mama", "parent_of", "Kabir"), ("Kabir", "has_pet", "Jetty"), ("Jetty", "pet_type", "fish")]
+                           + [("Kabir", "likes", f"topic{i}") for i in range(30)])
+
+
+_OPERATIONS = [
+    ("upsert_entity", lambda g: g.upsert_entity("Jetty", "pet")),
+    ("upsert_relation", lambda g: g.upsert_relation("Kabir", "has_pet", "Jetty")),
+    ("get_entity", lambda g: g.get_entity("Kabir")),
+    ("get_neighbors out", lambda g: g.get_neighbors("Kabir")),
+    ("get_neighbors rel", lambda g: g.get_neighbors("Kabir", rel_type="has_pet")),
+    ("get_neighbors in", lambda g: g.get_neighbors("Kabir", rel_type="parent_of", direction="in")),
+    ("get_neighbors both", lambda g: g.get_neighbors("Jetty", direction="both")),
+    ("query", lambda g: g.query("MATCH (a:Entity {name: $name})-[r:Relation]->(b:Entity) RETURN b.name",
+                                {"name": "Kabir"})),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        prepared = GraphStore(os.path.join(tmp, "prepared.db"))
+        unprepared = _Unprepared(os.path.join(tmp, "unprepared.db"))
+        for graph in (prepared, unprepared):
+            _fill(graph)
+
+        print(f"{'operation':>20} {'re-planned':>14} {'prepared':>14} {'saved':>14}")
+        for name, op in _OPERATIONS:
+            op(prepared)  # prepare outside the timing
+            before = timed(op, unprepared, repeat=args.repeat)
+            after = timed(op, prepared, repeat=args.repeat)
+            print(f"{name:>20} {fmt_us(before)} {fmt_us(after)} {fmt_us(before - after)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Relation property reads: JSON-string props vs typed columns.
+
+Builds a legacy graph whose Relation rows keep their properties as one
+JSON string (weight, count, last_seen, source plus an extra key), times
+reading every edge with a json.loads per row and a weight filter applied
+in Python, then migrates it with migrate_graph and times the same reads
+through GraphStore: all_relations() from typed columns, and the filter
+pushed down as all_relations(min_weight=...) / get_neighbors(min_weight=...).
+
+Usage:
+    python memorylib/benchmarks/bench_graph_props.py
+    python memorylib/benchmarks/bench_graph_props.py --entities 5000 --relations 50000
+"""
+
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+from typing import Optional
+
+import common  # noqa: F401 — puts memorylib on sys.path
+import kuzu
+import numpy as np
+from common import fmt_us, timed
+
+from memorylib import GraphStore
+from memorylib.graph import migrate_graph
+
+_RELATIONS = ["likes", "visited", "plays_with", "knows"]
+_NEIGHBORS = ("MATCH (a:Entity {name: $name})-[r:Relation]->(b:Entity) "
+              "RETURN b.name, b.type, r.rel_type, r.props")
+
+
+def _legacy(path: str, entities: int, relations: int, seed: int = 0) -> None:
+    """A graph.db in the pre-migration layout: Relation(rel_type, props STRING)."""
+    rng = np.random.default_rng(seed)
+    conn = kuzu.Connection(kuzu.Database(path))
+    conn.execute("CREATE NODE TABLE Entity(name STRING, type STRING, PRIMARY KEY(name))")
+    conn.execute("CREATE REL TABLE Relation(FROM Entity TO Entity, rel_type STRING, props STRING)")
+    conn.execute("UNWIND $names AS name CREATE (:Entity {name: name, type: 'entity'})",
+                 {"names": [f"entity{i}" for i in range(entities)]})
+    edges: set = set()  # GraphStore merges on (from, rel_type, to), so a real store has no duplicates
+    while len(edges) < relations:
+        s, o, r = rng.integers(0, entities), rng.integers(0, entities), rng.integers(0, len(_RELATIONS))
+        edges.add((f"entity{s}", _RELATIONS[r], f"entity{o}"))
+    rows = [{"a": s, "b": o, "rel": r,
+             "props": json.dumps({"weight": float(rng.random()), "count": int(rng.integers(1, 20)),
+                                  "last_seen": "2026-05-01T10:00:00", "source": "chat", "mood": "happy"})}
+            for s, r, o in sorted(edges)]
+    for start in range(0, len(rows), 5000):
+        conn.execute("UNWIND $rows AS row MATCH (a:Entity {name: row.a}), (b:Entity {name: row.b}) "
+                     "CREATE (a)-[:Relation {rel_type: row.rel, props: row.props}]->(b)",
+                     {"rows": rows[start:start + 5000]})
+
+
+def _json_all(conn: kuzu.Connection, min_weight: Optional[float] = None) -> list:
+    result = conn.execute("MATCH (a:Entity)-[r:Relation]->(b:Entity) RETURN a.name, r.rel_type, b.name, r.props "
+                          "ORDER BY a.name, r.rel_type")
+    rows = []
+    while result.has_next():
+        src, rel, dst, props = result.get_next()
+        props = json.loads(props) if props else {}
+        if min_weight is None or props.get("weight", 0.0) >= min_weight:
+            rows.append({"from": src, "rel_type": rel, "to": dst, "props": props})
+    return rows
+
+
+def _json_neighbors(conn: kuzu.Connection, name: str, min_weight: float) -> list:
+    result = conn.execute(_NEIGHBORS, {"name": name})
+    rows = []
+    while result.has_next():
+        other, kind, rel, props = result.get_next()
+        props = json.loads(props) if props else {}
+        if props.get("weight", 0.0) >= min_weight:
+            rows.append([other, kind, rel, props])
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entities", type=int, default=2_000)
+    parser.add_argument("--relations", type=int, default=20_000)
+    parser.add_argument("--min-weight", type=float, default=0.9)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "graph.db")
+        _legacy(path, args.entities, args.relations)
+        conn = kuzu.Connection(kuzu.Database(path))
+        hub = "entity0"
+        json_reads = [
+            timed(_json_all, conn, repeat=args.repeat),
+            timed(_json_all, conn, args.min_weight, repeat=args.repeat),
+            timed(_json_neighbors, conn, hub, args.min_weight, repeat=args.repeat * 20),
+        ]
+        del conn
+        gc.collect()  # close the database before migrating it
+
+        start = time.perf_counter()
+        stats = migrate_graph(path)
+        print(f"{args.entities} entities, {stats['relations']} relations; "
+              f"migrated in {(time.perf_counter() - start) * 1e3:.0f} ms")
+
+        graph = GraphStore(path)
+        assert len(graph.all_relations()) == stats["relations"]
+        typed_reads = [
+            timed(graph.all_relations, repeat=args.repeat),
+            timed(graph.all_relations, min_weight=args.min_weight, repeat=args.repeat),
+            timed(graph.get_neighbors, hub, min_weight=args.min_weight, repeat=args.repeat * 20),
+        ]
+
+        print(f"{'read':>28} {'json props':>14} {'typed':>14} {'speed-up':>9}")
+        labels = ["all_relations", f"all_relations w>={args.min_weight}", f"get_neighbors w>={args.min_weight}"]
+        for label, before, after in zip(labels, json_reads, typed_reads):
+            print(f"{label:>28} {fmt_us(before)} {fmt_us(after)} {before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Facts written per second: per-fact upserts vs batched UNWIND upserts.
+
+Each fact is (subject, relation, object) over a pool of entities, as
+Reflector.mine_episodic produces. The per-fact path issues three
+statements per fact (two entities, one relation), as RobotMemory did
+before; the batched path sends batch_size facts as one upsert_entities
+and one upsert_relations call. Each run starts from an empty database.
+
+Usage:
+    python memorylib/benchmarks/bench_graph_upsert.py
+    python memorylib/benchmarks/bench_graph_upsert.py -n 50000 --batch 1000 5000 20000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import common  # noqa: F401 — puts memorylib on sys.path
+import numpy as np
+
+from memorylib import GraphStore
+
+_RELATIONS = ["likes", "has_pet", "called", "sibling_of", "visited", "plays_with"]
+
+
+def _facts(n: int, entities: int, seed: int = 0) -> list[tuple[str, str, str]]:
+    rng = np.random.default_rng(seed)
+    subj = rng.integers(0, entities, n)
+    obj = rng.integers(0, entities, n)
+    rel = rng.integers(0, len(_RELATIONS), n)
+    return [(f"entity{s}", _RELATIONS[r], f"entity{o}") for s, r, o in zip(subj, rel, obj)]
+
+
+def _per_fact(graph: GraphStore, facts) -> None:
+    for subj, rel, obj in facts:
+        graph.upsert_entity(subj, "entity")
+        graph.upsert_entity(obj, "entity")
+        graph.upsert_relation(subj, rel, obj)
+
+
+def _batched(graph: GraphStore, facts, batch: int) -> None:
+    for start in range(0, len(facts), batch):
+        chunk = facts[start:start + batch]
+        graph.upsert_entities((name, "entity") for subj, _, obj in chunk for name in (subj, obj))
+        graph.upsert_relations(chunk)
+
+
+def _run(fn, facts, *args) -> tuple[float, int]:
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = GraphStore(os.path.join(tmp, "graph.db"))
+        start = time.perf_counter()
+        fn(graph, facts, *args)
+        elapsed = time.perf_counter() - start
+        return elapsed, len(graph.all_relations())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=20_000, help="facts to write")
+    parser.add_argument("--entities", type=int, default=2_000)
+    parser.add_argument("--batch", type=int, nargs="+", default=[6, 100, 1000, 5000])
+    parser.add_argument("--per-fact-limit", type=int, default=2_000,
+                        help="facts timed on the per-fact path (it is slow)")
+    args = parser.parse_args()
+
+    facts = _facts(args.n, args.entities)
+    print(f"{args.n} facts over {args.entities} entities")
+    print(f"{'path':>16} {'facts':>8} {'seconds':>9} {'facts/s':>10} {'edges':>7}")
+    sample = facts[:args.per_fact_limit]
+    elapsed, edges = _run(_per_fact, sample)
+    print(f"{'per-fact':>16} {len(sample):>8} {elapsed:>9.2f} {len(sample) / elapsed:>10.0f} {edges:>7}")
+    for batch in args.batch:
+        elapsed, edges = _run(_batched, facts, batch)
+        print(f"{'batch=' + str(batch):>16} {len(facts):>8} {elapsed:>9.2f} {len(facts) / elapsed:>10.0f} {edges:>7}")
+
+
+if __name__ == "__main__":
+    main()
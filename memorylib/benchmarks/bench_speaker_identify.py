@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+SpeakerStore.identify scoring cost as enrollments grow.
+
+Enrolls synthetic 256-d voice embeddings (each speaker a random direction,
+each sample that direction plus noise) for a grid of speaker counts and
+samples per speaker, then times identify() on a held-out sample three
+ways: the former per-profile, per-sample np.dot loop, scoring="max" (one
+mat-vec over the (S, 256) enrollment matrix plus np.maximum.at per owner)
+and scoring="centroid" (one row per speaker). The resemblyzer encoder is
+bypassed, so only scoring is measured. Also reports how often each mode
+names the right speaker, and the cost of opening the store from disk.
+
+Usage:
+    python memorylib/benchmarks/bench_speaker_identify.py
+    python memorylib/benchmarks/bench_speaker_identify.py --speakers 5 50 --samples 20 200
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import common  # noqa: F401 — puts memorylib on sys.path
+import numpy as np
+from common import fmt_us, timed
+
+from memorylib import SpeakerStore
+
+_DIM = 256  # resemblyzer
+
+
+def _unit(m: np.ndarray) -> np.ndarray:
+    return (m / np.linalg.norm(m, axis=-1, keepdims=True)).astype(np.float32)
+
+
+def _write(path: str, speakers: int, samples: int, noise: float, rng) -> np.ndarray:
+    """Write a speakers.jsonl with samples rows per speaker; returns the voice directions."""
+    voices = rng.standard_normal((speakers, _DIM))
+    with open(path, "w") as f:
+        for i in range(samples):
+            for s in range(speakers):
+                row = _unit(voices[s] + noise * rng.standard_normal(_DIM))
+                f.write(json.dumps({"name": f"speaker{s}", "embedding": row.tolist()}) + "\n")
+    return voices
+
+
+def _loop_identify(profiles: dict, embedding: np.ndarray) -> str:
+    """The former identify(): a Python loop with one np.dot per enrolled sample."""
+    best_name, best_score = None, -1.0
+    for name, embeddings in profiles.items():
+        score = max(float(np.dot(embedding, e)) for e in embeddings)
+        if score > best_score:
+            best_name, best_score = name, score
+    return best_name
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--speakers", type=int, nargs="+", default=[5, 20, 50])
+    parser.add_argument("--samples", type=int, nargs="+", default=[10, 50, 200], help="samples per speaker")
+    parser.add_argument("--noise", type=float, default=0.8, help="per-sample noise around each voice")
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'speakers':>8} {'samples':>8} {'rows':>7} {'open':>9} {'loop':>14} {'max':>14} {'centroid':>14} "
+          f"{'speed-up':>9} {'hit max/cen':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for speakers in args.speakers:
+            for samples in args.samples:
+                path = os.path.join(tmp, f"speakers{speakers}x{samples}.jsonl")
+                voices = _write(path, speakers, samples, args.noise, rng)
+                start = time.perf_counter()
+                stores = {scoring: SpeakerStore(path, scoring=scoring) for scoring in ("max", "centroid")}
+                opened = (time.perf_counter() - start) / 2
+                rows = stores["max"]._matrix.view()
+                owners = stores["max"]._owners.view()[:, 0]
+                profiles = {name: list(rows[owners == i]) for i, name in enumerate(stores["max"].speakers())}
+
+                truth = rng.integers(0, speakers, args.queries)
+                queries = _unit(voices[truth] + args.noise * rng.standard_normal((args.queries, _DIM)))
+                loop, fast, centroid, hits = [], [], [], {"max": 0, "centroid": 0}
+                for s, query in zip(truth, queries):
+                    for scoring, store in stores.items():
+                        store._embed = lambda _, q=query: q
+                        hits[scoring] += store.identify(b"", threshold=-1.0) == f"speaker{s}"
+                    assert stores["max"].identify(b"", threshold=-1.0) == _loop_identify(profiles, query)
+                    loop.append(timed(_loop_identify, profiles, query, repeat=3))
+                    fast.append(timed(stores["max"].identify, b"", threshold=-1.0, repeat=3))
+                    centroid.append(timed(stores["centroid"].identify, b"", threshold=-1.0, repeat=3))
+                loop_p50, fast_p50 = float(np.median(loop)), float(np.median(fast))
+                print(f"{speakers:>8} {samples:>8} {len(rows):>7} {opened * 1e3:>7.0f}ms {fmt_us(loop_p50)} "
+                      f"{fmt_us(fast_p50)} {fmt_us(float(np.median(centroid)))} {loop_p50 / fast_p50:>8.0f}x "
+                      f"{hits['max']:>5}/{hits['centroid']:<6}")
+
+
+if __name__ == "__main__":
+    main()
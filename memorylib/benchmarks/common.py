@@ -0,0 +1,69 @@
+"""Shared helpers for the memorylib benchmark scripts."""
+
+import os
+import sys
+import time
+import zlib
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+DIM = 384  # all-MiniLM-L6-v2
+
+
+class StubModel:
+    """Deterministic stand-in for SentenceTransformer: text -> stable unit vector."""
+
+    def __init__(self, dim: int = DIM):
+        self.dim = dim
+
+    def encode(self, text, normalize_embeddings=False, **kwargs):
+        if isinstance(text, list):
+            return np.stack([self.encode(t) for t in text])
+        rng = np.random.default_rng(zlib.crc32(text.encode()))
+        v = rng.standard_normal(self.dim).astype(np.float32)
+        return v / np.linalg.norm(v)
+
+
+def load_model(name: str):
+    """Return StubModel for 'stub', otherwise a real SentenceTransformer."""
+    if name == "stub":
+        return StubModel()
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(name)
+
+
+def random_unit_rows(n: int, dim: int = DIM, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    m = rng.standard_normal((n, dim)).astype(np.float32)
+    m /= np.linalg.norm(m, axis=1, keepdims=True)
+    return m
+
+
+def clustered_unit_rows(n: int, dim: int = DIM, clusters: int = 256, spread: float = 0.35,
+                        seed: int = 0) -> np.ndarray:
+    """Unit rows drawn around random topic centres — closer to real sentence embeddings."""
+    rng = np.random.default_rng(seed)
+    centres = random_unit_rows(clusters, dim, seed + 1)
+    m = centres[rng.integers(0, clusters, n)] + spread * random_unit_rows(n, dim, seed + 2)
+    m /= np.linalg.norm(m, axis=1, keepdims=True)
+    return m.astype(np.float32)
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    return len(set(found.tolist()) & set(truth.tolist())) / len(truth)
+
+
+def timed(fn, *args, repeat: int = 1, **kwargs) -> float:
+    """Return the median wall time of fn(*args, **kwargs) in seconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args, **kwargs)
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples))
+
+
+def fmt_us(seconds: float) -> str:
+    return f"{seconds * 1e6:10.1f} us"
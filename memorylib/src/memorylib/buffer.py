@@ -0,0 +1,194 @@
+import os
+import struct
+from typing import Optional
+
+import numpy as np
+
+_INITIAL_CAPACITY = 64
+
+# Sidecar header: magic, format version, row width, filled row count, padding.
+# The magic encodes the element type.
+_HEADER = struct.Struct("<8sIIQ8x")
+_MAGICS = {
+    np.dtype(np.float32): b"MLEMBF32",
+    np.dtype(np.int8): b"MLEMBI8\0",
+    np.dtype(np.uint8): b"MLEMBU8\0",
+}
+_VERSION = 1
+
+
+class EmbeddingBuffer:
+    """
+    Growable (N, D) row buffer with capacity doubling.
+
+    Appending a row is amortised O(D): the backing array is only reallocated
+    when it is full, and then to twice its size. view() returns the filled
+    rows without copying.
+
+    The row width D is fixed by the first append unless given up front.
+    """
+
+    def __init__(self, dim: Optional[int] = None, dtype=np.float32):
+        self._dim = dim
+        self._dtype = np.dtype(dtype)
+        self._data: Optional[np.ndarray] = None
+        self._count = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def append(self, row: np.ndarray) -> int:
+        """Append one row and return its index."""
+        return self.extend(np.asarray(row).reshape(1, -1))
+
+    def extend(self, rows: np.ndarray) -> int:
+        """Append an (M, D) block and return the index of its first row."""
+        rows = np.asarray(rows, dtype=self._dtype)
+        if rows.ndim != 2:
+            raise ValueError(f"Expected a 2-D block, got shape {rows.shape}")
+        if self._dim is None:
+            self._dim = rows.shape[1]
+        if rows.shape[1] != self._dim:
+            raise ValueError(f"Row width {rows.shape[1]} does not match buffer width {self._dim}")
+        start = self._count
+        self._reserve(start + len(rows))
+        self._data[start:start + len(rows)] = rows
+        self._count += len(rows)
+        return start
+
+    def view(self) -> Optional[np.ndarray]:
+        """Return the filled rows as a view, or None if empty."""
+        if self._count == 0:
+            return None
+        return self._data[:self._count]
+
+    def reserve(self, capacity: int) -> None:
+        """Grow to exactly capacity rows now, e.g. before a bulk load of known size."""
+        if self._dim is None:
+            raise ValueError("Cannot reserve before the row width is known")
+        if capacity > self.capacity:
+            self._grow(capacity)
+
+    def truncate(self, count: int) -> None:
+        """Drop rows past count; capacity is kept."""
+        self._count = min(self._count, count)
+
+    def clear(self) -> None:
+        self._data = None
+        self._count = 0
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self._dim
+
+    @property
+    def capacity(self) -> int:
+        return 0 if self._data is None else len(self._data)
+
+    def __len__(self) -> int:
+        return self._count
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _reserve(self, needed: int) -> None:
+        capacity = self.capacity
+        if needed <= capacity:
+            return
+        new_capacity = max(capacity, _INITIAL_CAPACITY)
+        while new_capacity < needed:
+            new_capacity *= 2
+        self._grow(new_capacity)
+
+    def _grow(self, capacity: int) -> None:
+        data = np.empty((capacity, self._dim), dtype=self._dtype)
+        if self._count:
+            data[:self._count] = self._data[:self._count]
+        self._data = data
+
+
+class MappedEmbeddingBuffer(EmbeddingBuffer):
+    """
+    EmbeddingBuffer backed by a fixed-stride file opened with np.memmap.
+
+    File layout: a 32-byte header (magic, version, dim, row count) followed by
+    capacity x dim little-endian rows of float32 (default), int8 or uint8. Opening is O(1) regardless of
+    row count — pages are read on demand by the OS. The file grows by the
+    same doubling rule as the in-memory buffer; only the first `count` rows
+    are meaningful.
+
+    The header count is updated after each append, so a row is visible on
+    reopen once append()/extend() has returned. Writes reach disk through
+    normal page-cache writeback; call flush() to force them out.
+    """
+
+    def __init__(self, path: str, dim: Optional[int] = None, dtype=np.float32):
+        super().__init__(dim, dtype)
+        if self._dtype not in _MAGICS:
+            raise ValueError(f"Unsupported sidecar dtype {self._dtype}")
+        self._magic = _MAGICS[self._dtype]
+        self.path = os.path.abspath(path)
+        if os.path.exists(self.path):
+            self._open()
+
+    def extend(self, rows: np.ndarray) -> int:
+        start = super().extend(rows)
+        self._write_count()
+        return start
+
+    def truncate(self, count: int) -> None:
+        super().truncate(count)
+        if os.path.exists(self.path):
+            self._write_count()
+
+    def clear(self) -> None:
+        self._data = None
+        self._count = 0
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def flush(self) -> None:
+        if self._data is not None:
+            self._data.flush()
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _open(self) -> None:
+        with open(self.path, "rb") as f:
+            magic, version, dim, count = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != self._magic or version != _VERSION:
+            raise ValueError(f"{self.path} is not a {self._dtype} embedding sidecar (v{_VERSION})")
+        if self._dim is not None and dim != self._dim:
+            raise ValueError(f"{self.path} has row width {dim}, expected {self._dim}")
+        self._dim = dim
+        capacity = (os.path.getsize(self.path) - _HEADER.size) // (dim * self._dtype.itemsize)
+        self._count = min(count, capacity)
+        self._map(capacity)
+
+    def _grow(self, capacity: int) -> None:
+        if self._data is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "wb") as f:
+                f.write(_HEADER.pack(self._magic, _VERSION, self._dim, 0))
+        else:
+            self._data.flush()
+            self._data = None
+        os.truncate(self.path, _HEADER.size + capacity * self._dim * self._dtype.itemsize)
+        self._map(capacity)
+
+    def _map(self, capacity: int) -> None:
+        if capacity == 0:
+            self._data = None
+            return
+        self._data = np.memmap(
+            self.path, dtype=self._dtype.newbyteorder("<"), mode="r+", offset=_HEADER.size,
+            shape=(capacity, self._dim),
+        )
+
+    def _write_count(self) -> None:
+        with open(self.path, "r+b") as f:
+            f.write(_HEADER.pack(self._magic, _VERSION, self._dim, self._count))
@@ -0,0 +1,124 @@
+import atexit
+import hashlib
+import logging
+import os
+import weakref
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """Case-fold and collapse whitespace. Safe for uncased models like all-MiniLM-L6-v2."""
+    return " ".join(text.casefold().split())
+
+
+class EmbeddingCache:
+    """
+    Bounded LRU of text embeddings keyed by a hash of the normalised text.
+
+    Repeated utterances ("tell me a joke", "[voice input]") skip the model
+    entirely. Keys are 20-byte SHA-1 digests so memory is bounded by
+    max_size x (D floats + ~100 bytes) regardless of text length.
+
+    If path is given the cache is loaded from it on start-up and saved back
+    (atomically, as .npz) every save_every new entries, on save(), and at
+    interpreter exit if entries are still unsaved.
+    """
+
+    def __init__(self, max_size: int = 1024, path: Optional[str] = None, save_every: int = 64):
+        self.max_size = max_size
+        self.path = os.path.abspath(path) if path else None
+        self.save_every = save_every
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()  # digest -> np.ndarray
+        self._unsaved = 0
+        self._load()
+        if self.path:
+            atexit.register(_save_at_exit, weakref.ref(self))
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        key = self._key(text)
+        vec = self._entries.get(key)
+        if vec is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return vec
+
+    def put(self, text: str, vec: np.ndarray) -> None:
+        if self.max_size <= 0:
+            return
+        key = self._key(text)
+        self._entries[key] = vec
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        self._unsaved += 1
+        if self.path and self._unsaved >= self.save_every:
+            self.save()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def save(self) -> None:
+        """Write the cache to path, if it has entries not on disk yet."""
+        if not self.path or not self._entries or not self._unsaved:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp.npz"
+            keys = np.frombuffer(b"".join(self._entries), dtype=np.uint8).reshape(-1, 20)
+            np.savez(tmp_path, keys=keys, vectors=np.stack(list(self._entries.values())))
+            os.replace(tmp_path, self.path)
+            self._unsaved = 0
+        except Exception as e:
+            logger.error(f"[Cache] Failed to save {self.path}: {e}")
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.sha1(normalize_text(text).encode()).digest()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path) or self.max_size <= 0:
+            return
+        try:
+            with np.load(self.path) as data:
+                keys, vectors = data["keys"], data["vectors"]
+            for key, vec in zip(keys[-self.max_size:], vectors[-self.max_size:]):
+                self._entries[key.tobytes()] = vec
+            logger.debug(f"[Cache] Loaded {len(self._entries)} embeddings from {self.path}")
+        except Exception as e:
+            logger.warning(f"[Cache] Ignoring unreadable cache {self.path}: {e}")
+
+
+def _save_at_exit(ref: weakref.ref) -> None:
+    cache = ref()  # a weak reference, so registering does not keep every cache alive
+    if cache is not None:
+        cache.save()
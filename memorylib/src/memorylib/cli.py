@@ -9,6 +9,7 @@ Usage:
     enroll-speaker --list                                  # list enrolled speakers
     enroll-speaker --identify                              # record and identify
     enroll-speaker --identify --file sample.wav            # identify from file
+    enroll-speaker --identify --scoring centroid           # score against per-speaker means
     enroll-speaker --path /custom/path/speakers.jsonl --name "Kabir"
 """
 
@@ -62,10 +63,12 @@ def main():
     parser.add_argument("--file", help="Path to an existing WAV file instead of recording")
     parser.add_argument("--list", action="store_true", help="List enrolled speakers and sample counts")
     parser.add_argument("--identify", action="store_true", help="Record (or use --file) and identify the speaker")
+    parser.add_argument("--scoring", choices=("max", "centroid"), default="max",
+                        help="Score each speaker by their best sample or their mean (default: max)")
     parser.add_argument("--path", default=_DEFAULT_PATH, help=f"Path to speakers file (default: {_DEFAULT_PATH})")
     args = parser.parse_args()
 
-    store = SpeakerStore(path=args.path)
+    store = SpeakerStore(path=args.path, scoring=args.scoring)
 
     if args.list:
         speakers = store.speakers()
@@ -0,0 +1,86 @@
+from typing import Optional
+
+import numpy as np
+
+from .buffer import EmbeddingBuffer
+
+
+class NearDuplicateFinder:
+    """
+    Find earlier rows nearly identical to a new vector, without a full scan.
+
+    Candidates are the last `window` rows (repeats in the same burst of
+    play) plus rows sharing a random-hyperplane LSH bucket with the vector
+    in any of `tables` tables of `bits` bits each (repeats from earlier in
+    the day). At most max_candidates bucket hits, those colliding in the
+    most tables, are rescored exactly. Like VectorIndex, the matrix is owned
+    by the caller and sync() signs rows appended since the previous call.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        window: int = 32,
+        tables: int = 4,
+        bits: int = 8,
+        max_candidates: int = 64,
+        seed: int = 0,
+    ):
+        if not 1 <= bits <= 8:
+            raise ValueError(f"bits must be between 1 and 8, got {bits}")
+        self.threshold = threshold
+        self.window = window
+        self.tables = tables
+        self.bits = bits
+        self.max_candidates = max_candidates
+        self._seed = seed
+        self._planes: Optional[np.ndarray] = None  # (D, tables * bits)
+        self._signatures = EmbeddingBuffer(dim=tables, dtype=np.uint8)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def sync(self, matrix: Optional[np.ndarray], chunk: int = 65536) -> None:
+        """Sign rows appended to matrix since the last sync."""
+        n = 0 if matrix is None else len(matrix)
+        if n < len(self._signatures):
+            self.reset()
+        for start in range(len(self._signatures), n, chunk):
+            self._signatures.extend(self._sign(np.asarray(matrix[start:start + chunk])))
+
+    def find(self, matrix: Optional[np.ndarray], vec: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return (rows, scores) of candidates at or above threshold, best first."""
+        if matrix is None or not len(matrix):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        self.sync(matrix)
+        n = len(matrix)
+        signature = self._sign(vec.reshape(1, -1))
+        signatures = self._signatures.view()
+        collisions = np.zeros(n, dtype=np.uint8)
+        for t in range(self.tables):  # column by column: ~6x faster than a 2-D sum
+            collisions += signatures[:, t] == signature[0, t]
+        bucket = np.flatnonzero(collisions)
+        if len(bucket) > self.max_candidates:
+            bucket = bucket[np.argpartition(collisions[bucket], -self.max_candidates)[-self.max_candidates:]]
+        rows = np.union1d(bucket, np.arange(max(0, n - self.window), n))
+        scores = matrix[rows] @ vec
+        hit = scores >= self.threshold
+        order = np.argsort(scores[hit])[::-1]
+        return rows[hit][order], scores[hit][order]
+
+    def reset(self) -> None:
+        self._signatures.clear()
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _sign(self, rows: np.ndarray) -> np.ndarray:
+        """(M, D) rows -> (M, tables) bucket ids."""
+        if self._planes is None:
+            rng = np.random.default_rng(self._seed)
+            self._planes = rng.standard_normal((rows.shape[1], self.tables * self.bits)).astype(np.float32)
+        bits = (rows @ self._planes > 0).reshape(len(rows), self.tables, self.bits)
+        weights = (1 << np.arange(self.bits)).astype(np.uint8)
+        return (bits * weights).sum(axis=2).astype(np.uint8)
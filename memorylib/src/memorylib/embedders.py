@@ -0,0 +1,115 @@
+import logging
+import os
+import platform
+from typing import Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+
+
+class Embedder:
+    """
+    Text -> unit-vector encoder used by EpisodicStore.
+
+    The interface is the subset of SentenceTransformer.encode the store uses,
+    so a SentenceTransformer instance (or a test stub) works as-is:
+    a single string returns a (D,) vector, a list returns (N, D).
+    """
+
+    def encode(
+        self,
+        sentences: Union[str, list],
+        batch_size: int = 32,
+        normalize_embeddings: bool = True,
+    ) -> np.ndarray:
+        raise NotImplementedError
+
+
+class SentenceTransformerEmbedder(Embedder):
+    """PyTorch sentence-transformers backend (the default)."""
+
+    def __init__(self, model_name: str = DEFAULT_MODEL):
+        from sentence_transformers import SentenceTransformer
+        self._model = SentenceTransformer(model_name)
+
+    def encode(self, sentences, batch_size=32, normalize_embeddings=True):
+        return self._model.encode(sentences, batch_size=batch_size, normalize_embeddings=normalize_embeddings)
+
+
+class OnnxEmbedder(Embedder):
+    """
+    ONNX Runtime backend for all-MiniLM-L6-v2 — no torch import.
+
+    Expects the layout of the sentence-transformers/all-MiniLM-L6-v2 Hub repo
+    (see scripts/download_embedder.sh): tokenizer.json at the top level and
+    the exported graph under onnx/. quantized=True picks the int8 graph for
+    the host CPU (arm64 for the Pi, AVX2 elsewhere); model_file overrides.
+
+    Runs the same weights with the same mean pooling + L2 normalisation as
+    sentence-transformers, so vectors are interchangeable with stores
+    embedded by the PyTorch model (the int8 graph is close, not identical).
+    Requires the optional onnxruntime and tokenizers packages.
+    """
+
+    def __init__(
+        self,
+        model_dir: str,
+        quantized: bool = False,
+        model_file: Optional[str] = None,
+        max_length: int = 256,
+        threads: Optional[int] = None,
+    ):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_file = model_file or _onnx_model_file(quantized)
+        self._tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self._tokenizer.enable_truncation(max_length=max_length)
+        self._tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self._session = ort.InferenceSession(
+            os.path.join(model_dir, model_file), options, providers=["CPUExecutionProvider"]
+        )
+        self._inputs = {i.name for i in self._session.get_inputs()}
+        logger.info(f"[Embedder] Loaded ONNX model {model_file}")
+
+    def encode(self, sentences, batch_size=32, normalize_embeddings=True):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        out = [self._encode_batch(texts[i:i + batch_size], normalize_embeddings)
+               for i in range(0, len(texts), batch_size)]
+        vectors = np.concatenate(out) if out else np.empty((0, 0), dtype=np.float32)
+        return vectors[0] if single else vectors
+
+    def _encode_batch(self, texts: list, normalize: bool) -> np.ndarray:
+        encodings = self._tokenizer.encode_batch(texts)
+        ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feed = {"input_ids": ids, "attention_mask": mask}
+        if "token_type_ids" in self._inputs:
+            feed["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+        hidden = self._session.run(None, feed)[0]
+        return mean_pool(hidden, mask, normalize)
+
+
+def mean_pool(hidden: np.ndarray, mask: np.ndarray, normalize: bool = True) -> np.ndarray:
+    """Masked mean over tokens of (B, T, D) hidden states, optionally L2-normalised."""
+    weights = mask[:, :, None].astype(np.float32)
+    pooled = (hidden * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+    if normalize:
+        pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+    return pooled.astype(np.float32)
+
+
+def _onnx_model_file(quantized: bool) -> str:
+    if not quantized:
+        return os.path.join("onnx", "model.onnx")
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return os.path.join("onnx", "model_qint8_arm64.onnx")
+    return os.path.join("onnx", "model_quint8_avx2.onnx")
@@ -1,32 +1,143 @@
+import glob
 import json
 import logging
 import os
-from datetime import datetime
-from typing import Optional
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Optional, Union
 
 import numpy as np
 
+from .buffer import EmbeddingBuffer, MappedEmbeddingBuffer
+from .cache import EmbeddingCache, normalize_text
+from .dedupe import NearDuplicateFinder
+from .embedders import Embedder, SentenceTransformerEmbedder
+from .index import VectorIndex, make_index
+from .lexical import BM25Index
+
 logger = logging.getLogger(__name__)
 
-_MODEL_NAME = "all-MiniLM-L6-v2"
+_INDEX_SAVE_EVERY = 1024  # inserts between index checkpoints
+_SEARCH_MODES = ("hybrid", "vector", "lexical")
+_CANDIDATE_POOL = 50  # candidates taken from each ranking before fusion, recency or MMR rerank
+_RRF_K = 60        # reciprocal rank fusion damping constant
+_MANIFEST_VERSION = 1
+
+
+class _Entry:
+    """One episodic record. The vector lives only in the sidecar, at `row`."""
+
+    __slots__ = ("id", "text", "metadata", "row")
+
+    def __init__(self, id: str, text: str, metadata: Optional[dict] = None, row: Optional[int] = None):
+        self.id = id
+        self.text = text
+        self.metadata = metadata
+        self.row = row
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "_Entry":
+        return cls(d.get("id", ""), d.get("text", ""), d.get("metadata"), d.get("row"))
+
+    def to_dict(self) -> dict:
+        d: dict = {"id": self.id, "text": self.text}
+        if self.metadata:
+            d["metadata"] = self.metadata
+        if self.row is not None:
+            d["row"] = self.row
+        return d
 
 
 class EpisodicStore:
     """
     Append-only episodic memory with semantic search.
 
-    Entries are persisted as JSONL. Embeddings are stored inline so the
-    matrix is rebuilt from disk on startup without recomputing them.
+    Entries (id, text, metadata, row) are persisted as JSONL and held in
+    memory as compact __slots__ records. Embeddings live
+    in a fixed-stride float32 sidecar next to it (episodic.jsonl ->
+    episodic.f32) which is memory-mapped on startup, so opening the store
+    never parses floats and store() appends a single row. Each entry's "row"
+    is its offset in the sidecar; entries without one are not searchable.
+
+    Stores written by older versions with inline "embedding" lists are
+    migrated to the sidecar layout automatically on first load.
+
+    compact() rewrites the store into a new generation: immutable JSONL
+    segments holding only searchable, de-duplicated entries, a fresh
+    sidecar and an empty live log, committed by atomically replacing
+    episodic.manifest.json. Startup then reads the manifest's segments and
+    the live log; files of other generations are never read.
+
+    search() goes through a pluggable VectorIndex: "exact" (brute force,
+    default), "ivf" (approximate), "int8" / "binary" (quantised codes with
+    float rerank, for low-memory devices), or any instance — see
+    memorylib.index. Index state is checkpointed next to the log
+    (episodic.index.*); rows appended since the last checkpoint are indexed
+    on load.
+
+    search() defaults to hybrid mode: the vector ranking is fused with a
+    BM25 ranking (memorylib.lexical) by reciprocal rank, so exact names win
+    even when the surrounding turn is only vaguely similar. The BM25 index
+    is built from the log on the first lexical/hybrid search and updated on
+    every insert. If the embedder is not loaded yet, hybrid search answers
+    from BM25 alone rather than waiting for the model.
 
-    The sentence-transformer model is lazy-loaded on first store/search.
+    Each entry's timestamp (its id) and metadata["speaker"] are also kept as
+    columnar arrays, so search(speaker=..., since=...) becomes a boolean
+    mask handed to the index and BM25 scorer — only matching rows are
+    scored. recency_half_life re-ranks the best candidates by
+    score x 0.5 ** (age / half_life).
+
+    With dedupe set to a cosine threshold, store() first looks for a nearly
+    identical earlier turn by the same speaker among the last dedupe_window
+    rows and its LSH buckets (memorylib.dedupe). On a match no row is added;
+    the earlier entry's metadata "count" and "last_seen" are bumped through
+    a small update line appended to the log. store_many() applies the same
+    check to every row, including earlier rows of its own batch.
+    dedupe_stats() reports how many turns were suppressed this session.
+
+    Embeddings for both store() and search() go through an LRU cache keyed
+    by normalised text (self.cache, see memorylib.cache), so repeated
+    utterances skip the model. persist_cache keeps it in episodic.cache.npz
+    across restarts; it is saved as it grows, on close() and at exit.
+
+    The embedder is lazy-loaded on first store/search. embedder is a
+    zero-argument factory returning an Embedder (memorylib.embedders);
+    the default is the PyTorch sentence-transformers all-MiniLM-L6-v2, and
+    e.g. functools.partial(OnnxEmbedder, model_dir) swaps in ONNX Runtime
+    without re-embedding existing entries. warm_up() loads it ahead of time
+    and may run on a background thread; callers that need the model wait on
+    the same lock instead of loading it twice.
+
+    One store may be shared by several threads (e.g. one per session):
+    writes and compact() hold a store lock, and search() reads the sidecar
+    and position arrays under it. Embedding happens outside the lock.
     """
 
-    def __init__(self, path: str):
+    def __init__(
+        self,
+        path: str,
+        index: Union[str, VectorIndex] = "exact",
+        cache_size: int = 1024,
+        persist_cache: bool = False,
+        embedder: Optional[Callable[[], Embedder]] = None,
+        dedupe: Optional[float] = None,
+        dedupe_window: int = 32,
+    ):
         self._path = os.path.abspath(path)
+        self._base = os.path.splitext(self._path)[0]
+        self._manifest_path = self._base + ".manifest.json"
+        self.cache = EmbeddingCache(cache_size, self._base + ".cache.npz" if persist_cache else None)
+        self._index = make_index(index)
+        self._embedder_factory = embedder or SentenceTransformerEmbedder
         self._model = None
-        self._entries: list[dict] = []   # all persisted entries
-        self._indexed: list[dict] = []   # subset with valid embeddings
-        self._matrix: Optional[np.ndarray] = None  # (N, D) — 1:1 with _indexed
+        self._model_lock = threading.Lock()
+        self._lock = threading.Lock()  # guards the sidecar, position arrays, entries and log
+        self._dedupe = NearDuplicateFinder(dedupe, dedupe_window) if dedupe is not None else None
+        self._stored = 0      # turns added by store() this session
+        self._suppressed = 0  # turns merged into an earlier one instead
+        self._generation, self._segments = self._read_manifest()
+        self._open_generation()
         self._load()
 
     # ------------------------------------------------------------------
@@ -37,33 +148,233 @@ class EpisodicStore:
         """Embed and persist a text entry."""
         self._ensure_model()
         embedding = self._embed(text)
-        entry: dict = {
-            "id": datetime.now().isoformat(timespec="seconds"),
-            "text": text,
-            "embedding": embedding.tolist(),
-        }
-        if metadata:
-            entry["metadata"] = metadata
-        self._entries.append(entry)
-        self._indexed.append(entry)
-        self._rebuild_matrix()
-        self._append_entry(entry)
-
-    def search(self, query: str, top_k: int = 3) -> list[str]:
-        """Return the top_k most semantically similar entry texts."""
-        if self._matrix is None or not self._indexed:
+        entry = _Entry(datetime.now().isoformat(timespec="seconds"), text, metadata or None)
+        with self._lock:
+            if self._dedupe is not None:
+                pos = self._find_duplicate(entry, embedding)
+                if pos is not None:
+                    self._merge_turn(pos, entry.id)
+                    self._suppressed += 1
+                    return
+            self._add([entry], embedding.reshape(1, -1))
+            self._stored += 1
+
+    def store_many(
+        self,
+        texts: list[str],
+        metadatas: Optional[list[Optional[dict]]] = None,
+        batch_size: int = 32,
+    ) -> int:
+        """
+        Embed and persist many entries, e.g. when importing old transcripts.
+
+        Texts are encoded batch_size at a time in one model call each; every
+        batch is appended to the matrix as one block and written to the log
+        in a single buffered write. With dedupe set, rows that nearly repeat
+        a stored turn or an earlier row are merged as in store(). Each
+        entry's id is the call's start time plus its index in microseconds,
+        so ids stay unique and in input order. Returns the number of
+        entries stored.
+        """
+        if metadatas is not None and len(metadatas) != len(texts):
+            raise ValueError(f"Got {len(metadatas)} metadatas for {len(texts)} texts")
+        if not texts:
+            return 0
+        self._ensure_model()
+        now = datetime.now()
+        stored = 0
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            metas = metadatas[start:start + batch_size] if metadatas is not None else [None] * len(batch)
+            ids = [(now + timedelta(microseconds=start + i)).isoformat(timespec="microseconds") for i in range(len(batch))]
+            entries = [_Entry(entry_id, text, meta or None) for entry_id, text, meta in zip(ids, batch, metas)]
+            embeddings = self._embed_batch(batch, batch_size)
+            with self._lock:
+                if self._dedupe is not None:
+                    entries, embeddings = self._dedupe_batch(entries, embeddings)
+                if entries:
+                    self._add(entries, embeddings)
+                self._stored += len(entries)
+            stored += len(entries)
+        return stored
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 3,
+        mode: str = "hybrid",
+        speaker: Optional[str] = None,
+        since: Optional[Union[datetime, str]] = None,
+        recency_half_life: Optional[Union[timedelta, float]] = None,
+        diversity: Optional[float] = None,
+    ) -> list[str]:
+        """
+        Return the texts of the top_k entries most relevant to query.
+
+        mode is "hybrid" (vector + BM25, fused by reciprocal rank), "vector"
+        (semantic only) or "lexical" (BM25 only — never touches the model).
+        Hybrid drops to lexical while the embedder is not loaded.
+
+        speaker keeps only entries whose metadata["speaker"] matches; since
+        (datetime or ISO string, naive local time or timezone-aware) only
+        entries stored at or after it.
+        recency_half_life (timedelta or seconds) decays each candidate's
+        score by half for every half-life of age.
+
+        diversity (0..1) reranks the candidate pool by maximal marginal
+        relevance: each pick trades relevance against its highest cosine
+        similarity to the turns already picked, so near-copies of one
+        exchange do not crowd out the rest. 0 keeps the relevance order.
+        """
+        if mode not in _SEARCH_MODES:
+            raise ValueError(f"Unknown search mode {mode!r}; expected one of {_SEARCH_MODES}")
+        if diversity is not None and not 0.0 <= diversity <= 1.0:
+            raise ValueError(f"diversity must be between 0 and 1, got {diversity!r}")
+        if not self._entries or top_k <= 0:
             return []
+        if mode == "hybrid" and not self.ready:
+            mode = "lexical"
+        q = None
+        if mode != "lexical" and len(self._buffer):
+            self._ensure_model()
+            q = self._embed(query)
+        with self._lock:
+            allowed = self._filter_mask(speaker, since)
+            if allowed is not None and not allowed.any():
+                return []
+            decay = self._decay(recency_half_life)
+            rerank = mode == "hybrid" or decay is not None or diversity is not None
+            pool = max(top_k, _CANDIDATE_POOL) if rerank else top_k
+
+            rankings = []
+            if mode != "lexical":
+                rankings.append(self._vector_search(q, pool, allowed))
+            if mode != "vector":
+                rankings.append(self._ensure_lexical().search(query, pool, mask=allowed))
+            if decay is not None:
+                rankings = [self._decayed(docs, scores, decay) for docs, scores in rankings]
+            if len(rankings) == 1:
+                docs, scores = rankings[0]
+            else:
+                fused: dict = {}  # entry position -> fused score
+                for ranked, _ in rankings:
+                    for rank, doc in enumerate(ranked.tolist()):
+                        fused[doc] = fused.get(doc, 0.0) + 1.0 / (_RRF_K + rank + 1)
+                docs = np.array(sorted(fused, key=fused.get, reverse=True), dtype=np.int64)
+                scores = np.array([fused[doc] for doc in docs.tolist()], dtype=np.float32)
+            if diversity:
+                docs = self._mmr(docs, scores, top_k, diversity)
+            return [self._entries[i].text for i in docs[:top_k].tolist()]
+
+    def all_entries(self, include_embeddings: bool = False) -> list[dict]:
+        """
+        Return all persisted entries as dicts (id, text, metadata, row).
+
+        With include_embeddings, indexed entries also get an "embedding" list
+        read back from the sidecar — built on demand, never kept in memory.
+        """
+        with self._lock:
+            matrix = self._matrix if include_embeddings else None
+            out = []
+            for entry in self._entries:
+                d = entry.to_dict()
+                if matrix is not None and entry.row is not None:
+                    d["embedding"] = matrix[entry.row].tolist()
+                out.append(d)
+        return out
+
+    def compact(self, dedupe_threshold: float = 0.97, window: int = 32, segment_size: int = 100_000) -> dict:
+        """
+        Rewrite the store into a new generation of segment files.
+
+        Entries without a searchable row (e.g. non-finite embeddings) are
+        dropped. Turns by the same speaker are merged when their normalised
+        text is identical or their cosine similarity is at least
+        dedupe_threshold within window consecutive entries; the earliest
+        turn is kept with metadata "count" (turns merged into it) and
+        "last_seen" (id of the latest one). The survivors are written as
+        JSONL segments of segment_size lines with a fresh sidecar, then the
+        manifest is replaced atomically and the old generation is deleted —
+        a crash at any point leaves either the old or the new store intact.
+
+        Returns counts: entries (before), dropped, merged, kept, segments.
+        """
+        with self._lock:
+            entries = self._entries
+            positions = np.array([i for i, e in enumerate(entries) if e.row is not None], dtype=np.int64)
+            valid = [entries[i] for i in positions]
+            rows = np.array([e.row for e in valid], dtype=np.int64)
+            roots, counts = self._duplicate_roots(valid, rows, positions, dedupe_threshold, window)
+            totals = np.bincount(roots, weights=counts, minlength=len(valid))
+            latest = np.arange(len(valid))
+            np.maximum.at(latest, roots, np.arange(len(valid)))
+            keep = np.flatnonzero(roots == np.arange(len(valid)))
+
+            generation = self._generation + 1
+            log_path, sidecar_path, _ = self._generation_paths(generation)
+            for stale in [log_path, sidecar_path] + glob.glob(glob.escape(self._segment_prefix(generation)) + "*"):
+                if os.path.exists(stale):
+                    os.remove(stale)  # left over from an interrupted compaction
+            sidecar = MappedEmbeddingBuffer(sidecar_path, dim=self._buffer.dim)
+            if len(keep):
+                sidecar.reserve(len(keep))
+            segments = []
+            for start in range(0, len(keep), segment_size):
+                chunk = keep[start:start + segment_size]
+                sidecar.extend(self._matrix[rows[chunk]])
+                segment = f"{self._segment_prefix(generation)}{len(segments):04d}.jsonl"
+                with open(segment, "w") as f:
+                    for row, i in enumerate(chunk.tolist(), start):
+                        entry = _Entry(valid[i].id, valid[i].text, valid[i].metadata, row)
+                        if latest[i] != i:
+                            last = valid[latest[i]]
+                            entry.metadata = dict(entry.metadata or {}, count=int(totals[i]),
+                                                  last_seen=_last_seen(last) or last.id)
+                        f.write(json.dumps(entry.to_dict()) + "\n")
+                segments.append(os.path.basename(segment))
+            sidecar.flush()
+            del sidecar
+
+            old_files = self._generation_files()
+            self._write_manifest(generation, segments)
+            for path in old_files:
+                if os.path.exists(path):
+                    os.remove(path)
+
+            stats = {
+                "entries": len(entries),
+                "dropped": len(entries) - len(valid),
+                "merged": len(valid) - len(keep),
+                "kept": len(keep),
+                "segments": len(segments),
+            }
+            logger.info(f"[Episodic] Compacted to generation {generation}: {stats}")
+            self._generation, self._segments = generation, segments
+            self._open_generation()
+            self._load()
+            return stats
+
+    def dedupe_stats(self) -> dict:
+        """Turns stored vs suppressed as near-duplicates by store()/store_many() this session."""
+        total = self._stored + self._suppressed
+        return {
+            "stored": self._stored,
+            "suppressed": self._suppressed,
+            "suppression_rate": self._suppressed / total if total else 0.0,
+        }
+
+    def warm_up(self) -> None:
+        """Load the embedder now instead of on the first store/search."""
         self._ensure_model()
-        q = self._embed(query)
-        scores = self._matrix @ q
-        k = min(top_k, len(self._indexed))
-        top_idx = np.argpartition(scores, -k)[-k:]
-        top_idx = top_idx[np.argsort(scores[top_idx])[::-1]]
-        return [self._indexed[i]["text"] for i in top_idx]
 
-    def all_entries(self) -> list[dict]:
-        """Return all persisted entries (id, text, metadata)."""
-        return list(self._entries)
+    @property
+    def ready(self) -> bool:
+        """True once the embedder is loaded and store()/search() will not block on it."""
+        return self._model is not None
+
+    def close(self) -> None:
+        """Save embeddings still unsaved in a persistent cache. The store stays usable."""
+        self.cache.save()
 
     def __len__(self) -> int:
         return len(self._entries)
@@ -72,46 +383,437 @@ class EpisodicStore:
     # Internal
     # ------------------------------------------------------------------
 
+    def _read_manifest(self) -> tuple[int, list[str]]:
+        """Return (generation, segment file names); generation 0 has no manifest."""
+        if not os.path.exists(self._manifest_path):
+            return 0, []
+        with open(self._manifest_path) as f:
+            manifest = json.load(f)
+        if manifest.get("version") != _MANIFEST_VERSION:
+            raise ValueError(f"{self._manifest_path} has unsupported version {manifest.get('version')}")
+        return manifest["generation"], manifest["segments"]
+
+    def _write_manifest(self, generation: int, segments: list[str]) -> None:
+        tmp_path = self._manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": _MANIFEST_VERSION, "generation": generation, "segments": segments}, f)
+        os.replace(tmp_path, self._manifest_path)
+
+    def _generation_paths(self, generation: int) -> tuple[str, str, str]:
+        """(live log, sidecar, index) paths; generation 0 is the original single-log layout."""
+        if generation == 0:
+            return self._path, self._base + ".f32", self._base + ".index.npz"
+        prefix = f"{self._base}.g{generation}"
+        return prefix + ".jsonl", prefix + ".f32", prefix + ".index.npz"
+
+    def _segment_prefix(self, generation: int) -> str:
+        return f"{self._base}.g{generation}.seg"
+
+    def _generation_files(self) -> list[str]:
+        """Every file belonging to the current generation (segments, log, sidecar, index state)."""
+        directory = os.path.dirname(self._path)
+        files = [os.path.join(directory, name) for name in self._segments]
+        files += [self._log_path, self._sidecar_path]
+        files += glob.glob(glob.escape(os.path.splitext(self._index_path)[0]) + ".*")
+        return files
+
+    def _open_generation(self) -> None:
+        """Point at the current generation's files and reset all in-memory state."""
+        self._log_path, self._sidecar_path, self._index_path = self._generation_paths(self._generation)
+        self._index.reset()
+        if self._dedupe is not None:
+            self._dedupe.reset()
+        self._unsaved = 0  # inserts since the last index checkpoint
+        self._entries: list[_Entry] = []  # all persisted entries
+        self._row_entries = EmbeddingBuffer(dim=1, dtype=np.int64)  # entry position per matrix row (-1 = orphan)
+        self._orphans: list[int] = []    # matrix rows with no entry; masked in search
+        self._times = EmbeddingBuffer(dim=1, dtype="datetime64[s]")  # per entry, from last_seen or its id
+        self._speakers = EmbeddingBuffer(dim=1, dtype=np.int32)      # per entry, code into _speaker_codes (-1 = none)
+        self._speaker_codes: dict[str, int] = {}
+        self._buffer = MappedEmbeddingBuffer(self._sidecar_path)
+        self._lexical: Optional[BM25Index] = None  # built on first lexical/hybrid search
+
+    def _duplicate_roots(
+        self, entries: list[_Entry], rows: np.ndarray, positions: np.ndarray, threshold: float, window: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Group duplicate turns for compact(). Returns, per entry, the index of
+        the earliest entry of its group and its own turn count.
+        """
+        n = len(entries)
+        parent = np.arange(n)
+        counts = np.ones(n)
+        speakers = self._speakers.view()[positions, 0] if n else np.empty(0, dtype=np.int32)
+        first: dict = {}
+        for i, entry in enumerate(entries):
+            j = first.setdefault((normalize_text(entry.text), int(speakers[i])), i)
+            if j != i:
+                parent[i] = j
+            if isinstance(entry.metadata, dict):
+                counts[i] = entry.metadata.get("count", 1)
+        # Near-duplicates: compare each row with the `window` rows before it, one block at a time.
+        block = max(64, 2 * window)
+        for start in range(0, n, block):
+            stop = min(start + block, n)
+            lo = max(0, start - window)
+            vectors = self._matrix[rows[lo:stop]]
+            sims = vectors[start - lo:] @ vectors.T  # (block rows, lo..stop)
+            i = np.arange(start, stop)[:, None]
+            j = np.arange(lo, stop)[None, :]
+            match = (j < i) & (j >= i - window) & (sims >= threshold)
+            match &= speakers[lo:stop][None, :] == speakers[start:stop, None]
+            found = match.any(axis=1)
+            earliest = lo + match.argmax(axis=1)
+            parent[start:stop] = np.where(found, np.minimum(parent[start:stop], earliest), parent[start:stop])
+        while True:  # pointer jumping: parents always precede children, so this reaches the roots
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                return parent, counts
+            parent = jumped
+
+    def _find_duplicate(self, entry: _Entry, embedding: np.ndarray) -> Optional[int]:
+        """Position of an earlier entry by the same speaker that embedding nearly duplicates."""
+        if not np.isfinite(embedding).all():
+            return None
+        rows, _ = self._dedupe.find(self._matrix, embedding)
+        if not len(rows):
+            return None
+        name = _speaker(entry)
+        speaker = self._speaker_codes.get(name, -2) if name else -1
+        positions = self._row_entries.view()[rows, 0]
+        positions = positions[positions >= 0]
+        same = positions[self._speakers.view()[positions, 0] == speaker]
+        return int(same[0]) if len(same) else None
+
+    def _dedupe_batch(self, entries: list[_Entry], embeddings: np.ndarray) -> tuple[list[_Entry], np.ndarray]:
+        """
+        Merge store_many() rows that nearly duplicate a stored turn or an
+        earlier kept row of the same batch; return the rows left to add.
+        """
+        kept: list[int] = []
+        for i, entry in enumerate(entries):
+            pos = self._find_duplicate(entry, embeddings[i])
+            if pos is not None:
+                self._merge_turn(pos, entry.id)
+                continue
+            earlier = next((j for j in kept if _speaker(entries[j]) == _speaker(entry)
+                            and float(embeddings[j] @ embeddings[i]) >= self._dedupe.threshold), None)
+            if earlier is None:
+                kept.append(i)
+                continue
+            first = entries[earlier]  # not written yet, so its metadata can simply be bumped
+            count = (first.metadata or {}).get("count", 1) + 1
+            first.metadata = dict(first.metadata or {}, count=count, last_seen=entry.id)
+        self._suppressed += len(entries) - len(kept)
+        return [entries[i] for i in kept], embeddings[kept]
+
+    def _merge_turn(self, pos: int, seen: str) -> None:
+        """Count another occurrence of entry pos, persisted as an update line."""
+        entry = self._entries[pos]
+        count = (entry.metadata or {}).get("count", 1) + 1
+        self._apply_merge(pos, count, seen)
+        self._append_lines([{"merge": entry.row, "count": count, "last_seen": seen}])
+        logger.debug(f"[Episodic] Merged near-duplicate turn into row {entry.row} (count={count})")
+
+    def _apply_merge(self, pos: int, count: int, seen: str) -> None:
+        entry = self._entries[pos]
+        entry.metadata = dict(entry.metadata or {}, count=count, last_seen=seen)
+        self._times.view()[pos, 0] = _timestamp(seen)
+
     def _ensure_model(self) -> None:
-        if self._model is None:
-            logger.info(f"[Episodic] Loading embedding model '{_MODEL_NAME}'...")
-            from sentence_transformers import SentenceTransformer
-            self._model = SentenceTransformer(_MODEL_NAME)
+        if self._model is not None:
+            return
+        with self._model_lock:
+            if self._model is None:
+                name = getattr(self._embedder_factory, "__name__", repr(self._embedder_factory))
+                logger.info(f"[Episodic] Loading embedder {name}...")
+                self._model = self._embedder_factory()
 
-    def _embed(self, text: str) -> np.ndarray:
-        return self._model.encode(text, normalize_embeddings=True).astype(np.float32)
+    def _vector_search(
+        self, q: Optional[np.ndarray], k: int, allowed: Optional[np.ndarray],
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return (entry positions, scores) of the k indexed entries nearest q that are allowed."""
+        matrix = self._matrix
+        if q is None or matrix is None or len(matrix) == len(self._orphans):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        row_entries = self._row_entries.view()[:, 0]
+        if allowed is None:
+            rows, scores = self._index.search(matrix, q, k, exclude=self._orphans)
+        else:
+            mask = (row_entries >= 0) & allowed[row_entries]
+            rows, scores = self._index.search(matrix, q, k, mask=mask)
+        return row_entries[rows], scores
+
+    def _filter_mask(self, speaker: Optional[str], since) -> Optional[np.ndarray]:
+        """Boolean mask over entries for the speaker/since filters, or None if unfiltered."""
+        if speaker is None and since is None:
+            return None
+        mask = np.ones(len(self._entries), dtype=bool)
+        if speaker is not None:
+            code = self._speaker_codes.get(speaker)
+            if code is None:
+                return np.zeros(len(self._entries), dtype=bool)
+            mask &= self._speakers.view()[:, 0] == code
+        if since is not None:
+            mask &= self._times.view()[:, 0] >= _local_time(since)
+        return mask
+
+    def _decay(self, half_life) -> Optional[np.ndarray]:
+        """Per-entry recency weight 0.5 ** (age / half_life); undated entries weigh 0."""
+        if half_life is None:
+            return None
+        seconds = half_life.total_seconds() if isinstance(half_life, timedelta) else float(half_life)
+        if seconds <= 0:
+            raise ValueError(f"recency_half_life must be positive, got {half_life!r}")
+        times = self._times.view()[:, 0]
+        age = (np.datetime64(datetime.now(), "s") - times).astype(np.float64)
+        weight = 0.5 ** (np.maximum(age, 0.0) / seconds)
+        weight[np.isnat(times)] = 0.0
+        return weight
 
-    def _rebuild_matrix(self) -> None:
-        if not self._indexed:
-            self._matrix = None
+    def _mmr(self, docs: np.ndarray, scores: np.ndarray, k: int, diversity: float) -> np.ndarray:
+        """
+        Greedy maximal-marginal-relevance pick of k of the ranked candidates.
+
+        Relevance is the ranking's own score scaled to [0, 1]; redundancy is
+        cosine similarity between candidate vectors from the sidecar, so no
+        embedding is computed (it works in lexical mode too). Candidates
+        without a vector count as similar to nothing.
+        """
+        matrix = self._matrix
+        if matrix is None or len(docs) <= 1:
+            return docs
+        rows = np.array([-1 if self._entries[d].row is None else self._entries[d].row for d in docs.tolist()])
+        vectors = np.zeros((len(docs), matrix.shape[1]), dtype=np.float32)
+        vectors[rows >= 0] = matrix[rows[rows >= 0]]
+        similarity = vectors @ vectors.T
+        top = float(scores.max())
+        relevance = scores / top if top > 0 else np.zeros(len(docs), dtype=np.float32)
+        redundancy = np.zeros(len(docs), dtype=np.float32)  # max similarity to any pick so far
+        available = np.ones(len(docs), dtype=bool)
+        picks = []
+        for _ in range(min(k, len(docs))):
+            gain = np.where(available, (1 - diversity) * relevance - diversity * redundancy, -np.inf)
+            pick = int(np.argmax(gain))
+            picks.append(pick)
+            available[pick] = False
+            np.maximum(redundancy, similarity[pick], out=redundancy)
+        return docs[picks]
+
+    @staticmethod
+    def _decayed(docs: np.ndarray, scores: np.ndarray, weight: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        scores = scores * weight[docs]
+        order = np.argsort(scores, kind="stable")[::-1]
+        return docs[order], scores[order]
+
+    def _track(self, entries: list[_Entry]) -> None:
+        """Append the timestamp and speaker columns for newly added entries."""
+        if not entries:
             return
-        vectors = [np.array(e["embedding"], dtype=np.float32) for e in self._indexed]
-        self._matrix = np.stack(vectors)
+        stamps = [_last_seen(e) or e.id for e in entries]
+        try:
+            times = np.array(stamps, dtype="datetime64[s]")
+        except (TypeError, ValueError):
+            times = np.array([_timestamp(stamp) for stamp in stamps], dtype="datetime64[s]")
+        self._times.extend(times[:, None])
+        self._speakers.extend(np.array([[self._speaker_code(e)] for e in entries], dtype=np.int32))
+
+    def _speaker_code(self, entry: _Entry) -> int:
+        name = _speaker(entry)
+        if not name:
+            return -1
+        return self._speaker_codes.setdefault(name, len(self._speaker_codes))
+
+    def _ensure_lexical(self) -> BM25Index:
+        if self._lexical is None:
+            lexical = BM25Index()
+            for entry in self._entries:
+                lexical.add(entry.text)
+            self._lexical = lexical
+        return self._lexical
+
+    def _embed(self, text: str) -> np.ndarray:
+        vec = self.cache.get(text)
+        if vec is None:
+            vec = self._model.encode(text, normalize_embeddings=True).astype(np.float32)
+            self.cache.put(text, vec)
+        return vec
+
+    def _embed_batch(self, texts: list[str], batch_size: int) -> np.ndarray:
+        cached = [self.cache.get(text) for text in texts]
+        missing = [i for i, vec in enumerate(cached) if vec is None]
+        if missing:
+            vectors = self._model.encode([texts[i] for i in missing], batch_size=batch_size,
+                                         normalize_embeddings=True)
+            vectors = np.asarray(vectors, dtype=np.float32).reshape(len(missing), -1)
+            for i, vec in zip(missing, vectors):
+                cached[i] = vec
+                self.cache.put(texts[i], vec)
+        return np.stack(cached)
+
+    def _add(self, entries: list[_Entry], embeddings: np.ndarray) -> None:
+        """Append entries with their (M, D) embeddings; rows with non-finite values stay unindexed."""
+        finite = np.isfinite(embeddings).all(axis=1)
+        if finite.any():
+            start = self._buffer.extend(embeddings[finite])
+            for row, entry in enumerate((e for e, ok in zip(entries, finite) if ok), start):
+                entry.row = row
+            self._row_entries.extend(len(self._entries) + np.flatnonzero(finite)[:, None])
+            self._sync_index(int(finite.sum()))
+        if not finite.all():
+            logger.warning(f"[Episodic] {int((~finite).sum())} non-finite embedding(s); stored without a row")
+        self._entries.extend(entries)
+        self._track(entries)
+        if self._lexical is not None:
+            for entry in entries:
+                self._lexical.add(entry.text)
+        self._append_entries(entries)
+
+    @property
+    def _matrix(self) -> Optional[np.ndarray]:
+        """View over the filled rows of the embedding sidecar."""
+        return self._buffer.view()
 
     def _load(self) -> None:
-        if not os.path.exists(self._path):
+        directory = os.path.dirname(self._path)
+        files = [os.path.join(directory, name) for name in self._segments]
+        if not files and not os.path.exists(self._log_path):
+            self._buffer.clear()  # a sidecar without its log is stale
             return
+        if os.path.exists(self._log_path):
+            files.append(self._log_path)
+        legacy: dict = {}  # _Entry -> inline embedding from the old format
+        merges: list[dict] = []  # update lines written by _merge_turn
         try:
-            with open(self._path) as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    entry = json.loads(line)
-                    self._entries.append(entry)
-                    if "embedding" in entry:
-                        vec = np.array(entry["embedding"], dtype=np.float32)
-                        if np.isfinite(vec).all():
-                            self._indexed.append(entry)
-            self._rebuild_matrix()
-            logger.debug(f"[Episodic] Loaded {len(self._entries)} entries from {self._path}")
+            for path in files:
+                with open(path) as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        d = json.loads(line)
+                        if "merge" in d:
+                            merges.append(d)
+                            continue
+                        entry = _Entry.from_dict(d)
+                        if "embedding" in d:
+                            vec = np.array(d["embedding"], dtype=np.float32)
+                            if np.isfinite(vec).all():
+                                legacy[entry] = vec
+                            entry.row = None
+                        self._entries.append(entry)
+            logger.debug(f"[Episodic] Loaded {len(self._entries)} entries from {len(files)} file(s)")
         except Exception as e:
             logger.error(f"[Episodic] Failed to load {self._path}: {e}")
+        self._track(self._entries)
+        if legacy:
+            self._migrate(legacy)
+        self._index_rows()
+        row_entries = self._row_entries.view()
+        for d in merges:
+            row = d["merge"]
+            if row_entries is not None and 0 <= row < len(row_entries) and row_entries[row, 0] >= 0:
+                self._apply_merge(int(row_entries[row, 0]), d["count"], d["last_seen"])
+        self._index.load(self._index_path)
+        restored = len(self._index)
+        self._index.sync(self._matrix)
+        if len(self._index) != restored:
+            self._save_index()
+
+    def _index_rows(self) -> None:
+        """Map sidecar rows back to entries; trailing rows with no entry are dropped."""
+        row_entries = np.full(len(self._buffer), -1, dtype=np.int64)
+        for pos, entry in enumerate(self._entries):
+            if entry.row is not None and entry.row < len(row_entries):
+                row_entries[entry.row] = pos
+            else:
+                entry.row = None
+        filled = np.flatnonzero(row_entries >= 0)
+        count = int(filled[-1]) + 1 if len(filled) else 0
+        self._buffer.truncate(count)
+        self._row_entries.clear()
+        if count:
+            self._row_entries.extend(row_entries[:count, None])
+        self._orphans = np.flatnonzero(row_entries[:count] < 0).tolist()
+
+    def _migrate(self, legacy: dict) -> None:
+        """Move inline embeddings into a fresh sidecar and rewrite the log without them."""
+        logger.info(f"[Episodic] Migrating {len(legacy)} inline embedding(s) to {self._sidecar_path}")
+        old = self._buffer.view()
+        tmp_path = self._sidecar_path + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        fresh = MappedEmbeddingBuffer(tmp_path)
+        for entry in self._entries:
+            vec = legacy.get(entry)
+            if vec is None and entry.row is not None and old is not None and entry.row < len(old):
+                vec = old[entry.row]
+            entry.row = None if vec is None else fresh.append(vec)
+        fresh.flush()
+        os.replace(tmp_path, self._sidecar_path)
+        if os.path.exists(self._index_path):
+            os.remove(self._index_path)  # rows were renumbered
+        self._rewrite_log()
+        self._buffer = MappedEmbeddingBuffer(self._sidecar_path)
+
+    def _sync_index(self, added: int) -> None:
+        self._index.sync(self._matrix)
+        self._unsaved += added
+        if self._unsaved >= _INDEX_SAVE_EVERY:
+            self._save_index()
+
+    def _save_index(self) -> None:
+        try:
+            self._index.save(self._index_path)
+            self._unsaved = 0
+        except Exception as e:
+            logger.error(f"[Episodic] Failed to save index: {e}")
+
+    def _rewrite_log(self) -> None:
+        tmp_path = self._log_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.writelines(json.dumps(entry.to_dict()) + "\n" for entry in self._entries)
+        os.replace(tmp_path, self._log_path)
 
-    def _append_entry(self, entry: dict) -> None:
+    def _append_entries(self, entries: list[_Entry]) -> None:
+        self._append_lines([entry.to_dict() for entry in entries])
+
+    def _append_lines(self, lines: list[dict]) -> None:
         try:
-            os.makedirs(os.path.dirname(self._path), exist_ok=True)
-            with open(self._path, "a") as f:
-                f.write(json.dumps(entry) + "\n")
+            os.makedirs(os.path.dirname(self._log_path), exist_ok=True)
+            with open(self._log_path, "a") as f:
+                f.write("".join(json.dumps(d) + "\n" for d in lines))
         except Exception as e:
-            logger.error(f"[Episodic] Failed to write entry: {e}")
+            logger.error(f"[Episodic] Failed to write entries: {e}")
+
+
+def _timestamp(entry_id: str) -> np.datetime64:
+    """Entry ids are ISO timestamps; anything else is undated (NaT)."""
+    try:
+        return np.datetime64(entry_id, "s")
+    except (TypeError, ValueError):
+        return np.datetime64("NaT", "s")
+
+
+def _local_time(value: Union[datetime, str]) -> np.datetime64:
+    """
+    A datetime or ISO string as naive local time, the clock entry ids are
+    stamped with (datetime.now()); timezone-aware values are converted.
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+        except ValueError:
+            return np.datetime64(value, "s")
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return np.datetime64(value, "s")
+
+
+def _last_seen(entry: _Entry) -> Optional[str]:
+    """Id of the latest turn merged into entry by compact(), if any."""
+    return entry.metadata.get("last_seen") if isinstance(entry.metadata, dict) else None
+
+
+def _speaker(entry: _Entry) -> Optional[str]:
+    return entry.metadata.get("speaker") if isinstance(entry.metadata, dict) else None
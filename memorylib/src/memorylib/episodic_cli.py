@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Compact the episodic memory log.
+
+Drops entries without a usable embedding, merges repeated turns and
+rewrites the store as segment files plus a manifest (see
+EpisodicStore.compact). Safe to interrupt; run while the robot is stopped.
+
+Usage:
+    compact-episodic                                     # default store
+    compact-episodic --threshold 0.95 --window 64        # merge more aggressively
+    compact-episodic --path /custom/path/episodic.jsonl --segment-size 50000
+"""
+
+import argparse
+import os
+import time
+
+from .episodic import EpisodicStore
+
+_DEFAULT_PATH = os.path.join("data", "memory", "episodic.jsonl")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact the episodic memory log")
+    parser.add_argument("--path", default=_DEFAULT_PATH, help=f"Path to the episodic log (default: {_DEFAULT_PATH})")
+    parser.add_argument("--threshold", type=float, default=0.97,
+                        help="Cosine similarity at which nearby turns are merged (default: 0.97)")
+    parser.add_argument("--window", type=int, default=32,
+                        help="How many preceding turns to compare against (default: 32)")
+    parser.add_argument("--segment-size", type=int, default=100_000, help="Entries per segment file (default: 100000)")
+    args = parser.parse_args()
+    manifest = os.path.splitext(args.path)[0] + ".manifest.json"  # a compacted store may have no log yet
+    if not os.path.exists(args.path) and not os.path.exists(manifest):
+        parser.error(f"no episodic store at {args.path}")
+
+    start = time.perf_counter()
+    store = EpisodicStore(args.path)
+    loaded = time.perf_counter()
+    stats = store.compact(dedupe_threshold=args.threshold, window=args.window, segment_size=args.segment_size)
+    done = time.perf_counter()
+
+    print(f"Loaded {stats['entries']} entries in {loaded - start:.1f}s")
+    print(f"Dropped {stats['dropped']} without an embedding, merged {stats['merged']} duplicate(s)")
+    print(f"Kept {stats['kept']} entries in {stats['segments']} segment(s) ({done - loaded:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
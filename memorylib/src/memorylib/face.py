@@ -24,11 +24,13 @@ class FaceStore:
     using L2 distance on face_recognition encodings (128-dim dlib vectors).
 
     face_recognition is imported lazily — it is an optional dependency.
+    Importing it loads the dlib models, so warm_up() does that ahead of time.
     """
 
     def __init__(self, path: str):
         self.path = os.path.abspath(path)
         self._profiles: dict = {}  # name -> list[np.ndarray]
+        self._ready = False
         self._load()
 
     # ------------------------------------------------------------------
@@ -78,6 +80,16 @@ class FaceStore:
         logger.info(f"[Face] Unknown face (best={best_name}, distance={best_dist:.3f})")
         return None
 
+    def warm_up(self) -> None:
+        """Import face_recognition (and its dlib models) now instead of on the first encode."""
+        import face_recognition  # noqa: F401
+        self._ready = True
+
+    @property
+    def ready(self) -> bool:
+        """True once face_recognition is loaded and identify() will not block on it."""
+        return self._ready
+
     def faces(self) -> list:
         return list(self._profiles.keys())
 
@@ -94,6 +106,7 @@ class FaceStore:
 
     def _encode(self, jpeg_bytes: bytes) -> list:
         import face_recognition
+        self._ready = True
         image = _jpeg_to_array(jpeg_bytes)
         return face_recognition.face_encodings(image)
 
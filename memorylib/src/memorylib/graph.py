@@ -1,11 +1,261 @@
 import json
 import logging
-from typing import Optional
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, Optional, Union
 
 import kuzu
 
 logger = logging.getLogger(__name__)
 
+_QUERY_CACHE_SIZE = 64  # prepared statements kept for ad-hoc query() texts
+
+_RELATION_SCHEMA = (
+    "CREATE REL TABLE IF NOT EXISTS Relation(FROM Entity TO Entity, rel_type STRING, "
+    "weight DOUBLE, first_seen TIMESTAMP, last_seen TIMESTAMP, count INT64, source STRING, "
+    "extra MAP(STRING, STRING))"
+)
+
+
+def _timestamp(value: Union[datetime, str]) -> datetime:
+    """datetime or ISO string as the naive UTC datetime a TIMESTAMP column returns."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+# Typed Relation columns: the coercion applied to a props value, the Python
+# type it yields and the Kuzu type.
+_EDGE_COLUMNS = {
+    "weight": (float, float, "DOUBLE"),
+    "first_seen": (_timestamp, datetime, "TIMESTAMP"),
+    "last_seen": (_timestamp, datetime, "TIMESTAMP"),
+    "count": (int, int, "INT64"),
+    "source": (str, str, "STRING"),
+}
+_EDGE_RETURN = "r.weight, r.first_seen, r.last_seen, r.count, r.source, r.extra"
+
+
+def _edge_set(prefix: str) -> str:
+    """SET clause writing every edge column from $params (prefix "$") or UNWIND rows ("row.")."""
+    columns = [f"r.{name} = CAST({prefix}{name} AS {cast})" for name, (_, _, cast) in _EDGE_COLUMNS.items()]
+    columns.append(f"r.extra = map(CAST({prefix}extra_keys AS STRING[]), CAST({prefix}extra_values AS STRING[]))")
+    return "SET " + ", ".join(columns)
+
+
+_UPSERT_RELATIONS = f"""
+UNWIND $rows AS row
+MATCH (a:Entity {{name: row.from_name}}), (b:Entity {{name: row.to_name}})
+MERGE (a)-[r:Relation {{rel_type: row.rel_type}}]->(b)
+{_edge_set("row.")}
+"""
+
+
+# Edge filters pushed into Cypher: keyword -> (predicate, coercion of its value).
+_EDGE_FILTERS = {
+    "min_weight": ("r.weight >= $min_weight", float),
+    "min_count": ("r.count >= $min_count", int),
+    "seen_since": ("r.last_seen >= $seen_since", _timestamp),
+    "source": ("r.source = $source", str),
+}
+
+
+def _edge_props(props: Optional[dict], strict: bool = True) -> dict:
+    """
+    props as a Relation row holds it: typed keys coerced, the rest kept as
+    extras (as they read back from JSON). A value that does not coerce
+    raises ValueError, or with strict=False stays an extra.
+    """
+    typed, extra = {}, {}
+    for key, value in (props or {}).items():
+        if key in _EDGE_COLUMNS and value is not None:
+            try:
+                typed[key] = _EDGE_COLUMNS[key][0](value)
+                continue
+            except (TypeError, ValueError):
+                if strict:
+                    raise ValueError(f"Relation prop {key!r} cannot be {value!r}") from None
+        extra[key] = value
+    if extra:
+        typed.update(json.loads(json.dumps(extra)))
+    return typed
+
+
+def _is_typed(key: str, value) -> bool:
+    """Whether a normalised prop lives in its typed column rather than in extra."""
+    return key in _EDGE_COLUMNS and isinstance(value, _EDGE_COLUMNS[key][1])
+
+
+def _edge_params(props: dict) -> dict:
+    """Statement parameters for normalised props (see _edge_set)."""
+    params: dict = {name: props[name] if _is_typed(name, props.get(name)) else None for name in _EDGE_COLUMNS}
+    for name in ("first_seen", "last_seen"):
+        if params[name] is not None:
+            params[name] = params[name].isoformat(sep=" ")
+    extra = {k: v for k, v in props.items() if not _is_typed(k, v)}
+    params["extra_keys"] = list(extra)
+    params["extra_values"] = [json.dumps(v) for v in extra.values()]
+    return params
+
+
+def _props_from_row(weight, first_seen, last_seen, count, source, extra) -> dict:
+    """props dict from the _EDGE_RETURN columns; only extras need decoding."""
+    props = {name: value for name, value in zip(_EDGE_COLUMNS, (weight, first_seen, last_seen, count, source))
+             if value is not None}
+    if extra:
+        props.update((key, json.loads(value)) for key, value in extra.items())
+    return props
+
+
+def _edge_filters(**filters) -> dict:
+    return {name: _EDGE_FILTERS[name][1](value) for name, value in filters.items() if value is not None}
+
+
+def _edge_matches(props: dict, filters: dict) -> bool:
+    """
+    _EDGE_FILTERS evaluated on a props dict, for the mirror. Only typed
+    values count: a legacy value kept as an extra under a column's name
+    is NULL in that column, as in Kuzu.
+    """
+    for name, value in filters.items():
+        column = {"min_weight": "weight", "min_count": "count", "seen_since": "last_seen", "source": "source"}[name]
+        have = props.get(column)
+        if not _is_typed(column, have):
+            return False
+        if have != value if name == "source" else have < value:
+            return False
+    return True
+
+
+# Bulk files, one per table: what export() writes and how import_() merges
+# a file into a table that already has rows (COPY only fills empty ones).
+_BULK_TABLES = {
+    "entities": (
+        "Entity",
+        "MATCH (e:Entity) RETURN e.name AS name, e.type AS type",
+        "MERGE (e:Entity {name: name}) ON CREATE SET e.type = coalesce(type, 'entity') "
+        "ON MATCH SET e.type = coalesce(type, e.type) RETURN count(*)",
+    ),
+    "relations": (
+        "Relation",
+        "MATCH (a:Entity)-[r:Relation]->(b:Entity) "
+        "RETURN a.name AS `from`, b.name AS `to`, r.rel_type AS rel_type, r.weight AS weight, "
+        "r.first_seen AS first_seen, r.last_seen AS last_seen, r.count AS count, r.source AS source, "
+        "r.extra AS extra",
+        "MATCH (a:Entity {name: `from`}), (b:Entity {name: `to`}) "
+        "MERGE (a)-[r:Relation {rel_type: rel_type}]->(b) "
+        "SET r.weight = weight, r.first_seen = first_seen, r.last_seen = last_seen, r.count = count, "
+        "r.source = source, r.extra = extra RETURN count(*)",
+    ),
+}
+# Column types for LOAD FROM a CSV, which would otherwise be sniffed.
+_CSV_COLUMNS = {
+    "entities": "name STRING, type STRING",
+    "relations": "`from` STRING, `to` STRING, rel_type STRING, weight DOUBLE, first_seen TIMESTAMP, "
+                 "last_seen TIMESTAMP, count INT64, source STRING, extra MAP(STRING, STRING)",
+}
+_BULK_FORMATS = ("parquet", "csv")
+
+
+class _ThreadConnection(threading.local):
+    """One thread's kuzu.Connection with its prepared statements and open transaction depth."""
+
+    def __init__(self, db: kuzu.Database):
+        self.conn = kuzu.Connection(db)
+        self.statements: dict[str, kuzu.PreparedStatement] = {}  # GraphStore's own Cypher, prepared once
+        self.query_cache: OrderedDict[str, kuzu.PreparedStatement] = OrderedDict()  # query() LRU
+        self.tx_depth = 0  # open transaction() blocks; >0 means BEGIN has been issued
+
+
+class _Adjacency:
+    """In-process copy of the graph: entity types plus out and in edges keyed by rel_type."""
+
+    def __init__(self):
+        self._lock = threading.Lock()  # readers run on any thread; writers hold GraphStore's write lock too
+        self._types: dict[str, str] = {}
+        self._out: dict[str, dict[str, dict[str, dict]]] = {}  # from -> rel_type -> to -> props
+        self._in: dict[str, dict[str, dict[str, dict]]] = {}   # to -> rel_type -> from -> props
+
+    def reset(self, entities: list, relations: list) -> None:
+        with self._lock:
+            self._types = {name: type for name, type in entities}
+            self._out, self._in = {}, {}
+        for from_name, rel_type, to_name, props in relations:
+            self.set_relation(from_name, rel_type, to_name, props)
+
+    def set_entity(self, name: str, type: Optional[str]) -> None:
+        with self._lock:
+            if type is not None:
+                self._types[name] = type
+            else:
+                self._types.setdefault(name, "entity")
+
+    def set_relation(self, from_name: str, rel_type: str, to_name: str, props: dict) -> None:
+        with self._lock:
+            if from_name not in self._types or to_name not in self._types:
+                return  # the MATCH in Kuzu finds no endpoints either
+            self._out.setdefault(from_name, {}).setdefault(rel_type, {})[to_name] = props
+            self._in.setdefault(to_name, {}).setdefault(rel_type, {})[from_name] = props
+
+    def entity_type(self, name: str) -> Optional[str]:
+        return self._types.get(name)
+
+    def entities(self) -> list:
+        with self._lock:
+            return [{"name": name, "type": type} for name, type in sorted(self._types.items())]
+
+    def neighbors(self, name: str, rel_type: Optional[str], direction: str, filters: dict) -> list:
+        sides = {"out": (self._out,), "in": (self._in,)}.get(direction, (self._out, self._in))
+        rows = []
+        with self._lock:
+            for side in sides:
+                by_rel = side.get(name, {})
+                groups = [(rel_type, by_rel.get(rel_type, {}))] if rel_type else by_rel.items()
+                for rel, edges in groups:
+                    rows.extend([other, self._types[other], rel, dict(props)] for other, props in edges.items()
+                                if not filters or _edge_matches(props, filters))
+        rows.sort(key=lambda row: (row[2], row[0]))  # as get_neighbors' ORDER BY
+        return rows
+
+    def expand(self, name: str, hops: int, rel_types: Optional[list], direction: str) -> list:
+        """Breadth-first walk; rows are (hop, from, rel_type, to) as GraphStore.expand's query returns."""
+        wanted = set(rel_types) if rel_types else None
+        sides = {"out": (self._out,), "in": (self._in,)}.get(direction, (self._out, self._in))
+        rows = []
+        with self._lock:
+            if name not in self._types:
+                return rows
+            seen, frontier = {name}, [name]
+            for hop in range(hops):
+                reached = []
+                for node in frontier:
+                    for side in sides:
+                        for rel, edges in side.get(node, {}).items():
+                            if wanted is not None and rel not in wanted:
+                                continue
+                            for other in edges:
+                                rows.append((hop, node, rel, other) if side is self._out else (hop, other, rel, node))
+                                if other not in seen:
+                                    seen.add(other)
+                                    reached.append(other)
+                frontier = reached
+        return rows
+
+    def relations(self, filters: dict) -> list:
+        with self._lock:
+            return [
+                {"from": from_name, "rel_type": rel, "to": to_name, "props": dict(props)}
+                for from_name in sorted(self._out)
+                for rel, edges in sorted(self._out[from_name].items())
+                for to_name, props in sorted(edges.items())
+                if not filters or _edge_matches(props, filters)
+            ]
+
 
 class GraphStore:
     """
@@ -14,25 +264,115 @@ class GraphStore:
     Schema
     ------
     Entity(name, type)  — a named node with a free-form type label.
-    Relation            — directed edge with a rel_type string and optional JSON props.
+    Relation            — directed edge with a rel_type string and props: typed
+                          weight, first_seen, last_seen, count and source
+                          columns plus an extra MAP for any other key.
+
+    Relation props go in and come out as a dict. The typed keys are stored
+    as Kuzu columns, so get_neighbors() and all_relations() can filter on
+    them inside the query (min_weight, min_count, seen_since, source); any
+    other key is kept JSON-encoded in extra. Databases from before the
+    typed columns stored props as one JSON string; they are migrated
+    automatically on open (see migrate_graph, or the migrate-graph command
+    to do it ahead of time).
+
+    upsert_entities() and upsert_relations() write a whole list in one
+    UNWIND statement — one round-trip and one transaction instead of one
+    per fact.
+
+    Writes auto-commit one statement at a time unless grouped with
+    transaction(), which commits them together or not at all.
+
+    generation counts writes made through this store, so callers can cache
+    anything derived from the graph and recompute only when it moves.
+
+    Every statement is prepared (parsed, bound and planned) once per
+    connection: the fixed Cypher behind the methods below on first use,
+    and query() texts in a small LRU.
+
+    Safe to share between threads: each thread gets its own connection to
+    the one kuzu.Database, so reads run in parallel, while upserts and
+    transaction() blocks take a write lock because Kuzu admits a single
+    write transaction at a time. query() is treated as a read; run ad-hoc
+    writes inside transaction() to serialise them.
+
+    With mirror=True the whole graph is also held in process as adjacency
+    dicts, loaded at open and updated write-through by every upsert, so
+    get_entity(), get_neighbors(), all_entities() and all_relations() never
+    reach Kuzu.
+    Kuzu stays the durable source of truth: a rolled-back transaction
+    reloads the mirror from it. Only for graphs that fit comfortably in
+    memory, and only if nothing else writes the database (query() writes
+    bypass the mirror).
     """
 
-    def __init__(self, path: str):
-        import os
+    def __init__(self, path: str, mirror: bool = False):
         self._path = os.path.abspath(path)
         self._db = kuzu.Database(self._path)
-        self._conn = kuzu.Connection(self._db)
+        self._local = _ThreadConnection(self._db)
+        self._write_lock = threading.RLock()
+        self._generation = 0  # bumped by every write and rollback
         self._init_schema()
+        self._mirror: Optional[_Adjacency] = None
+        if mirror:
+            self._mirror = _Adjacency()
+            self._load_mirror()
+
+    # ------------------------------------------------------------------
+    # Transactions
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def transaction(self) -> Iterator["GraphStore"]:
+        """
+        Run the enclosed reads and writes as one Kuzu transaction.
+
+        Commits once on normal exit and rolls back if the block raises.
+        Nested blocks join the outermost transaction, so helpers can open
+        one without knowing whether their caller already has.
+        """
+        local = self._local
+        if local.tx_depth:
+            local.tx_depth += 1
+            try:
+                yield self
+            finally:
+                local.tx_depth -= 1
+            return
+        with self._write_lock:
+            local.conn.execute("BEGIN TRANSACTION")
+            local.tx_depth = 1
+            try:
+                yield self
+            except BaseException:
+                local.tx_depth = 0
+                try:
+                    local.conn.execute("ROLLBACK")
+                except RuntimeError:
+                    pass  # a failed statement has already rolled the transaction back
+                if self._mirror is not None:
+                    self._load_mirror()
+                self._generation += 1  # reads inside the block may have seen rolled-back writes
+                raise
+            local.tx_depth = 0
+            local.conn.execute("COMMIT")
+            # Other threads may have read the bumped generation alongside the
+            # pre-commit state; bump again now the writes are visible.
+            self._generation += 1
 
     # ------------------------------------------------------------------
     # Write
     # ------------------------------------------------------------------
 
     def upsert_entity(self, name: str, type: str) -> None:
-        self._conn.execute(
-            "MERGE (e:Entity {name: $name}) SET e.type = $type",
-            {"name": name, "type": type},
-        )
+        with self._write_lock:
+            self._execute(
+                "MERGE (e:Entity {name: $name}) SET e.type = $type",
+                {"name": name, "type": type},
+            )
+            if self._mirror is not None:
+                self._mirror.set_entity(name, type)
+            self._generation += 1
 
     def upsert_relation(
         self,
@@ -41,22 +381,145 @@ class GraphStore:
         to_name: str,
         props: Optional[dict] = None,
     ) -> None:
-        props_str = json.dumps(props or {})
-        self._conn.execute(
-            """
-            MATCH (a:Entity {name: $from_name}), (b:Entity {name: $to_name})
-            MERGE (a)-[r:Relation {rel_type: $rel_type}]->(b)
-            SET r.props = $props
-            """,
-            {"from_name": from_name, "to_name": to_name, "rel_type": rel_type, "props": props_str},
-        )
+        props = _edge_props(props)
+        with self._write_lock:
+            self._execute(
+                f"""
+                MATCH (a:Entity {{name: $from_name}}), (b:Entity {{name: $to_name}})
+                MERGE (a)-[r:Relation {{rel_type: $rel_type}}]->(b)
+                {_edge_set("$")}
+                """,
+                {"from_name": from_name, "to_name": to_name, "rel_type": rel_type, **_edge_params(props)},
+            )
+            if self._mirror is not None:
+                self._mirror.set_relation(from_name, rel_type, to_name, props)
+            self._generation += 1
+
+    def upsert_entities(self, rows: Iterable[tuple[str, Optional[str]]]) -> int:
+        """
+        Upsert (name, type) rows in one statement. Returns the entity count.
+
+        A None type keeps an existing entity's type and creates a new one as
+        "entity". Later rows for the same name win, as with upsert_entity().
+        """
+        types = {name: type for name, type in rows}  # later rows win
+        batch = [{"name": name, "type": type} for name, type in types.items()]
+        if batch:
+            with self._write_lock:
+                self._execute(
+                    """
+                    UNWIND $rows AS row
+                    MERGE (e:Entity {name: row.name})
+                    ON CREATE SET e.type = coalesce(row.type, 'entity')
+                    ON MATCH SET e.type = coalesce(row.type, e.type)
+                    """,
+                    {"rows": batch},
+                )
+                if self._mirror is not None:
+                    for name, type in types.items():
+                        self._mirror.set_entity(name, type)
+                self._generation += 1
+        return len(batch)
+
+    def upsert_relations(self, rows: Iterable[tuple]) -> int:
+        """
+        Upsert (from_name, rel_type, to_name[, props]) rows in one statement.
+
+        Both endpoints must already exist; rows naming a missing entity are
+        skipped, as with upsert_relation(). Returns the relation count.
+        """
+        props = {tuple(row[:3]): _edge_props(row[3] if len(row) > 3 else None) for row in rows}  # later rows win
+        batch = [
+            {"from_name": from_name, "rel_type": rel_type, "to_name": to_name, **_edge_params(p)}
+            for (from_name, rel_type, to_name), p in props.items()
+        ]
+        if batch:
+            with self._write_lock:
+                self._execute(_UPSERT_RELATIONS, {"rows": batch})
+                if self._mirror is not None:
+                    for (from_name, rel_type, to_name), p in props.items():
+                        self._mirror.set_relation(from_name, rel_type, to_name, p)
+                self._generation += 1
+        return len(batch)
+
+    # ------------------------------------------------------------------
+    # Bulk import / export
+    # ------------------------------------------------------------------
+
+    def export(self, directory: str, format: str = "parquet") -> dict[str, str]:
+        """
+        Write the whole graph to entities.<format> and relations.<format> in
+        directory with Kuzu's COPY TO; format is "parquet" or "csv".
+
+        Relation rows are (from, to, rel_type) followed by the typed prop
+        columns and the extra map. Returns table name -> file path.
+        """
+        if format not in _BULK_FORMATS:
+            raise ValueError(f"format must be one of {_BULK_FORMATS}, got {format!r}")
+        os.makedirs(directory, exist_ok=True)
+        paths = {}
+        for name, (_, select, _) in _BULK_TABLES.items():
+            paths[name] = os.path.abspath(os.path.join(directory, f"{name}.{format}"))
+            self._conn.execute(f"COPY ({select}) TO {_file_literal(paths[name])}{_copy_options(format)}")
+        logger.info(f"[Graph] Exported to {directory} ({format})")
+        return paths
+
+    def import_(self, directory: str) -> dict[str, int]:
+        """
+        Load files written by export() from directory, Parquet if present,
+        else CSV. Returns table name -> rows loaded.
+
+        An empty table is filled with Kuzu's COPY FROM in one bulk step; a
+        table that already has rows gets the file merged in with LOAD FROM
+        and the same MERGE semantics as upsert_entities / upsert_relations.
+        Relations whose endpoints are missing fail COPY and are skipped by
+        the merge. Run it outside transaction().
+        """
+        format = next((f for f in _BULK_FORMATS if os.path.exists(os.path.join(directory, f"entities.{f}"))), None)
+        if format is None:
+            raise FileNotFoundError(f"No entities.parquet or entities.csv in {directory}")
+        counts = {}
+        with self._write_lock:
+            try:
+                for name, (table, _, merge) in _BULK_TABLES.items():
+                    source = _file_literal(os.path.abspath(os.path.join(directory, f"{name}.{format}")))
+                    options = _copy_options(format, source=True)
+                    if self._count(table) == 0:
+                        self._conn.execute(f"COPY {table} FROM {source}{options}")
+                        counts[name] = self._count(table)
+                    else:
+                        columns = f"WITH HEADERS ({_CSV_COLUMNS[name]}) " if format == "csv" else ""
+                        load = f"LOAD {columns}FROM {source}{options} {merge}"
+                        counts[name] = self._collect(self._conn.execute(load))[0][0]
+            finally:
+                if self._mirror is not None:
+                    self._load_mirror()
+                self._generation += 1
+        logger.info(f"[Graph] Imported {counts['entities']} entities and {counts['relations']} relations "
+                    f"from {directory} ({format})")
+        return counts
 
     # ------------------------------------------------------------------
     # Read
     # ------------------------------------------------------------------
 
+    @property
+    def generation(self) -> int:
+        """
+        Write counter, bumped after every upsert, commit and rolled-back
+        transaction, so a reader that sees a new value also sees the write.
+
+        Anything derived from the graph is still valid while it is unchanged.
+        Writes through query() or another GraphStore on the same database are
+        not counted.
+        """
+        return self._generation
+
     def get_entity(self, name: str) -> Optional[dict]:
-        result = self._conn.execute(
+        if self._mirror is not None:
+            type = self._mirror.entity_type(name)
+            return None if type is None else {"name": name, "type": type}
+        result = self._execute(
             "MATCH (e:Entity {name: $name}) RETURN e.name, e.type",
             {"name": name},
         )
@@ -70,46 +533,105 @@ class GraphStore:
         name: str,
         rel_type: Optional[str] = None,
         direction: str = "out",
+        *,
+        min_weight: Optional[float] = None,
+        min_count: Optional[int] = None,
+        seen_since: Optional[Union[datetime, str]] = None,
+        source: Optional[str] = None,
     ) -> list:
         """Return entities connected to name with edge metadata.
 
-        Each row: [neighbor_name, neighbor_type, rel_type, props_dict]
+        Each row: [neighbor_name, neighbor_type, rel_type, props_dict], ordered
+        by rel_type then neighbor_name.
         direction: 'out' (default), 'in', or 'both'
+        min_weight, min_count, seen_since (last_seen at or after) and source
+        keep only edges whose typed prop matches; edges without it are dropped.
         """
+        filters = _edge_filters(min_weight=min_weight, min_count=min_count, seen_since=seen_since, source=source)
+        if self._mirror is not None:
+            return self._mirror.neighbors(name, rel_type, direction, filters)
         if direction == "out":
             pattern = "(a:Entity {name: $name})-[r:Relation]->(b:Entity)"
-            return_clause = "b.name, b.type, r.rel_type, r.props"
+            return_clause = f"b.name, b.type, r.rel_type, {_EDGE_RETURN}"
         elif direction == "in":
             pattern = "(a:Entity)-[r:Relation]->(b:Entity {name: $name})"
-            return_clause = "a.name, a.type, r.rel_type, r.props"
+            return_clause = f"a.name, a.type, r.rel_type, {_EDGE_RETURN}"
         else:
             pattern = "(a:Entity {name: $name})-[r:Relation]-(b:Entity)"
-            return_clause = "b.name, b.type, r.rel_type, r.props"
+            return_clause = f"b.name, b.type, r.rel_type, {_EDGE_RETURN}"
 
-        cypher = f"MATCH {pattern}"
-        if rel_type:
-            cypher += " WHERE r.rel_type = $rel_type"
-        cypher += f" RETURN {return_clause}"
-
-        params: dict = {"name": name}
+        params: dict = {"name": name, **filters}
+        predicates = [_EDGE_FILTERS[f][0] for f in filters]
         if rel_type:
             params["rel_type"] = rel_type
+            predicates.insert(0, "r.rel_type = $rel_type")
+
+        cypher = f"MATCH {pattern}"
+        if predicates:
+            cypher += " WHERE " + " AND ".join(predicates)
+        cypher += f" RETURN {return_clause} ORDER BY r.rel_type, {return_clause.split(',')[0]}"
 
-        return self._collect(self._conn.execute(cypher, params))
+        return [row[:3] + [_props_from_row(*row[3:])] for row in self._collect(self._execute(cypher, params))]
+
+    def expand(
+        self,
+        name: str,
+        hops: int = 2,
+        rel_types: Optional[list[str]] = None,
+        limit: Optional[int] = None,
+        direction: str = "out",
+    ) -> list[tuple[str, str, str]]:
+        """Return the edges within hops of name as (from_name, rel_type, to_name).
+
+        An edge is included when its near end is fewer than hops steps from
+        name, walking only rel_types edges (all if None) in direction ('out'
+        by default, 'in' or 'both'). Edges are ordered nearest hop first,
+        then by (from_name, rel_type, to_name), each listed once; limit keeps
+        the first limit of them.
+        One query: the start node's own edges plus those of every node a
+        variable-length SHORTEST walk reaches within hops - 1 steps.
+        """
+        if hops < 1:
+            raise ValueError(f"hops must be at least 1, got {hops}")
+        if self._mirror is not None:
+            rows = self._mirror.expand(name, hops, rel_types, direction)
+        else:
+            params: dict = {"name": name}
+            if rel_types:
+                params["rel_types"] = list(rel_types)
+            rows = self._collect(self._execute(self._expand_cypher(hops, bool(rel_types), direction), params))
+        rows.sort()  # the same order from the mirror and from Kuzu, whatever order the edges were stored in
+        edges = list(dict.fromkeys((src, rel, dst) for _, src, rel, dst in rows))
+        return edges if limit is None else edges[:limit]
 
     def all_entities(self) -> list:
-        result = self._conn.execute("MATCH (e:Entity) RETURN e.name, e.type ORDER BY e.name")
+        if self._mirror is not None:
+            return self._mirror.entities()
+        result = self._execute("MATCH (e:Entity) RETURN e.name, e.type ORDER BY e.name")
         rows = []
         while result.has_next():
             row = result.get_next()
             rows.append({"name": row[0], "type": row[1]})
         return rows
 
-    def all_relations(self) -> list:
-        result = self._conn.execute(
-            "MATCH (a:Entity)-[r:Relation]->(b:Entity) "
-            "RETURN a.name, r.rel_type, b.name, r.props "
-            "ORDER BY a.name, r.rel_type"
+    def all_relations(
+        self,
+        *,
+        min_weight: Optional[float] = None,
+        min_count: Optional[int] = None,
+        seen_since: Optional[Union[datetime, str]] = None,
+        source: Optional[str] = None,
+    ) -> list:
+        """Every edge as {from, rel_type, to, props}, filtered as in get_neighbors()."""
+        filters = _edge_filters(min_weight=min_weight, min_count=min_count, seen_since=seen_since, source=source)
+        if self._mirror is not None:
+            return self._mirror.relations(filters)
+        where = " WHERE " + " AND ".join(_EDGE_FILTERS[f][0] for f in filters) if filters else ""
+        result = self._execute(
+            f"MATCH (a:Entity)-[r:Relation]->(b:Entity){where} "
+            f"RETURN a.name, r.rel_type, b.name, {_EDGE_RETURN} "
+            "ORDER BY a.name, r.rel_type, b.name",
+            filters,
         )
         rows = []
         while result.has_next():
@@ -118,28 +640,160 @@ class GraphStore:
                 "from": row[0],
                 "rel_type": row[1],
                 "to": row[2],
-                "props": json.loads(row[3]) if row[3] else {},
+                "props": _props_from_row(*row[3:]),
             })
         return rows
 
     def query(self, cypher: str, params: Optional[dict] = None) -> list:
-        return self._collect(self._conn.execute(cypher, params or {}))
+        """Run ad-hoc Cypher; the last _QUERY_CACHE_SIZE distinct texts stay prepared."""
+        params = params or {}
+        cache = self._local.query_cache
+        statement = cache.get(cypher)
+        if statement is None:
+            statement = self._prepare(cypher, params)
+            cache[cypher] = statement
+            if len(cache) > _QUERY_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(cypher)
+        return self._collect(self._conn.execute(statement, params))
 
     # ------------------------------------------------------------------
     # Internal
     # ------------------------------------------------------------------
 
+    @property
+    def _conn(self) -> kuzu.Connection:
+        """The calling thread's connection, opened on its first use."""
+        return self._local.conn
+
     def _init_schema(self) -> None:
         self._conn.execute(
             "CREATE NODE TABLE IF NOT EXISTS Entity(name STRING, type STRING, PRIMARY KEY(name))"
         )
-        self._conn.execute(
-            "CREATE REL TABLE IF NOT EXISTS Relation(FROM Entity TO Entity, rel_type STRING, props STRING)"
+        self._conn.execute(_RELATION_SCHEMA)
+        if "props" in _relation_columns(self._conn):
+            logger.info(f"[Graph] {self._path} stores Relation props as JSON strings; migrating to typed columns")
+            _migrate_relations(self._conn, self._path)
+
+    def _count(self, table: str) -> int:
+        pattern = "(e:Entity)" if table == "Entity" else "()-[e:Relation]->()"
+        return self._collect(self._execute(f"MATCH {pattern} RETURN count(e)"))[0][0]
+
+    def _load_mirror(self) -> None:
+        """Rebuild the adjacency mirror from Kuzu."""
+        entities = self._collect(self._execute("MATCH (e:Entity) RETURN e.name, e.type"))
+        relations = [
+            row[:3] + [_props_from_row(*row[3:])]
+            for row in self._collect(self._execute(
+                f"MATCH (a:Entity)-[r:Relation]->(b:Entity) RETURN a.name, r.rel_type, b.name, {_EDGE_RETURN}"
+            ))
+        ]
+        self._mirror.reset(entities, relations)
+        logger.info(f"[Graph] Mirrored {len(entities)} entities and {len(relations)} relations")
+
+    @staticmethod
+    def _expand_cypher(hops: int, filtered: bool, direction: str) -> str:
+        where = " WHERE r.rel_type IN $rel_types" if filtered else ""
+        steps = []  # (edge pattern from x, columns for (from, rel_type, to))
+        if direction != "in":
+            steps.append((f"(x)-[r:Relation]->(y:Entity){where}", "x.name AS src, r.rel_type AS rel, y.name AS dst"))
+        if direction != "out":
+            steps.append((f"(y:Entity)-[r:Relation]->(x){where}", "y.name AS src, r.rel_type AS rel, x.name AS dst"))
+        starts = [("MATCH (x:Entity {name: $name})", "0")]
+        if hops > 1:
+            walk = f"[p:Relation* SHORTEST 1..{hops - 1}{' (r, n | WHERE r.rel_type IN $rel_types)' if filtered else ''}]"
+            walk = {"out": f"-{walk}->", "in": f"<-{walk}-"}.get(direction, f"-{walk}-")
+            starts.append((f"MATCH (a:Entity {{name: $name}}){walk}(x:Entity)", "length(p)"))
+        return "\nUNION ALL\n".join(
+            f"{start}\nMATCH {pattern}\nRETURN {hop} AS hop, {columns}"
+            for start, hop in starts
+            for pattern, columns in steps
         )
 
+    def _execute(self, cypher: str, params: Optional[dict] = None):
+        """Execute one of this class's own statements, prepared on first use."""
+        params = params or {}
+        statements = self._local.statements
+        statement = statements.get(cypher)
+        if statement is None:
+            statement = statements[cypher] = self._prepare(cypher, params)
+        return self._conn.execute(statement, params)
+
+    def _prepare(self, cypher: str, params: dict) -> kuzu.PreparedStatement:
+        # The first call's parameters fix the parameter types, as Connection.execute does.
+        statement = kuzu.PreparedStatement(self._conn, cypher, params)
+        if not statement.is_success():
+            raise RuntimeError(statement.get_error_message())
+        return statement
+
     @staticmethod
     def _collect(result) -> list:
         rows = []
         while result.has_next():
             rows.append(result.get_next())
         return rows
+
+
+def _file_literal(path: str) -> str:
+    """path as a Cypher string literal; COPY and LOAD FROM take no parameters."""
+    return "'" + path.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def _copy_options(format: str, source: bool = False) -> str:
+    """Options for COPY TO, or with source=True for COPY/LOAD FROM (quoted newlines need the serial CSV reader)."""
+    if format != "csv":
+        return ""
+    return " (header=true, parallel=false)" if source else " (header=true)"
+
+
+def _relation_columns(conn: kuzu.Connection) -> set[str]:
+    return {row[1] for row in GraphStore._collect(conn.execute("CALL TABLE_INFO('Relation') RETURN *"))}
+
+
+def migrate_graph(path: str, batch_size: int = 5000) -> dict:
+    """
+    Convert a graph database whose Relation table keeps props as one JSON
+    string to the typed columns GraphStore now uses.
+
+    Every edge is read, the Relation table is recreated with the new schema
+    and the edges are written back, all in one transaction, so an
+    interrupted run leaves the old table in place. Prop values that do not
+    fit their typed column (a non-numeric weight, say) are kept as extras.
+    Run it while nothing else has the database open; GraphStore does the
+    same on open. Returns counts of edges migrated and of edges that
+    carried extra keys; a database that is already typed is left alone.
+    """
+    path = os.path.abspath(path)
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    return _migrate_relations(kuzu.Connection(kuzu.Database(path)), path, batch_size)
+
+
+def _migrate_relations(conn: kuzu.Connection, path: str, batch_size: int = 5000) -> dict:
+    if "props" not in _relation_columns(conn):
+        return {"migrated": False, "relations": 0, "with_extras": 0}
+    edges = GraphStore._collect(conn.execute(
+        "MATCH (a:Entity)-[r:Relation]->(b:Entity) RETURN a.name, r.rel_type, b.name, r.props"
+    ))
+    rows, with_extras = [], 0
+    for from_name, rel_type, to_name, raw in edges:
+        data = json.loads(raw) if raw else {}
+        props = _edge_props(data if isinstance(data, dict) else {"props": data}, strict=False)
+        with_extras += any(not _is_typed(key, value) for key, value in props.items())
+        rows.append({"from_name": from_name, "rel_type": rel_type, "to_name": to_name, **_edge_params(props)})
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        conn.execute("DROP TABLE Relation")
+        conn.execute(_RELATION_SCHEMA)
+        for start in range(0, len(rows), batch_size):
+            conn.execute(_UPSERT_RELATIONS, {"rows": rows[start:start + batch_size]})
+    except BaseException:
+        try:
+            conn.execute("ROLLBACK")
+        except RuntimeError:
+            pass  # a failed statement has already rolled the transaction back
+        raise
+    conn.execute("COMMIT")
+    logger.info(f"[Graph] Migrated {len(rows)} relations in {path} to typed props ({with_extras} with extras)")
+    return {"migrated": True, "relations": len(rows), "with_extras": with_extras}
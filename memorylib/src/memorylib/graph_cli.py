@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Migrate a graph database to typed relation properties.
+
+Older graph.db directories keep each relation's properties as one JSON
+string. This rewrites the Relation table in place with typed columns
+(weight, first_seen, last_seen, count, source) and a MAP for any other
+keys (see migrate_graph). Already migrated databases are left alone.
+GraphStore migrates on open as well; this does it ahead of time, e.g. to
+keep a large migration out of robot start-up. Run while the robot is
+stopped.
+
+Usage:
+    migrate-graph                                # default store
+    migrate-graph --path /custom/path/graph.db
+"""
+
+import argparse
+import os
+import time
+
+from .graph import migrate_graph
+
+_DEFAULT_PATH = os.path.join("data", "memory", "graph.db")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate a graph database to typed relation properties")
+    parser.add_argument("--path", default=_DEFAULT_PATH, help=f"Path to the graph database (default: {_DEFAULT_PATH})")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Relations rewritten per statement (default: 5000)")
+    args = parser.parse_args()
+    if not os.path.exists(args.path):
+        parser.error(f"no graph database at {args.path}")
+
+    start = time.perf_counter()
+    stats = migrate_graph(args.path, batch_size=args.batch_size)
+    if not stats["migrated"]:
+        print(f"{args.path} already uses typed relation properties")
+        return
+    print(f"Migrated {stats['relations']} relation(s) in {time.perf_counter() - start:.1f}s")
+    print(f"{stats['with_extras']} relation(s) kept extra properties in the map")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+import logging
+import os
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .buffer import EmbeddingBuffer, MappedEmbeddingBuffer
+
+logger = logging.getLogger(__name__)
+
+
+class VectorIndex:
+    """
+    Nearest-neighbour index over an externally owned (N, D) matrix.
+
+    The index never copies the vectors: every call receives the current
+    matrix (e.g. EpisodicStore's memory-mapped sidecar) and the index keeps
+    only its own bookkeeping. Rows are append-only; sync() indexes rows
+    added since the previous call.
+
+    search() takes either exclude (a few row numbers to skip) or mask (a
+    boolean array over all rows; False rows are never returned). A selective
+    mask gathers and scores only the selected rows, so a narrow filter makes
+    the query cheaper rather than post-filtering its results.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self._size = 0  # rows indexed so far
+
+    def sync(self, matrix: Optional[np.ndarray]) -> None:
+        """Index rows appended to matrix since the last sync."""
+        n = 0 if matrix is None else len(matrix)
+        if n < self._size:
+            self.reset()
+        if n > self._size:
+            self._add(matrix, self._size)
+            self._size = n
+
+    def search(
+        self,
+        matrix: np.ndarray,
+        query: np.ndarray,
+        k: int,
+        exclude: Sequence[int] = (),
+        mask: Optional[np.ndarray] = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return (rows, scores) of the k best inner-product matches, best first."""
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        self._size = 0
+
+    def save(self, path: str) -> None:
+        """Persist index state to path. No-op for stateless indexes."""
+
+    def load(self, path: str) -> None:
+        """Restore state written by save(); missing or unreadable files are ignored."""
+
+    def __len__(self) -> int:
+        return self._size
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _add(self, matrix: np.ndarray, start: int) -> None:
+        pass
+
+    @classmethod
+    def _exact(cls, matrix, query, k, exclude, mask=None) -> tuple[np.ndarray, np.ndarray]:
+        if mask is not None:
+            rows = cls._masked_rows(mask, exclude)
+            if len(rows) * 4 < len(matrix):  # gathering rows costs ~4x scoring them in place
+                return cls._top_k(rows, matrix[rows] @ query, k)
+            return cls._top_k(rows, (matrix @ query)[rows], k)
+        scores = matrix @ query
+        if len(exclude):
+            scores[list(exclude)] = -np.inf
+        k = min(k, len(scores) - len(exclude))
+        return cls._top_k(np.arange(len(scores)), scores, k)
+
+    @staticmethod
+    def _masked_rows(mask: np.ndarray, exclude: Sequence[int]) -> np.ndarray:
+        rows = np.flatnonzero(mask)
+        if len(exclude):
+            rows = rows[~np.isin(rows, exclude)]
+        return rows
+
+    @staticmethod
+    def _top_k(rows: np.ndarray, scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        k = min(k, len(scores))
+        if k <= 0:
+            return rows[:0], scores[:0]
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
+        return rows[top], scores[top]
+
+
+class ExactIndex(VectorIndex):
+    """Brute-force inner product over every row. Always exact."""
+
+    name = "exact"
+
+    def search(self, matrix, query, k, exclude=(), mask=None):
+        return self._exact(matrix, query, k, exclude, mask)
+
+
+class IVFIndex(VectorIndex):
+    """
+    Inverted-file (IVF-flat) index, pure NumPy.
+
+    Rows are partitioned by spherical k-means into nlist cells (default
+    sqrt(N), trained on a sample of 32 rows per cell); a query
+    scores only the rows in its nprobe closest cells. Until min_train rows
+    exist the index answers exactly. Cells are retrained from a sample once
+    the matrix has grown retrain_factor times past the last training size;
+    new rows in between are assigned to their nearest existing centroid.
+    With a mask, probed rows are filtered before scoring; a mask selecting
+    no more rows than the probe would visit is answered exactly instead.
+
+    State (centroids + per-row cell assignments) is saved as .npz.
+    """
+
+    name = "ivf"
+
+    def __init__(
+        self,
+        nlist: Optional[int] = None,
+        nprobe: int = 8,
+        min_train: int = 4096,
+        retrain_factor: int = 4,
+        seed: int = 0,
+    ):
+        super().__init__()
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.min_train = min_train
+        self.retrain_factor = retrain_factor
+        self._seed = seed
+        self._centroids: Optional[np.ndarray] = None  # (nlist, D)
+        self._assign = EmbeddingBuffer(dim=1, dtype=np.int32)  # cell per indexed row
+        self._cells: list = []                         # row indices per cell
+        self._trained_size = 0
+
+    def search(self, matrix, query, k, exclude=(), mask=None):
+        if self._centroids is None:
+            return self._exact(matrix, query, k, exclude, mask)
+        nprobe = min(self.nprobe, len(self._centroids))
+        if mask is not None and np.count_nonzero(mask) <= nprobe * len(matrix) // len(self._centroids):
+            return self._exact(matrix, query, k, exclude, mask)
+        probe = np.argpartition(self._centroids @ query, -nprobe)[-nprobe:]
+        rows = np.concatenate([self._cells[c] for c in probe])
+        if mask is not None:
+            rows = rows[mask[rows]]
+        if len(exclude):
+            rows = rows[~np.isin(rows, exclude)]
+        return self._top_k(rows, matrix[rows] @ query, k)
+
+    def reset(self) -> None:
+        super().reset()
+        self._centroids = None
+        self._assign.clear()
+        self._cells = []
+        self._trained_size = 0
+
+    def save(self, path: str) -> None:
+        if self._centroids is None:
+            return
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, centroids=self._centroids, assign=self._assign.view()[:, 0],
+                 trained_size=self._trained_size)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> None:
+        if not os.path.exists(path):
+            return
+        try:
+            with np.load(path) as data:
+                centroids = data["centroids"]
+                assign = data["assign"].astype(np.int32)
+                trained_size = int(data["trained_size"])
+            self.reset()
+            self._centroids = centroids
+            self._cells = [np.empty(0, dtype=np.int64) for _ in range(len(centroids))]
+            self._trained_size = trained_size
+            self._assign_rows(0, assign)
+            self._size = len(assign)
+        except Exception as e:
+            logger.warning(f"[Index] Ignoring unreadable index {path}: {e}")
+            self.reset()
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _add(self, matrix, start):
+        n = len(matrix)
+        if self._centroids is None:
+            if n >= self.min_train:
+                self._train(matrix)
+            return
+        if n >= self._trained_size * self.retrain_factor:
+            self._train(matrix)
+            return
+        self._assign_rows(start, self._nearest(matrix[start:n]))
+
+    def _assign_rows(self, start: int, cells: np.ndarray) -> None:
+        """Record cells for rows start.. and append them to the per-cell row lists."""
+        self._assign.extend(cells.reshape(-1, 1))
+        if len(cells) == 1:
+            c = int(cells[0])
+            self._cells[c] = np.append(self._cells[c], start)
+            return
+        order = np.argsort(cells, kind="stable")
+        bounds = np.searchsorted(cells[order], np.arange(len(self._centroids) + 1))
+        for c in np.flatnonzero(np.diff(bounds)):
+            self._cells[c] = np.concatenate([self._cells[c], start + order[bounds[c]:bounds[c + 1]]])
+
+    def _train(self, matrix: np.ndarray) -> None:
+        n = len(matrix)
+        nlist = min(n, self.nlist or max(1, int(np.sqrt(n))))
+        rng = np.random.default_rng(self._seed)
+        sample_size = min(n, nlist * 32)
+        sample = np.asarray(matrix[np.sort(rng.choice(n, sample_size, replace=False))])
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+        for _ in range(10):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(labels, kind="stable")
+            filled, starts = np.unique(labels[order], return_index=True)
+            sums = np.add.reduceat(sample[order], starts, axis=0)
+            centroids[filled] = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+        self._assign.clear()
+        self._centroids = centroids.astype(np.float32)
+        self._cells = [np.empty(0, dtype=np.int64) for _ in range(nlist)]
+        self._assign_rows(0, self._nearest(matrix))
+        self._trained_size = n
+        logger.info(f"[Index] Trained IVF with {nlist} cells on {n} rows")
+
+    def _nearest(self, rows: np.ndarray, chunk: int = 65536) -> np.ndarray:
+        out = np.empty(len(rows), dtype=np.int32)
+        for i in range(0, len(rows), chunk):
+            out[i:i + chunk] = np.argmax(rows[i:i + chunk] @ self._centroids.T, axis=1)
+        return out
+
+
+class QuantizedIndex(VectorIndex):
+    """
+    Scan compact codes instead of float32 rows, then rerank in float.
+
+    Every row is encoded into a small code held in its own buffer. A query
+    scores all codes, keeps the best max(k * rerank, min_candidates) rows and
+    rescores only those against the float matrix. With EpisodicStore's
+    memory-mapped sidecar that means only candidate rows are paged in; the
+    codes are what stays resident.
+
+    After load(path) the codes live in a memory-mapped file next to path and
+    are written through on every insert, so restarting never re-encodes.
+    """
+
+    code_dtype = np.uint8
+    code_suffix = ".codes"
+
+    def __init__(self, rerank: int = 4, min_candidates: int = 64, chunk: int = 4096):
+        super().__init__()
+        self.rerank = rerank
+        self.min_candidates = min_candidates
+        self._chunk = chunk
+        self._codes = EmbeddingBuffer(dtype=self.code_dtype)
+
+    def search(self, matrix, query, k, exclude=(), mask=None):
+        if mask is not None:
+            rows = self._masked_rows(mask, exclude)
+            n = max(k * self.rerank, self.min_candidates)
+            if len(rows) > n:
+                coarse = self._coarse_scores(query, rows)
+                rows = np.sort(rows[np.argpartition(coarse, -n)[-n:]])
+            return self._top_k(rows, matrix[rows] @ query, k)
+        coarse = self._coarse_scores(query)
+        if len(exclude):
+            coarse[list(exclude)] = -np.inf
+        n = min(len(coarse) - len(exclude), max(k * self.rerank, self.min_candidates))
+        if n <= 0:
+            return self._top_k(np.arange(0), coarse[:0], k)
+        candidates = np.sort(np.argpartition(coarse, -n)[-n:])  # sorted for sequential page access
+        return self._top_k(candidates, matrix[candidates] @ query, k)
+
+    def reset(self) -> None:
+        super().reset()
+        self._codes.clear()
+
+    def save(self, path: str) -> None:
+        if isinstance(self._codes, MappedEmbeddingBuffer):
+            self._codes.flush()
+
+    def load(self, path: str) -> None:
+        codes_path = os.path.splitext(path)[0] + self.code_suffix
+        try:
+            self._codes = MappedEmbeddingBuffer(codes_path, dtype=self.code_dtype)
+        except Exception as e:
+            logger.warning(f"[Index] Discarding unreadable codes {codes_path}: {e}")
+            os.remove(codes_path)
+            self._codes = MappedEmbeddingBuffer(codes_path, dtype=self.code_dtype)
+        self._size = len(self._codes)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the codes (what a query scans)."""
+        codes = self._codes.view()
+        return 0 if codes is None else codes.nbytes
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _add(self, matrix, start):
+        self._codes.truncate(start)
+        for i in range(start, len(matrix), self._chunk):
+            self._codes.extend(self._encode(np.asarray(matrix[i:i + self._chunk])))
+
+    def _coarse_scores(self, query: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Score every code, or only those of rows."""
+        codes = self._codes.view()
+        q = self._encode_query(query)
+        if rows is None:
+            return np.concatenate([
+                self._score_codes(codes[i:i + self._chunk], q) for i in range(0, len(codes), self._chunk)
+            ])
+        return np.concatenate([
+            self._score_codes(codes[rows[i:i + self._chunk]], q) for i in range(0, len(rows), self._chunk)
+        ])
+
+    def _encode(self, rows: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def _encode_query(self, query: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def _score_codes(self, codes: np.ndarray, q: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+
+class Int8Index(QuantizedIndex):
+    """
+    Scalar int8 quantisation: 1 byte per dimension (4x smaller than float32).
+
+    Uses a fixed clip of min(1, 4 / sqrt(D)) so codes never need retraining;
+    unit-vector components beyond it saturate, which the float rerank absorbs.
+    """
+
+    name = "int8"
+    code_dtype = np.int8
+    code_suffix = ".i8"
+
+    def _encode(self, rows):
+        scale = 127.0 / min(1.0, 4.0 / np.sqrt(rows.shape[1]))
+        return np.clip(np.rint(rows * scale), -127, 127).astype(np.int8)
+
+    def _encode_query(self, query):
+        return query.astype(np.float32)
+
+    def _score_codes(self, codes, q):
+        return codes.astype(np.float32) @ q
+
+
+class BinaryIndex(QuantizedIndex):
+    """
+    1-bit sign codes: D / 8 bytes per row (32x smaller than float32).
+
+    Candidates are the rows with the smallest Hamming distance to the
+    query's sign code. Sign bits of 384-d vectors separate near neighbours
+    poorly, so the default rerank pool is much wider than Int8Index's.
+    """
+
+    name = "binary"
+    code_dtype = np.uint8
+    code_suffix = ".u1"
+
+    def __init__(self, rerank: int = 64, min_candidates: int = 1024, chunk: int = 4096):
+        super().__init__(rerank, min_candidates, chunk)
+
+    def _encode(self, rows):
+        return np.packbits(rows > 0, axis=1)
+
+    def _encode_query(self, query):
+        return np.packbits(query > 0)
+
+    def _score_codes(self, codes, q):
+        return -_popcount(codes ^ q).sum(axis=1, dtype=np.float32)
+
+
+_POPCOUNT_LUT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(x: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):  # numpy >= 2.0
+        return np.bitwise_count(x)
+    return _POPCOUNT_LUT[x]
+
+
+_INDEXES = {cls.name: cls for cls in (ExactIndex, IVFIndex, Int8Index, BinaryIndex)}
+
+
+def make_index(kind) -> VectorIndex:
+    """Return a VectorIndex from a backend name ('exact', 'ivf', 'int8', 'binary') or pass an instance through."""
+    if isinstance(kind, VectorIndex):
+        return kind
+    try:
+        return _INDEXES[kind]()
+    except KeyError:
+        raise ValueError(f"Unknown index backend {kind!r}; expected one of {sorted(_INDEXES)}") from None
@@ -0,0 +1,87 @@
+import math
+import re
+from array import array
+from collections import Counter
+from typing import Optional
+
+import numpy as np
+
+from .buffer import EmbeddingBuffer
+from .cache import normalize_text
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Case-folded word tokens; the same normalisation as the embedding cache."""
+    return _TOKEN_RE.findall(normalize_text(text))
+
+
+class BM25Index:
+    """
+    Incremental inverted index with Okapi BM25 scoring.
+
+    Documents are numbered in insertion order. Each term keeps a postings
+    list of (doc, term frequency) in compact arrays and document lengths sit
+    in an EmbeddingBuffer, so add() is O(tokens) and search() only touches the
+    postings of the query terms.
+
+    Catches what embeddings blur: exact names ("Biscuit") rank by how rare
+    they are in the store rather than by how similar the surrounding turn is.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, tuple[array, array]] = {}  # term -> (docs, tfs)
+        self._lengths = EmbeddingBuffer(dim=1, dtype=np.float32)
+        self._total_length = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def add(self, text: str) -> int:
+        """Index one document and return its number."""
+        doc = len(self._lengths)
+        tokens = tokenize(text)
+        for term, tf in Counter(tokens).items():
+            if term not in self._postings:
+                self._postings[term] = (array("l"), array("l"))
+            docs, tfs = self._postings[term]
+            docs.append(doc)
+            tfs.append(tf)
+        self._lengths.append(np.array([len(tokens)], dtype=np.float32))
+        self._total_length += len(tokens)
+        return doc
+
+    def search(self, query: str, k: int, mask: Optional[np.ndarray] = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return (docs, scores) of the top k documents sharing a term with query.
+
+        mask, a boolean array over all documents, drops the False ones before ranking.
+        """
+        n = len(self._lengths)
+        terms = [t for t in set(tokenize(query)) if t in self._postings]
+        if not n or not terms:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        lengths = self._lengths.view()[:, 0]
+        avg_length = self._total_length / n
+        scores = np.zeros(n, dtype=np.float32)
+        for term in terms:
+            docs, tfs = self._postings[term]
+            docs = np.array(docs, dtype=np.int64)
+            tfs = np.array(tfs, dtype=np.float32)
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * lengths[docs] / avg_length)
+            scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + norm)
+        if mask is not None:
+            scores[~mask] = 0.0
+        matched = np.flatnonzero(scores)
+        k = min(k, len(matched))
+        top = matched[np.argpartition(scores[matched], -k)[-k:]] if k else matched[:0]
+        top = top[np.argsort(scores[top])[::-1]]
+        return top, scores[top]
+
+    def __len__(self) -> int:
+        return len(self._lengths)
@@ -1,12 +1,19 @@
+import logging
 import os
-from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
 
+from .embedders import Embedder
 from .episodic import EpisodicStore
 from .face import FaceStore
 from .graph import GraphStore
 from .media import MediaStore
 from .speaker import SpeakerStore
 
+logger = logging.getLogger(__name__)
+
+_CONTEXT_DIVERSITY = 0.3  # MMR weight for build_context, so near-copies of one exchange fill one slot
+
 
 class MemoryManager:
     """
@@ -20,18 +27,89 @@ class MemoryManager:
 
     If speaker is provided, save_audio() automatically identifies and tags
     recordings with the speaker name unless one is supplied explicitly.
+
+    episodic_index selects the episodic search backend ("exact", "ivf",
+    "int8" or "binary"), embedder the text embedder factory and
+    episodic_dedupe an optional cosine threshold above which a turn is
+    merged into a near-identical earlier one instead of stored;
+    persist_cache keeps episodic's embedding cache on disk across restarts
+    (call close() on shutdown to save it); see EpisodicStore. graph_mirror keeps an in-process copy of the graph for
+    microsecond neighbour reads; see GraphStore.
+
+    Models are loaded lazily on first use; call warm_up() at startup to load
+    them in the background instead, and ready() to check before calling
+    something that would otherwise block on a model still warming up.
     """
 
-    def __init__(self, base_dir: str):
+    def __init__(
+        self,
+        base_dir: str,
+        episodic_index: str = "exact",
+        embedder: Optional[Callable[[], Embedder]] = None,
+        episodic_dedupe: Optional[float] = None,
+        graph_mirror: bool = False,
+        persist_cache: bool = False,
+    ):
         base = os.path.abspath(base_dir)
         os.makedirs(base, exist_ok=True)
-        self.graph = GraphStore(os.path.join(base, "graph.db"))
-        self.episodic = EpisodicStore(os.path.join(base, "episodic.jsonl"))
+        self.graph = GraphStore(os.path.join(base, "graph.db"), mirror=graph_mirror)
+        self.episodic = EpisodicStore(
+            os.path.join(base, "episodic.jsonl"), index=episodic_index, embedder=embedder,
+            dedupe=episodic_dedupe, persist_cache=persist_cache,
+        )
         self.media = MediaStore(os.path.join(base, "recordings"))
         speaker_path = os.path.join(base, "speakers.jsonl")
         self.speaker = SpeakerStore(path=speaker_path) if SpeakerStore.profiles_exist(speaker_path) else None
         face_path = os.path.join(base, "faces.jsonl")
         self.face = FaceStore(path=face_path) if FaceStore.profiles_exist(face_path) else None
+        self.warmups: dict[str, Future] = {}
+
+    # ------------------------------------------------------------------
+    # Warm-up
+    # ------------------------------------------------------------------
+
+    def warm_up(self) -> dict[str, Future]:
+        """
+        Load the episodic embedder and, if present, the speaker and face
+        models concurrently on a background thread pool.
+
+        Returns (and keeps in self.warmups) a future per sub-store name. A
+        failed load is logged and left in its future; the store then falls
+        back to loading lazily on first use. Safe to call more than once.
+        """
+        stores = {name: store for name, store in self._model_stores().items() if name not in self.warmups}
+        if not stores:
+            return self.warmups
+        executor = ThreadPoolExecutor(max_workers=len(stores), thread_name_prefix="memory-warmup")
+        for name, store in stores.items():
+            future = executor.submit(store.warm_up)
+            future.add_done_callback(lambda f, name=name: self._log_warm_up(name, f))
+            self.warmups[name] = future
+        executor.shutdown(wait=False)
+        return self.warmups
+
+    def ready(self, name: str) -> bool:
+        """
+        True if sub-store name ("episodic", "speaker", "face") exists and
+        using it will not wait on a warm-up that is still running. Without
+        warm_up() a store is always ready and loads its model on first use.
+        """
+        store = self._model_stores().get(name)
+        if store is None:
+            return False
+        future = self.warmups.get(name)
+        return store.ready or future is None or future.done()
+
+    def _model_stores(self) -> dict:
+        stores = {"episodic": self.episodic, "speaker": self.speaker, "face": self.face}
+        return {name: store for name, store in stores.items() if store is not None}
+
+    @staticmethod
+    def _log_warm_up(name: str, future: Future) -> None:
+        if future.exception() is not None:
+            logger.warning(f"[Memory] Warm-up of {name} failed: {future.exception()}")
+        else:
+            logger.info(f"[Memory] {name} model ready")
 
     # ------------------------------------------------------------------
     # Graph
@@ -47,9 +125,9 @@ class MemoryManager:
         props: Optional[dict] = None,
     ) -> None:
         """Assert a fact: (subject) -[relation]-> (obj)."""
-        self.graph.upsert_entity(subject, subject_type)
-        self.graph.upsert_entity(obj, obj_type)
-        self.graph.upsert_relation(subject, relation, obj, props)
+        with self.graph.transaction():
+            self.graph.upsert_entities([(subject, subject_type), (obj, obj_type)])
+            self.graph.upsert_relation(subject, relation, obj, props)
 
     def recall(
         self,
@@ -68,7 +146,7 @@ class MemoryManager:
             fact_lines = "\n".join(f"- {row[2]}: {row[0]}" for row in rows)
             parts.append(f"Facts about {subject}:\n{fact_lines}")
         if query:
-            episodes = self.episodic.search(query, top_k=3)
+            episodes = self.episodic.search(query, top_k=3, diversity=_CONTEXT_DIVERSITY)
             if episodes:
                 ep_lines = "\n".join(f"- {e}" for e in episodes)
                 parts.append(f"Relevant past exchanges:\n{ep_lines}")
@@ -90,8 +168,13 @@ class MemoryManager:
         text = f"{user_label}: {user_text} {assistant_label}: {assistant_text}"
         self.episodic.store(text, metadata)
 
-    def search_episodes(self, query: str, top_k: int = 3) -> list[str]:
-        return self.episodic.search(query, top_k)
+    def search_episodes(self, query: str, top_k: int = 3, mode: str = "hybrid", **filters) -> list[str]:
+        """Search episodic memory; filters (speaker, since, recency_half_life, diversity) go to EpisodicStore.search."""
+        return self.episodic.search(query, top_k, mode=mode, **filters)
+
+    def close(self) -> None:
+        """Save what the stores write lazily (episodic's persistent embedding cache) before shutdown."""
+        self.episodic.close()
 
     # ------------------------------------------------------------------
     # Media
@@ -97,30 +97,32 @@ class Reflector:
 
         return audio_tagged, images_tagged
 
-    def mine_episodic(self, extractor: Extractor) -> int:
+    def mine_episodic(self, extractor: Extractor, batch_size: int = 5000) -> int:
         """
         Extract graph facts from episodic entries using a caller-supplied extractor.
 
         extractor(text: str) -> list[Triple]
             where Triple = (subject: str, relation: str, object: str)
 
-        Returns the number of triples written to the graph.
+        Returns the number of triples written to the graph. Triples are
+        written in batches of batch_size; entities they introduce get the
+        type "entity" and existing entities keep theirs.
         """
         written = 0
+        triples: list[Triple] = []
         for entry in self._memory.episodic.all_entries():
             text = entry.get("text", "")
             if not text:
                 continue
             try:
-                triples = extractor(text)
+                triples.extend(extractor(text))
             except Exception as e:
                 logger.warning(f"[Reflect] Extractor raised on entry {entry.get('id')}: {e}")
                 continue
-            for subj, rel, obj in triples:
-                self._memory.graph.upsert_entity(subj)
-                self._memory.graph.upsert_entity(obj)
-                self._memory.graph.upsert_relation(subj, rel, obj)
-                written += 1
+            if len(triples) >= batch_size:
+                written += self._write_triples(triples)
+                triples = []
+        written += self._write_triples(triples)
 
         if written:
             logger.info(f"[Reflect] Wrote {written} fact(s) from episodic mining")
@@ -130,6 +132,12 @@ class Reflector:
     # Internal
     # ------------------------------------------------------------------
 
+    def _write_triples(self, triples: list[Triple]) -> int:
+        graph = self._memory.graph
+        graph.upsert_entities((name, None) for subj, _, obj in triples for name in (subj, obj))
+        graph.upsert_relations(triples)
+        return len(triples)
+
     def _identify_audio_file(self, path: str) -> Optional[str]:
         if self._memory.speaker is None:
             return None
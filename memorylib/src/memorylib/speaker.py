@@ -2,14 +2,18 @@ import io
 import json
 import logging
 import os
+import threading
 import wave
 from typing import Optional
 
 import numpy as np
 
+from .buffer import EmbeddingBuffer
+
 logger = logging.getLogger(__name__)
 
 _DEFAULT_THRESHOLD = 0.75
+_SCORINGS = ("max", "centroid")
 
 
 def _wav_to_array(wav_bytes: bytes) -> tuple:
@@ -29,14 +33,33 @@ class SpeakerStore:
     Enrolls named speakers from WAV audio, then identifies speakers from
     new audio using cosine similarity on resemblyzer embeddings.
 
+    Every enrolled embedding is a row of one contiguous (S, D) matrix with
+    an owner array mapping rows to speakers, so identify() is a single
+    mat-vec followed by a per-speaker max; enroll() appends a row. With
+    scoring="centroid" each speaker is instead scored against the
+    normalised mean of their samples, one row per speaker, which is cheaper
+    with many samples but blurs speakers whose recordings vary a lot.
+
     resemblyzer is imported lazily on first embed call so the module can be
-    imported without it installed (it's an optional dependency).
+    imported without it installed (it's an optional dependency). warm_up()
+    loads the VoiceEncoder ahead of time; it is safe to call from a
+    background thread while identify() waits on the same lock.
     """
 
-    def __init__(self, path: str):
+    def __init__(self, path: str, scoring: str = "max"):
+        if scoring not in _SCORINGS:
+            raise ValueError(f"Unknown scoring {scoring!r}, expected one of {_SCORINGS}")
         self.path = os.path.abspath(path)
+        self.scoring = scoring
         self._encoder = None
-        self._profiles: dict = {}  # name -> list[np.ndarray]
+        self._encoder_lock = threading.Lock()
+        self._names: list = []  # owner index -> name
+        self._owner: dict = {}  # name -> owner index
+        self._counts: list = []  # owner index -> sample count
+        self._matrix = EmbeddingBuffer()  # (S, D), one row per sample
+        self._owners = EmbeddingBuffer(dim=1, dtype=np.intp)  # (S, 1) owner index of each row
+        self._sums = EmbeddingBuffer()  # (P, D) per-speaker sum of samples
+        self._centroids = EmbeddingBuffer()  # (P, D) normalised _sums
         self._load()
 
     # ------------------------------------------------------------------
@@ -46,33 +69,41 @@ class SpeakerStore:
     def enroll(self, name: str, wav_bytes: bytes) -> int:
         """Embed wav_bytes and append to the store. Returns total sample count."""
         embedding = self._embed(wav_bytes)
-        self._profiles.setdefault(name, []).append(embedding)
+        self._add([name], np.asarray(embedding, dtype=np.float32).reshape(1, -1))
         self._append(name, embedding)
-        count = len(self._profiles[name])
+        count = self.sample_count(name)
         logger.info(f"[Speaker] Enrolled '{name}' (sample {count})")
         return count
 
     def identify(self, wav_bytes: bytes, threshold: float = _DEFAULT_THRESHOLD) -> Optional[str]:
         """Return the best-matching speaker name, or None if below threshold."""
-        if not self._profiles:
+        if not len(self._owners):
             return None
-        embedding = self._embed(wav_bytes)
-        best_name, best_score = None, -1.0
-        for name, embeddings in self._profiles.items():
-            score = max(float(np.dot(embedding, e)) for e in embeddings)
-            if score > best_score:
-                best_name, best_score = name, score
+        embedding = np.asarray(self._embed(wav_bytes), dtype=np.float32)
+        scores = self._scores(embedding)
+        best = int(np.argmax(scores))
+        best_name, best_score = self._names[best], float(scores[best])
         if best_score >= threshold:
             logger.info(f"[Speaker] Identified '{best_name}' (score={best_score:.3f})")
             return best_name
         logger.info(f"[Speaker] Unknown speaker (best={best_name}, score={best_score:.3f})")
         return None
 
+    def warm_up(self) -> None:
+        """Load the VoiceEncoder now instead of on the first embed."""
+        self._ensure_encoder()
+
+    @property
+    def ready(self) -> bool:
+        """True once the VoiceEncoder is loaded and identify() will not block on it."""
+        return self._encoder is not None
+
     def speakers(self) -> list:
-        return list(self._profiles.keys())
+        return list(self._names)
 
     def sample_count(self, name: str) -> int:
-        return len(self._profiles.get(name, []))
+        owner = self._owner.get(name)
+        return 0 if owner is None else self._counts[owner]
 
     @classmethod
     def profiles_exist(cls, path: str) -> bool:
@@ -82,11 +113,51 @@ class SpeakerStore:
     # Internal
     # ------------------------------------------------------------------
 
+    def _ensure_encoder(self) -> None:
+        if self._encoder is not None:
+            return
+        with self._encoder_lock:
+            if self._encoder is None:
+                from resemblyzer import VoiceEncoder
+                logger.info("[Speaker] Loading VoiceEncoder...")
+                self._encoder = VoiceEncoder()
+
+    def _scores(self, embedding: np.ndarray) -> np.ndarray:
+        """Best cosine score per speaker (owner index order)."""
+        speakers = len(self._counts)
+        if self.scoring == "centroid":
+            return self._centroids.view()[:speakers] @ embedding
+        rows = len(self._owners)
+        scores = self._matrix.view()[:rows] @ embedding
+        best = np.full(speakers, -np.inf, dtype=scores.dtype)
+        np.maximum.at(best, self._owners.view()[:rows, 0], scores)
+        return best
+
+    def _add(self, names: list, embeddings: np.ndarray) -> None:
+        """Append one sample row per name, registering new speakers and updating their centroids."""
+        owners = np.empty(len(names), dtype=np.intp)
+        for i, name in enumerate(names):
+            owner = self._owner.get(name)
+            if owner is None:
+                owner = self._owner[name] = len(self._names)
+                self._names.append(name)
+                self._counts.append(0)
+            self._counts[owner] += 1
+            owners[i] = owner
+        self._matrix.extend(embeddings)
+        for _ in range(len(self._names) - len(self._sums)):
+            self._sums.append(np.zeros(embeddings.shape[1], dtype=np.float32))
+            self._centroids.append(np.zeros(embeddings.shape[1], dtype=np.float32))
+        sums = self._sums.view()
+        np.add.at(sums, owners, embeddings)
+        touched = np.unique(owners)
+        norms = np.linalg.norm(sums[touched], axis=1, keepdims=True)
+        self._centroids.view()[touched] = sums[touched] / np.maximum(norms, 1e-12)
+        self._owners.extend(owners.reshape(-1, 1))
+
     def _embed(self, wav_bytes: bytes) -> np.ndarray:
-        from resemblyzer import VoiceEncoder, preprocess_wav
-        if self._encoder is None:
-            logger.info("[Speaker] Loading VoiceEncoder...")
-            self._encoder = VoiceEncoder()
+        from resemblyzer import preprocess_wav
+        self._ensure_encoder()
         samples, sr = _wav_to_array(wav_bytes)
         wav = preprocess_wav(samples, source_sr=sr)
         return self._encoder.embed_utterance(wav)
@@ -103,15 +174,25 @@ class SpeakerStore:
         if not os.path.exists(self.path):
             return
         try:
+            names, embeddings = [], []
             with open(self.path) as f:
-                for line in f:
+                for number, line in enumerate(f, 1):
                     line = line.strip()
                     if not line:
                         continue
-                    entry = json.loads(line)
-                    name = entry["name"]
-                    embedding = np.array(entry["embedding"], dtype=np.float32)
-                    self._profiles.setdefault(name, []).append(embedding)
-            logger.info(f"[Speaker] Loaded profiles for: {list(self._profiles)}")
+                    try:  # one bad line (e.g. a write cut short) costs that sample, not every profile
+                        entry = json.loads(line)
+                        embedding = np.asarray(entry["embedding"], dtype=np.float32)
+                        if embedding.ndim != 1 or (embeddings and embedding.shape != embeddings[0].shape):
+                            raise ValueError(f"embedding shape {embedding.shape}")
+                        name = str(entry["name"])
+                    except (ValueError, TypeError, KeyError) as e:
+                        logger.warning(f"[Speaker] Skipping line {number} of {self.path}: {e}")
+                        continue
+                    names.append(name)
+                    embeddings.append(embedding)
+            if names:
+                self._add(names, np.array(embeddings, dtype=np.float32))
+            logger.info(f"[Speaker] Loaded profiles for: {self._names}")
         except Exception as e:
             logger.error(f"[Speaker] Failed to load {self.path}: {e}")
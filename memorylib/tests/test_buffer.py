@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from memorylib.buffer import EmbeddingBuffer, MappedEmbeddingBuffer
+
+
+class TestEmbeddingBuffer:
+    def test_empty_view_is_none(self):
+        assert EmbeddingBuffer().view() is None
+
+    def test_append_returns_row_index(self):
+        buf = EmbeddingBuffer()
+        assert buf.append(np.ones(4)) == 0
+        assert buf.append(np.zeros(4)) == 1
+        assert len(buf) == 2
+
+    def test_view_matches_appended_rows(self):
+        buf = EmbeddingBuffer()
+        rows = np.arange(12, dtype=np.float32).reshape(3, 4)
+        for row in rows:
+            buf.append(row)
+        np.testing.assert_array_equal(buf.view(), rows)
+        assert buf.view().dtype == np.float32
+
+    def test_extend_block(self):
+        buf = EmbeddingBuffer()
+        buf.append(np.ones(4))
+        assert buf.extend(np.zeros((5, 4))) == 1
+        assert buf.view().shape == (6, 4)
+
+    def test_capacity_doubles(self):
+        buf = EmbeddingBuffer(dim=2)
+        capacities = set()
+        for i in range(1000):
+            buf.append(np.full(2, i))
+            capacities.add(buf.capacity)
+        assert sorted(capacities) == [64, 128, 256, 512, 1024]
+        assert buf.view()[-1, 0] == 999
+
+    def test_reserve_is_exact(self):
+        buf = EmbeddingBuffer(dim=2)
+        buf.reserve(1000)
+        assert buf.capacity == 1000
+        buf.extend(np.zeros((1000, 2)))
+        assert buf.capacity == 1000
+
+    def test_width_mismatch_raises(self):
+        buf = EmbeddingBuffer()
+        buf.append(np.ones(4))
+        with pytest.raises(ValueError):
+            buf.append(np.ones(3))
+
+    def test_clear(self):
+        buf = EmbeddingBuffer()
+        buf.append(np.ones(4))
+        buf.clear()
+        assert len(buf) == 0
+        assert buf.view() is None
+
+
+class TestMappedEmbeddingBuffer:
+    def test_missing_file_is_empty(self, tmp_path):
+        buf = MappedEmbeddingBuffer(str(tmp_path / "e.f32"))
+        assert len(buf) == 0
+        assert buf.view() is None
+
+    def test_rows_survive_reopen(self, tmp_path):
+        path = str(tmp_path / "e.f32")
+        buf = MappedEmbeddingBuffer(path)
+        rows = np.arange(400, dtype=np.float32).reshape(100, 4)
+        for row in rows:
+            buf.append(row)
+
+        reopened = MappedEmbeddingBuffer(path)
+        assert reopened.dim == 4
+        np.testing.assert_array_equal(reopened.view(), rows)
+
+    def test_append_after_reopen(self, tmp_path):
+        path = str(tmp_path / "e.f32")
+        MappedEmbeddingBuffer(path).append(np.ones(4))
+        buf = MappedEmbeddingBuffer(path)
+        assert buf.append(np.zeros(4)) == 1
+        assert len(MappedEmbeddingBuffer(path)) == 2
+
+    def test_truncate_persists(self, tmp_path):
+        path = str(tmp_path / "e.f32")
+        buf = MappedEmbeddingBuffer(path)
+        buf.extend(np.ones((3, 4)))
+        buf.truncate(1)
+        assert len(MappedEmbeddingBuffer(path)) == 1
+
+    def test_rejects_foreign_file(self, tmp_path):
+        path = tmp_path / "e.f32"
+        path.write_bytes(b"not a sidecar" * 4)
+        with pytest.raises(ValueError):
+            MappedEmbeddingBuffer(str(path))
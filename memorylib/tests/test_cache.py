@@ -0,0 +1,80 @@
+import numpy as np
+
+from memorylib import cache as cache_module
+from memorylib.cache import EmbeddingCache, normalize_text
+
+
+def test_normalize_text():
+    assert normalize_text("  Tell me\ta   JOKE ") == "tell me a joke"
+
+
+class TestEmbeddingCache:
+    def test_miss_then_hit(self):
+        cache = EmbeddingCache()
+        assert cache.get("hello") is None
+        cache.put("hello", np.ones(4, dtype=np.float32))
+        np.testing.assert_array_equal(cache.get("hello"), np.ones(4))
+        assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "hit_rate": 0.5}
+
+    def test_key_is_normalised(self):
+        cache = EmbeddingCache()
+        cache.put("Tell me a joke", np.ones(4))
+        assert cache.get("tell me  a joke ") is not None
+
+    def test_evicts_least_recently_used(self):
+        cache = EmbeddingCache(max_size=2)
+        cache.put("a", np.zeros(4))
+        cache.put("b", np.zeros(4))
+        cache.get("a")
+        cache.put("c", np.zeros(4))
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+
+    def test_zero_size_disables(self):
+        cache = EmbeddingCache(max_size=0)
+        cache.put("a", np.zeros(4))
+        assert cache.get("a") is None
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "cache.npz")
+        cache = EmbeddingCache(path=path)
+        for i in range(10):
+            cache.put(f"text {i}", np.full(4, i, dtype=np.float32))
+        cache.save()
+
+        reloaded = EmbeddingCache(path=path)
+        assert len(reloaded) == 10
+        np.testing.assert_array_equal(reloaded.get("text 7"), np.full(4, 7))
+
+    def test_autosaves_every_n_puts(self, tmp_path):
+        path = tmp_path / "cache.npz"
+        cache = EmbeddingCache(path=str(path), save_every=3)
+        cache.put("a", np.zeros(4))
+        cache.put("b", np.zeros(4))
+        assert not path.exists()
+        cache.put("c", np.zeros(4))
+        assert path.exists()
+
+    def test_saves_unsaved_entries_at_exit(self, tmp_path, monkeypatch):
+        hooks = []
+        monkeypatch.setattr(cache_module.atexit, "register", lambda fn, *args: hooks.append((fn, args)))
+        path = tmp_path / "cache.npz"
+        cache = EmbeddingCache(path=str(path))
+        cache.put("a", np.zeros(4))
+        for fn, args in hooks:
+            fn(*args)
+        assert len(EmbeddingCache(path=str(path))) == 1
+
+    def test_exit_hook_does_not_keep_cache_alive(self, tmp_path, monkeypatch):
+        hooks = []
+        monkeypatch.setattr(cache_module.atexit, "register", lambda fn, *args: hooks.append((fn, args)))
+        EmbeddingCache(path=str(tmp_path / "cache.npz")).put("a", np.zeros(4))
+        for fn, args in hooks:
+            fn(*args)  # the cache is gone; nothing to save
+        assert not (tmp_path / "cache.npz").exists()
+
+    def test_unreadable_file_ignored(self, tmp_path):
+        path = tmp_path / "cache.npz"
+        path.write_bytes(b"garbage")
+        assert len(EmbeddingCache(path=str(path))) == 0
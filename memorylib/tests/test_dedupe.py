@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from memorylib.dedupe import NearDuplicateFinder
+
+
+def _unit_rows(n, dim=16, seed=0):
+    m = np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+    return m / np.linalg.norm(m, axis=1, keepdims=True)
+
+
+def _nudge(vec, eps=0.01, seed=1):
+    v = vec + eps * np.random.default_rng(seed).standard_normal(len(vec)).astype(np.float32)
+    return v / np.linalg.norm(v)
+
+
+class TestNearDuplicateFinder:
+    def test_empty_matrix(self):
+        rows, scores = NearDuplicateFinder().find(None, _unit_rows(1)[0])
+        assert len(rows) == len(scores) == 0
+
+    def test_finds_recent_row(self):
+        m = _unit_rows(100)
+        rows, scores = NearDuplicateFinder(window=8).find(m, _nudge(m[97]))
+        assert rows[0] == 97
+        assert scores[0] >= 0.95
+
+    def test_finds_old_row_through_lsh_bucket(self):
+        m = _unit_rows(2000)
+        finder = NearDuplicateFinder(threshold=0.99, window=8)
+        rows, _ = finder.find(m, _nudge(m[10], eps=0.001))
+        assert rows.tolist() == [10]
+
+    def test_nothing_above_threshold(self):
+        m = _unit_rows(100)
+        rows, _ = NearDuplicateFinder().find(m, _unit_rows(1, seed=9)[0])
+        assert len(rows) == 0
+
+    def test_sync_tracks_appends_and_resets_on_shrink(self):
+        m = _unit_rows(100)
+        finder = NearDuplicateFinder()
+        finder.sync(m[:50])
+        finder.sync(m)
+        assert len(finder._signatures) == 100
+        finder.sync(m[:10])
+        assert len(finder._signatures) == 10
+
+    def test_rejects_wide_buckets(self):
+        with pytest.raises(ValueError):
+            NearDuplicateFinder(bits=9)
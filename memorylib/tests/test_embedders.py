@@ -0,0 +1,51 @@
+import functools
+
+import numpy as np
+
+from memorylib import EpisodicStore
+from memorylib.embedders import Embedder, mean_pool
+
+
+class TestMeanPool:
+    def test_ignores_padding(self):
+        hidden = np.array([[[1.0, 0.0], [3.0, 0.0], [100.0, 100.0]]], dtype=np.float32)
+        mask = np.array([[1, 1, 0]])
+        np.testing.assert_allclose(mean_pool(hidden, mask, normalize=False), [[2.0, 0.0]])
+
+    def test_normalizes(self):
+        hidden = np.random.default_rng(0).standard_normal((3, 5, 8)).astype(np.float32)
+        mask = np.ones((3, 5), dtype=np.int64)
+        pooled = mean_pool(hidden, mask)
+        assert pooled.dtype == np.float32
+        np.testing.assert_allclose(np.linalg.norm(pooled, axis=1), 1.0, rtol=1e-6)
+
+
+class _FixedEmbedder(Embedder):
+    def __init__(self, dim):
+        self.dim = dim
+
+    def encode(self, sentences, batch_size=32, normalize_embeddings=True):
+        if isinstance(sentences, str):
+            return np.full(self.dim, 1 / np.sqrt(self.dim), dtype=np.float32)
+        return np.stack([self.encode(s) for s in sentences])
+
+
+class TestEmbedderFactory:
+    def test_factory_called_lazily_once(self, tmp_path):
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return _FixedEmbedder(8)
+
+        store = EpisodicStore(path=str(tmp_path / "episodic.jsonl"), embedder=factory)
+        assert calls == []
+        store.store("hello")
+        store.search("hello")
+        assert calls == [1]
+        assert store._matrix.shape == (1, 8)
+
+    def test_partial_factory(self, tmp_path):
+        store = EpisodicStore(path=str(tmp_path / "episodic.jsonl"), embedder=functools.partial(_FixedEmbedder, 4))
+        store.store_many(["a", "b"])
+        assert store._matrix.shape == (2, 4)
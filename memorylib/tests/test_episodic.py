@@ -1,25 +1,36 @@
 import json
+from datetime import datetime, timezone
 
 import numpy as np
 import pytest
 
 from memorylib import EpisodicStore
+from memorylib.episodic import _Entry
 
 
-@pytest.fixture
-def store(tmp_path, monkeypatch):
-    """EpisodicStore with a deterministic stub model (no real sentence-transformers)."""
-    s = EpisodicStore(path=str(tmp_path / "episodic.jsonl"))
-
+def _stub_model():
     class _StubModel:
-        def encode(self, text, normalize_embeddings=False):
+        calls = 0
+
+        def encode(self, text, normalize_embeddings=False, batch_size=32):
             # Deterministic: hash text to a stable unit vector.
+            self.calls += 1
+            if isinstance(text, list):
+                return np.stack([self.encode(t) for t in text])
             seed = sum(ord(c) for c in text) % 256
             rng = np.random.default_rng(seed)
             v = rng.standard_normal(16).astype(np.float32)
             return v / np.linalg.norm(v)
 
-    s._model = _StubModel()
+    return _StubModel()
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """EpisodicStore with a deterministic stub model (no real sentence-transformers)."""
+    s = EpisodicStore(path=str(tmp_path / "episodic.jsonl"))
+
+    s._model = _stub_model()
     return s
 
 
@@ -35,7 +46,9 @@ class TestStore:
         with open(path) as f:
             entry = json.loads(f.readline())
         assert entry["text"] == "hello world"
-        assert "embedding" in entry
+        assert entry["row"] == 0
+        assert "embedding" not in entry
+        assert (tmp_path / "episodic.f32").exists()
 
     def test_store_with_metadata(self, store, tmp_path):
         store.store("hi", metadata={"speaker": "Kabir"})
@@ -49,6 +62,141 @@ class TestStore:
         assert len(store) == 2
 
 
+class TestStoreMany:
+    def test_stores_all_entries(self, store):
+        assert store.store_many([f"entry {i}" for i in range(10)]) == 10
+        assert len(store) == 10
+        assert store._matrix.shape == (10, 16)
+
+    def test_encodes_in_batches(self, store):
+        store.store_many([f"entry {i}" for i in range(10)], batch_size=4)
+        # 3 batch calls, each recursing once per text in the stub
+        assert store._model.calls == 3 + 10
+
+    def test_matches_single_store(self, store, tmp_path):
+        store.store_many(["cats", "trains"], [{"speaker": "Kabir"}, None])
+        other = EpisodicStore(path=str(tmp_path / "other.jsonl"))
+        other._model = _stub_model()
+        other.store("cats", {"speaker": "Kabir"})
+        other.store("trains")
+        np.testing.assert_allclose(store._matrix, other._matrix)
+        assert [e["metadata"] for e in store.all_entries() if "metadata" in e] == [{"speaker": "Kabir"}]
+
+    def test_persists_and_reloads(self, store, tmp_path):
+        store.store_many(["cats", "trains", "rain"])
+        lines = (tmp_path / "episodic.jsonl").read_text().splitlines()
+        assert [json.loads(line)["row"] for line in lines] == [0, 1, 2]
+        reloaded = EpisodicStore(path=str(tmp_path / "episodic.jsonl"))
+        reloaded._model = _stub_model()
+        assert reloaded.search("rain", top_k=1) == ["rain"]
+
+    def test_ids_are_unique_and_ordered(self, store):
+        store.store_many([f"entry {i}" for i in range(10)], batch_size=4)
+        ids = [e["id"] for e in store.all_entries()]
+        assert len(set(ids)) == 10
+        assert ids == sorted(ids)
+        assert store.search("entry 3", top_k=1, since=ids[0]) == ["entry 3"]
+
+    def test_metadata_length_mismatch_raises(self, store):
+        with pytest.raises(ValueError):
+            store.store_many(["a", "b"], [None])
+
+    def test_empty_is_noop(self, store):
+        assert store.store_many([]) == 0
+        assert len(store) == 0
+
+
+class TestEmbeddingCache:
+    def test_repeated_query_skips_model(self, store):
+        store.store("tell me a joke")
+        calls = store._model.calls
+        store.search("Tell me a joke")
+        store.search("tell me a joke")
+        assert store._model.calls == calls
+        assert store.cache.stats()["hits"] == 2
+
+    def test_store_many_encodes_only_misses(self, store):
+        store.store("cats")
+        calls = store._model.calls
+        store.store_many(["cats", "dogs"])
+        assert store._model.calls == calls + 2  # one batch call + one stub recursion for "dogs"
+
+    def test_persist_cache(self, tmp_path):
+        path = str(tmp_path / "episodic.jsonl")
+        s1 = EpisodicStore(path=path, persist_cache=True)
+        s1._model = _stub_model()
+        s1.store("hello")
+        s1.cache.save()
+
+        s2 = EpisodicStore(path=path, persist_cache=True)
+        assert s2.cache.get("hello") is not None
+
+
+class TestWarmUp:
+    def test_concurrent_loads_share_one_model(self, tmp_path):
+        import threading
+        import time
+        loaded = []
+
+        def slow_factory():
+            time.sleep(0.05)
+            loaded.append(1)
+            return _stub_model()
+
+        s = EpisodicStore(path=str(tmp_path / "episodic.jsonl"), embedder=slow_factory)
+        assert not s.ready
+        warm = threading.Thread(target=s.warm_up)
+        warm.start()
+        s.store("hello")
+        warm.join()
+        assert loaded == [1]
+        assert s.ready
+
+
+class TestConcurrency:
+    def test_concurrent_store_and_search(self, tmp_path):
+        from concurrent.futures import ThreadPoolExecutor
+        path = tmp_path / "episodic.jsonl"
+        s = EpisodicStore(path=str(path), dedupe=0.999)
+        s._model = _stub_model()
+        threads, turns = 6, 200
+
+        def session(i):
+            for t in range(turns):
+                s.store(f"session {i} turn {t}", metadata={"speaker": f"speaker{i}"})
+                if t % 20 == 0:
+                    s.search(f"turn {t}", mode="vector", speaker=f"speaker{i}")
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(session, range(threads)))
+        stats = s.dedupe_stats()
+        assert len(s) == stats["stored"] == len(s._matrix)
+        assert stats["stored"] + stats["suppressed"] == threads * turns
+        assert sorted(s._row_entries.view()[:, 0].tolist()) == list(range(len(s)))
+
+        reopened = EpisodicStore(path=str(path))
+        assert len(reopened) == len(s)
+        assert reopened._matrix.shape == s._matrix.shape
+
+
+class TestAllEntries:
+    def test_returns_dicts_without_embeddings(self, store):
+        store.store("hi", metadata={"speaker": "Kabir"})
+        entries = store.all_entries()
+        assert entries == [{"id": entries[0]["id"], "text": "hi", "metadata": {"speaker": "Kabir"}, "row": 0}]
+
+    def test_include_embeddings_reads_sidecar(self, store):
+        store.store("hi")
+        entry = store.all_entries(include_embeddings=True)[0]
+        np.testing.assert_allclose(entry["embedding"], store._embed("hi"), rtol=1e-6)
+
+    def test_entries_hold_no_vector(self, store):
+        store.store("hi")
+        entry = store._entries[0]
+        assert not hasattr(entry, "__dict__")
+        assert entry.row == 0
+
+
 class TestSearch:
     def test_search_empty_returns_empty(self, store):
         assert store.search("anything") == []
@@ -65,12 +213,169 @@ class TestSearch:
         results = store.search("entry", top_k=3)
         assert len(results) == 3
 
+    def test_matrix_tracks_stored_rows(self, store):
+        for i in range(100):
+            store.store(f"entry {i}")
+        assert store._matrix.shape == (100, 16)
+        np.testing.assert_allclose(store._matrix[-1], store._embed("entry 99"))
+
     def test_search_top_k_larger_than_entries(self, store):
         store.store("only one")
         results = store.search("one", top_k=10)
         assert len(results) == 1
 
 
+class TestSearchModes:
+    def test_rejects_unknown_mode(self, store):
+        store.store("hello")
+        with pytest.raises(ValueError):
+            store.search("hello", mode="fuzzy")
+
+    def test_lexical_finds_exact_name(self, store):
+        for i in range(10):
+            store.store(f"User: tell me about space {i} Robot: stars are far away")
+        store.store("User: my dog is called Biscuit Robot: what a lovely name")
+        assert store.search("Biscuit", top_k=1, mode="lexical") == [
+            "User: my dog is called Biscuit Robot: what a lovely name"
+        ]
+
+    def test_hybrid_ranks_exact_name_first(self, store):
+        for i in range(10):
+            store.store(f"User: tell me about space {i} Robot: stars are far away")
+        store.store("User: my dog is called Biscuit Robot: what a lovely name")
+        assert store.search("Biscuit the dog", top_k=3)[0].endswith("what a lovely name")
+
+    def test_vector_mode_matches_index(self, store):
+        for i in range(5):
+            store.store(f"entry {i}")
+        assert store.search("entry 3", top_k=1, mode="vector") == ["entry 3"]
+
+    def test_hybrid_without_model_skips_embedder(self, tmp_path):
+        s = EpisodicStore(path=str(tmp_path / "episodic.jsonl"))
+        s._model = _stub_model()
+        s.store("User: Biscuit chased a ball")
+        s.store("User: we read a book")
+        reopened = EpisodicStore(path=str(tmp_path / "episodic.jsonl"), embedder=lambda: pytest.fail("model loaded"))
+        assert reopened.search("biscuit", top_k=2) == ["User: Biscuit chased a ball"]
+        assert not reopened.ready
+
+    def test_lexical_index_tracks_new_entries(self, store):
+        store.store("first entry")
+        store.search("first", mode="lexical")
+        store.store("Biscuit entry")
+        assert store.search("biscuit", top_k=1, mode="lexical") == ["Biscuit entry"]
+
+    def test_entry_without_row_is_found_lexically(self, store):
+        class _NanModel:
+            def encode(self, text, **kw):
+                return np.full(16, np.nan, dtype=np.float32)
+        store._model = _NanModel()
+        store.store("Biscuit")
+        assert store.search("biscuit", mode="lexical") == ["Biscuit"]
+        assert store.search("biscuit", mode="vector") == []
+
+
+class TestFilters:
+    @pytest.fixture
+    def filled(self, store):
+        store._add([_Entry("2026-01-01T09:00:00", "Kabir: old dinosaur chat", {"speaker": "Kabir"}),
+                    _Entry("2026-03-01T09:00:00", "Mama: dinosaur bedtime story", {"speaker": "Mama"}),
+                    _Entry("2026-03-02T09:00:00", "Kabir: new dinosaur chat", {"speaker": "Kabir"}),
+                    _Entry("2026-03-03T09:00:00", "unattributed dinosaur chat")],
+                   np.stack([store._embed(t) for t in ("dinosaur",) * 4]))
+        return store
+
+    @pytest.mark.parametrize("mode", ["vector", "lexical", "hybrid"])
+    def test_speaker(self, filled, mode):
+        results = filled.search("dinosaur", top_k=5, mode=mode, speaker="Kabir")
+        assert sorted(results) == ["Kabir: new dinosaur chat", "Kabir: old dinosaur chat"]
+
+    def test_unknown_speaker_returns_nothing(self, filled):
+        assert filled.search("dinosaur", speaker="Nobody") == []
+
+    @pytest.mark.parametrize("mode", ["vector", "lexical", "hybrid"])
+    def test_since(self, filled, mode):
+        results = filled.search("dinosaur", top_k=5, mode=mode, since="2026-03-02")
+        assert sorted(results) == ["Kabir: new dinosaur chat", "unattributed dinosaur chat"]
+
+    def test_since_accepts_datetime(self, filled):
+        from datetime import datetime
+        results = filled.search("dinosaur", top_k=5, since=datetime(2026, 3, 2), speaker="Kabir")
+        assert results == ["Kabir: new dinosaur chat"]
+
+    @pytest.mark.parametrize("since", [
+        "2026-03-02T03:31:00+00:00", "2026-03-02T03:31:00Z",
+        datetime(2026, 3, 2, 3, 31, tzinfo=timezone.utc),
+    ])
+    def test_since_timezone_aware_is_local_time(self, filled, monkeypatch, since):
+        import time
+        import warnings
+        monkeypatch.setenv("TZ", "Asia/Kolkata")  # UTC+05:30: 03:31Z is 09:01 local, just after the 09:00 entry
+        time.tzset()
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                results = filled.search("dinosaur", top_k=5, since=since)
+        finally:
+            monkeypatch.undo()
+            time.tzset()
+        assert results == ["unattributed dinosaur chat"]
+
+    @pytest.mark.parametrize("mode", ["vector", "lexical", "hybrid"])
+    def test_recency_ranks_newest_first(self, filled, mode):
+        from datetime import timedelta
+        results = filled.search("dinosaur", top_k=4, mode=mode, recency_half_life=timedelta(days=7))
+        assert results[0] == "unattributed dinosaur chat"
+        assert results[-1] == "Kabir: old dinosaur chat"
+
+    def test_recency_rejects_non_positive_half_life(self, filled):
+        with pytest.raises(ValueError):
+            filled.search("dinosaur", recency_half_life=0)
+
+    def test_filters_survive_reload(self, filled, tmp_path):
+        reopened = EpisodicStore(path=str(tmp_path / "episodic.jsonl"))
+        reopened._model = _stub_model()
+        assert reopened.search("dinosaur", top_k=5, mode="vector", speaker="Mama") == [
+            "Mama: dinosaur bedtime story"
+        ]
+
+    def test_store_tracks_speaker(self, store):
+        store.store("hello there", metadata={"speaker": "Dada"})
+        store.store("hello again")
+        assert store.search("hello", top_k=5, speaker="Dada") == ["hello there"]
+
+
+class TestDiversity:
+    @pytest.fixture
+    def repetitive(self, store):
+        q = store._embed("dinosaur")
+        a, b = np.linalg.qr(np.column_stack([q, np.eye(16, dtype=np.float32)[:, :2]]))[0][:, 1:].T
+        copy = 0.8 * q + 0.6 * a
+        texts = ["dinosaur copy 1", "dinosaur copy 2", "dinosaur copy 3", "dinosaur bones"]
+        vectors = np.stack([copy, copy, copy, 0.7 * q + np.sqrt(0.51) * b]).astype(np.float32)
+        store._add([_Entry(f"2026-03-0{i + 1}T09:00:00", t) for i, t in enumerate(texts)], vectors)
+        return store
+
+    def test_without_diversity_copies_fill_top_k(self, repetitive):
+        assert sorted(repetitive.search("dinosaur", top_k=3, mode="vector")) == [
+            "dinosaur copy 1", "dinosaur copy 2", "dinosaur copy 3",
+        ]
+
+    @pytest.mark.parametrize("mode", ["vector", "lexical", "hybrid"])
+    def test_diversity_promotes_distinct_turn(self, repetitive, mode):
+        results = repetitive.search("dinosaur", top_k=2, mode=mode, diversity=0.5)
+        assert "dinosaur bones" in results
+        assert len(results) == 2
+
+    def test_zero_diversity_keeps_relevance_order(self, repetitive):
+        assert repetitive.search("dinosaur", top_k=3, mode="vector", diversity=0.0) == \
+            repetitive.search("dinosaur", top_k=3, mode="vector")
+
+    def test_rejects_out_of_range(self, repetitive):
+        with pytest.raises(ValueError):
+            repetitive.search("dinosaur", diversity=1.5)
+
+
 class TestPersistence:
     def test_reloads_indexed_entries(self, tmp_path):
         path = str(tmp_path / "episodic.jsonl")
@@ -90,3 +395,287 @@ class TestPersistence:
         s2 = EpisodicStore(path=path)
         assert len(s2) == 1
         assert s2._matrix is not None
+
+    def test_reload_maps_sidecar_rows(self, tmp_path):
+        path = str(tmp_path / "episodic.jsonl")
+        s1 = EpisodicStore(path=path)
+        s1._model = _stub_model()
+        for text in ("cats", "trains", "rain"):
+            s1.store(text)
+
+        s2 = EpisodicStore(path=path)
+        s2._model = _stub_model()
+        np.testing.assert_array_equal(s2._matrix, s1._matrix)
+        assert s2.search("trains", top_k=1) == ["trains"]
+
+    def test_trailing_row_without_entry_is_dropped(self, tmp_path):
+        path = tmp_path / "episodic.jsonl"
+        s1 = EpisodicStore(path=str(path))
+        s1._model = _stub_model()
+        s1.store("kept")
+        s1.store("lost")
+        # Simulate a crash between the sidecar append and the log append.
+        path.write_text(path.read_text().splitlines()[0] + "\n")
+
+        s2 = EpisodicStore(path=str(path))
+        assert len(s2) == 1
+        assert s2._matrix.shape[0] == 1
+
+    def test_stale_sidecar_without_log_is_cleared(self, tmp_path):
+        s1 = EpisodicStore(path=str(tmp_path / "episodic.jsonl"))
+        s1._model = _stub_model()
+        s1.store("hello")
+        (tmp_path / "episodic.jsonl").unlink()
+
+        s2 = EpisodicStore(path=str(tmp_path / "episodic.jsonl"))
+        assert s2._matrix is None
+        assert not (tmp_path / "episodic.f32").exists()
+
+
+class TestCompaction:
+    def _fill(self, store, texts, metas=None):
+        metas = metas or [None] * len(texts)
+        store._add([_Entry(f"2026-03-01T09:00:{i:02d}", t, m) for i, (t, m) in enumerate(zip(texts, metas))],
+                   np.stack([store._embed(t) for t in texts]))
+
+    def test_drops_rows_without_embedding(self, store):
+        class _NanModel:
+            def encode(self, text, **kw):
+                return np.full(16, np.nan, dtype=np.float32)
+        store.store("kept")
+        store._model = _NanModel()
+        store.store("broken")
+        stats = store.compact()
+        assert stats["dropped"] == 1
+        assert [e["text"] for e in store.all_entries()] == ["kept"]
+
+    def test_merges_exact_duplicates(self, store):
+        self._fill(store, ["Tell me a joke", "cats", "tell me  a JOKE", "tell me a joke"])
+        stats = store.compact()
+        assert stats == {"entries": 4, "dropped": 0, "merged": 2, "kept": 2, "segments": 1}
+        joke = store.all_entries()[0]
+        assert joke["text"] == "Tell me a joke"
+        assert joke["metadata"] == {"count": 3, "last_seen": "2026-03-01T09:00:03"}
+
+    def test_merges_near_duplicates_within_window(self, store):
+        base = store._embed("dinosaurs")
+        near = base + 0.01
+        store._add([_Entry("2026-03-01T09:00:00", "dinosaurs!"), _Entry("2026-03-01T09:00:01", "dinosaurs?")],
+                   np.stack([base, near / np.linalg.norm(near)]))
+        assert store.compact(dedupe_threshold=0.99)["merged"] == 1
+
+    def test_near_duplicates_outside_window_are_kept(self, store):
+        base = store._embed("dinosaurs")
+        fillers = [f"filler {i}" for i in range(5)]
+        store._add([_Entry("a", "dinosaurs!")] + [_Entry("b", t) for t in fillers] + [_Entry("c", "dinosaurs?")],
+                   np.stack([base] + [store._embed(t) for t in fillers] + [base]))
+        assert store.compact(window=3)["merged"] == 0
+
+    def test_different_speakers_not_merged(self, store):
+        self._fill(store, ["hello", "hello"], [{"speaker": "Kabir"}, {"speaker": "Mama"}])
+        assert store.compact()["merged"] == 0
+
+    def test_writes_segments_and_manifest(self, store, tmp_path):
+        self._fill(store, [f"entry {i}" for i in range(5)])
+        stats = store.compact(segment_size=2)
+        assert stats["segments"] == 3
+        manifest = json.loads((tmp_path / "episodic.manifest.json").read_text())
+        assert manifest["generation"] == 1
+        assert manifest["segments"] == ["episodic.g1.seg0000.jsonl", "episodic.g1.seg0001.jsonl",
+                                        "episodic.g1.seg0002.jsonl"]
+        assert not (tmp_path / "episodic.jsonl").exists()
+        assert not (tmp_path / "episodic.f32").exists()
+
+    def test_search_and_append_after_compaction(self, store, tmp_path):
+        self._fill(store, ["cats", "trains", "cats"])
+        store.compact()
+        assert store.search("trains", top_k=1, mode="vector") == ["trains"]
+        store.store("rain")
+        assert (tmp_path / "episodic.g1.jsonl").exists()
+
+        reopened = EpisodicStore(path=str(tmp_path / "episodic.jsonl"))
+        reopened._model = _stub_model()
+        assert [e["text"] for e in reopened.all_entries()] == ["cats", "trains", "rain"]
+        assert reopened.search("rain", top_k=1, mode="vector") == ["rain"]
+
+    def test_repeated_compaction_removes_old_generation(self, store, tmp_path):
+        self._fill(store, ["cats", "cats"])
+        store.compact()
+        store.store("dogs")
+        store.compact()
+        names = sorted(p.name for p in tmp_path.iterdir())
+        assert names == ["episodic.g2.f32", "episodic.g2.seg0000.jsonl", "episodic.manifest.json"]
+        assert [e["metadata"].get("count") if e.get("metadata") else None for e in store.all_entries()] == [2, None]
+
+    def test_interrupted_compaction_keeps_old_store(self, store, tmp_path):
+        self._fill(store, ["cats", "trains"])
+        (tmp_path / "episodic.g1.seg0000.jsonl").write_text('{"id": "x", "text": "half-written"}\n')
+        reopened = EpisodicStore(path=str(tmp_path / "episodic.jsonl"))
+        assert [e["text"] for e in reopened.all_entries()] == ["cats", "trains"]
+        reopened.compact()
+        assert [e["text"] for e in reopened.all_entries()] == ["cats", "trains"]
+
+    def test_merged_entry_dated_by_last_seen(self, store):
+        self._fill(store, ["hello", "other", "hello"])
+        store.compact()
+        assert store.search("hello", top_k=2, mode="vector", since="2026-03-01T09:00:02") == ["hello"]
+
+    def test_cli_rejects_missing_store(self, tmp_path, monkeypatch, capsys):
+        from memorylib import episodic_cli
+        monkeypatch.setattr("sys.argv", ["compact-episodic", "--path", str(tmp_path / "nowhere" / "episodic.jsonl")])
+        with pytest.raises(SystemExit) as exc:
+            episodic_cli.main()
+        assert exc.value.code == 2
+        assert "no episodic store at" in capsys.readouterr().err
+
+    def test_cli_compacts_a_compacted_store(self, store, tmp_path, monkeypatch, capsys):
+        from memorylib import episodic_cli
+        self._fill(store, ["cats", "cats", "trains"])
+        store.compact()
+        assert not (tmp_path / "episodic.jsonl").exists()
+        monkeypatch.setattr("sys.argv", ["compact-episodic", "--path", str(tmp_path / "episodic.jsonl")])
+        episodic_cli.main()
+        assert "Kept 2 entries" in capsys.readouterr().out
+
+
+class TestDedupe:
+    @pytest.fixture
+    def deduped(self, tmp_path):
+        s = EpisodicStore(path=str(tmp_path / "episodic.jsonl"), dedupe=0.95)
+        s._model = _stub_model()
+        return s
+
+    def test_off_by_default(self, store):
+        store.store("again! again!")
+        store.store("again! again!")
+        assert len(store) == 2
+
+    def test_repeat_bumps_count_instead_of_storing(self, deduped):
+        deduped.store("again! again!")
+        deduped.store("again! again!")
+        deduped.store("Again!  again!")
+        assert len(deduped) == 1
+        assert deduped._matrix.shape == (1, 16)
+        assert deduped.all_entries()[0]["metadata"]["count"] == 3
+        assert deduped.dedupe_stats() == {"stored": 1, "suppressed": 2, "suppression_rate": 2 / 3}
+
+    def test_different_turns_are_stored(self, deduped):
+        deduped.store("cats")
+        deduped.store("trains")
+        assert len(deduped) == 2
+        assert deduped.dedupe_stats()["suppression_rate"] == 0.0
+
+    def test_other_speaker_is_not_merged(self, deduped):
+        deduped.store("hello", metadata={"speaker": "Kabir"})
+        deduped.store("hello", metadata={"speaker": "Mama"})
+        deduped.store("hello")
+        assert len(deduped) == 3
+
+    def test_merge_survives_reload(self, deduped, tmp_path):
+        deduped.store("again!")
+        deduped.store("again!")
+        lines = [json.loads(line) for line in (tmp_path / "episodic.jsonl").read_text().splitlines()]
+        assert lines[1]["merge"] == 0 and lines[1]["count"] == 2
+
+        reopened = EpisodicStore(path=str(tmp_path / "episodic.jsonl"))
+        entry = reopened.all_entries()[0]
+        assert entry["metadata"]["count"] == 2
+        assert entry["metadata"]["last_seen"] == lines[1]["last_seen"]
+
+    def test_store_many_merges_repeats(self, deduped):
+        deduped.store("again!")
+        stored = deduped.store_many(["again!", "cats", "cats", "cats", "trains"], batch_size=3)
+        assert stored == 2
+        assert [(e["text"], (e.get("metadata") or {}).get("count")) for e in deduped.all_entries()] == [
+            ("again!", 2), ("cats", 3), ("trains", None),
+        ]
+        assert deduped._matrix.shape == (3, 16)
+        assert deduped.dedupe_stats() == {"stored": 3, "suppressed": 3, "suppression_rate": 0.5}
+
+    def test_compaction_folds_merge_counts(self, deduped, tmp_path):
+        deduped.store("again!")
+        deduped.store("again!")
+        deduped.store("other")
+        deduped.compact()
+        assert deduped.all_entries()[0]["metadata"]["count"] == 2
+        deduped.store("again!")
+        assert deduped.all_entries()[0]["metadata"]["count"] == 3
+
+
+class TestMigration:
+    def _write_legacy(self, path, texts):
+        model = _stub_model()
+        with open(path, "w") as f:
+            for text in texts:
+                entry = {"id": "2025-01-01T00:00:00", "text": text, "embedding": model.encode(text).tolist()}
+                f.write(json.dumps(entry) + "\n")
+
+    def test_inline_embeddings_move_to_sidecar(self, tmp_path):
+        path = tmp_path / "episodic.jsonl"
+        self._write_legacy(path, ["cats", "trains"])
+
+        s = EpisodicStore(path=str(path))
+        s._model = _stub_model()
+        assert s._matrix.shape == (2, 16)
+        assert s.search("cats", top_k=1) == ["cats"]
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [e["row"] for e in lines] == [0, 1]
+        assert all("embedding" not in e for e in lines)
+
+    def test_migration_is_one_time(self, tmp_path):
+        path = tmp_path / "episodic.jsonl"
+        self._write_legacy(path, ["cats"])
+        EpisodicStore(path=str(path))
+        migrated = path.read_text()
+
+        s = EpisodicStore(path=str(path))
+        assert path.read_text() == migrated
+        assert s._matrix.shape == (1, 16)
+
+    def test_nan_embedding_kept_unindexed(self, tmp_path):
+        path = tmp_path / "episodic.jsonl"
+        self._write_legacy(path, ["good"])
+        with open(path, "a") as f:
+            f.write(json.dumps({"id": "x", "text": "bad", "embedding": [float("nan")] * 16}) + "\n")
+
+        s = EpisodicStore(path=str(path))
+        s._model = _stub_model()
+        assert len(s) == 2
+        assert s._matrix.shape == (1, 16)
+        assert s.search("anything", top_k=5) == ["good"]
+
+
+class TestIndexBackend:
+    def test_ivf_backend_search(self, tmp_path):
+        from memorylib.index import IVFIndex
+
+        s = EpisodicStore(path=str(tmp_path / "episodic.jsonl"), index=IVFIndex(nlist=2, nprobe=2, min_train=8))
+        s._model = _stub_model()
+        for i in range(20):
+            s.store(f"entry {i}")
+        assert s.search("entry 3", top_k=1) == ["entry 3"]
+
+    def test_ivf_state_persisted_next_to_log(self, tmp_path):
+        from memorylib.index import IVFIndex
+
+        path = str(tmp_path / "episodic.jsonl")
+        s1 = EpisodicStore(path=path, index=IVFIndex(nlist=2, min_train=8))
+        s1._model = _stub_model()
+        for i in range(20):
+            s1.store(f"entry {i}")
+
+        s2 = EpisodicStore(path=path, index=IVFIndex(nlist=2, min_train=8))
+        assert (tmp_path / "episodic.index.npz").exists()
+        assert len(s2._index) == 20
+
+    def test_quantized_backend_codes_written_through(self, tmp_path):
+        path = str(tmp_path / "episodic.jsonl")
+        s1 = EpisodicStore(path=path, index="int8")
+        s1._model = _stub_model()
+        for i in range(10):
+            s1.store(f"entry {i}")
+        assert s1.search("entry 4", top_k=1) == ["entry 4"]
+
+        s2 = EpisodicStore(path=path, index="int8")
+        assert (tmp_path / "episodic.index.i8").exists()
+        assert len(s2._index) == 10
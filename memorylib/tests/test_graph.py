@@ -1,6 +1,15 @@
+import contextlib
+import gc
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import kuzu
 import pytest
 
 from memorylib import GraphStore
+from memorylib.graph import migrate_graph
 
 
 @pytest.fixture
@@ -70,6 +79,309 @@ class TestRelation:
         assert len(graph.all_relations()) == 2
 
 
+class TestTypedProps:
+    def test_typed_keys_round_trip_with_types(self, graph):
+        graph.upsert_entities([("Kabir", "person"), ("dinosaurs", "topic")])
+        graph.upsert_relation("Kabir", "likes", "dinosaurs", {
+            "weight": 1, "count": "3", "source": "profile",
+            "first_seen": "2026-03-01T09:00:00+02:00", "last_seen": datetime(2026, 3, 2, 10, 30),
+            "intensity": "high", "tags": ["t-rex", {"big": True}],
+        })
+        props = graph.all_relations()[0]["props"]
+        assert props == {
+            "weight": 1.0, "first_seen": datetime(2026, 3, 1, 7, 0), "last_seen": datetime(2026, 3, 2, 10, 30),
+            "count": 3, "source": "profile", "intensity": "high", "tags": ["t-rex", {"big": True}],
+        }
+        assert graph.get_neighbors("Kabir")[0][3] == props
+
+    def test_bad_typed_value_raises(self, graph):
+        graph.upsert_entities([("Kabir", "person"), ("dinosaurs", "topic")])
+        with pytest.raises(ValueError):
+            graph.upsert_relation("Kabir", "likes", "dinosaurs", {"weight": "lots"})
+        with pytest.raises(ValueError):
+            graph.upsert_relations([("Kabir", "likes", "dinosaurs", {"last_seen": "yesterday"})])
+
+    def test_batch_mixes_typed_and_untyped_rows(self, graph):
+        graph.upsert_entities([("Kabir", "person"), ("a", "topic"), ("b", "topic")])
+        graph.upsert_relations([("Kabir", "likes", "a"), ("Kabir", "likes", "b", {"weight": 0.5, "mood": "happy"})])
+        assert {r["to"]: r["props"] for r in graph.all_relations()} == {"a": {}, "b": {"weight": 0.5, "mood": "happy"}}
+
+
+@pytest.fixture
+def weighted(tmp_path, request):
+    graph = GraphStore(str(tmp_path / "weighted.db"), mirror=request.param)
+    graph.upsert_entities([("Kabir", "person")] + [(f"topic{i}", "topic") for i in range(4)])
+    graph.upsert_relations([
+        ("Kabir", "likes", "topic0", {"weight": 0.9, "count": 5, "source": "profile", "last_seen": "2026-03-05"}),
+        ("Kabir", "likes", "topic1", {"weight": 0.2, "count": 1, "source": "reflect", "last_seen": "2026-01-01"}),
+        ("Kabir", "visited", "topic2", {"weight": 0.6, "source": "reflect"}),
+        ("topic3", "about", "Kabir"),
+    ])
+    return graph
+
+
+@pytest.mark.parametrize("weighted", [False, True], ids=["kuzu", "mirror"], indirect=True)
+class TestEdgeFilters:
+    def _names(self, rows):
+        return sorted(row[0] for row in rows)
+
+    def test_get_neighbors_filters(self, weighted):
+        assert self._names(weighted.get_neighbors("Kabir", min_weight=0.5)) == ["topic0", "topic2"]
+        assert self._names(weighted.get_neighbors("Kabir", min_count=2)) == ["topic0"]
+        assert self._names(weighted.get_neighbors("Kabir", source="reflect")) == ["topic1", "topic2"]
+        assert self._names(weighted.get_neighbors("Kabir", seen_since="2026-02-01")) == ["topic0"]
+        assert self._names(weighted.get_neighbors("Kabir", "likes", min_weight=0.5, source="profile")) == ["topic0"]
+        assert weighted.get_neighbors("Kabir", direction="in", min_weight=0) == []
+
+    def test_all_relations_filters(self, weighted):
+        assert [r["to"] for r in weighted.all_relations(source="reflect", min_weight=0.5)] == ["topic2"]
+        assert len(weighted.all_relations()) == 4
+
+
+class TestMigrate:
+    EXPECTED = {
+        "has_pet": {"weight": 2.0, "last_seen": datetime(2026, 3, 1), "since": 2024},
+        "likes": {"weight": "lots"},
+        "visited": {"last_seen": "last week"},
+        "named": {},
+    }
+
+    @staticmethod
+    def _legacy(tmp_path) -> str:
+        path = str(tmp_path / "legacy.db")
+        conn = kuzu.Connection(kuzu.Database(path))
+        conn.execute("CREATE NODE TABLE Entity(name STRING, type STRING, PRIMARY KEY(name))")
+        conn.execute("CREATE REL TABLE Relation(FROM Entity TO Entity, rel_type STRING, props STRING)")
+        conn.execute("CREATE (:Entity {name: 'Kabir', type: 'person'}), (:Entity {name: 'Jetty', type: 'animal'})")
+        for rel, props in [("has_pet", '{"weight": 2, "last_seen": "2026-03-01", "since": 2024}'),
+                           ("likes", '{"weight": "lots"}'), ("visited", '{"last_seen": "last week"}'),
+                           ("named", "")]:
+            conn.execute("MATCH (a:Entity {name: 'Kabir'}), (b:Entity {name: 'Jetty'}) "
+                         "CREATE (a)-[:Relation {rel_type: $rel, props: $props}]->(b)", {"rel": rel, "props": props})
+        del conn
+        gc.collect()
+        return path
+
+    def test_converts_json_props(self, tmp_path):
+        path = self._legacy(tmp_path)
+        assert migrate_graph(path) == {"migrated": True, "relations": 4, "with_extras": 3}
+        assert migrate_graph(path)["migrated"] is False
+        props = {r["rel_type"]: r["props"] for r in GraphStore(path).all_relations()}
+        assert props == self.EXPECTED
+
+    def test_open_migrates_legacy_database(self, tmp_path):
+        graph = GraphStore(self._legacy(tmp_path))
+        assert {r["rel_type"]: r["props"] for r in graph.all_relations()} == self.EXPECTED
+        graph.upsert_relation("Kabir", "likes", "Jetty", {"weight": 3})
+        assert graph.get_neighbors("Kabir", rel_type="likes", min_weight=2) == [["Jetty", "animal", "likes", {"weight": 3.0}]]
+
+    @pytest.mark.parametrize("mirror", [False, True])
+    def test_filters_ignore_uncoercible_legacy_values(self, tmp_path, mirror):
+        graph = GraphStore(self._legacy(tmp_path), mirror=mirror)
+        assert [row[2] for row in graph.get_neighbors("Kabir", min_weight=0.5)] == ["has_pet"]
+        assert [row[2] for row in graph.get_neighbors("Kabir", seen_since="2026-02-01")] == ["has_pet"]
+        assert graph.all_relations(min_weight=5) == []
+        assert graph.all_relations(seen_since="2026-04-01") == []
+
+    def test_missing_path(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            migrate_graph(str(tmp_path / "nothing.db"))
+
+
+class TestBatchUpsert:
+    def test_upsert_entities(self, graph):
+        assert graph.upsert_entities([("Kabir", "person"), ("Jetty", "animal")]) == 2
+        assert graph.get_entity("Jetty") == {"name": "Jetty", "type": "animal"}
+
+    def test_later_rows_win(self, graph):
+        graph.upsert_entities([("Jetty", "unknown"), ("Jetty", "animal")])
+        assert graph.all_entities() == [{"name": "Jetty", "type": "animal"}]
+
+    def test_none_type_keeps_existing(self, graph):
+        graph.upsert_entity("Kabir", "person")
+        graph.upsert_entities([("Kabir", None), ("trucks", None)])
+        assert graph.get_entity("Kabir")["type"] == "person"
+        assert graph.get_entity("trucks")["type"] == "entity"
+
+    def test_empty_batches(self, graph):
+        assert graph.upsert_entities([]) == 0
+        assert graph.upsert_relations([]) == 0
+
+    def test_upsert_relations(self, graph):
+        graph.upsert_entities([("Kabir", "person"), ("Jetty", "animal"), ("dinosaurs", "topic")])
+        graph.upsert_relations([
+            ("Kabir", "has_pet", "Jetty"),
+            ("Kabir", "likes", "dinosaurs", {"intensity": "low"}),
+            ("Kabir", "likes", "dinosaurs", {"intensity": "high"}),
+        ])
+        relations = {(r["from"], r["rel_type"], r["to"]): r["props"] for r in graph.all_relations()}
+        assert relations == {
+            ("Kabir", "has_pet", "Jetty"): {},
+            ("Kabir", "likes", "dinosaurs"): {"intensity": "high"},
+        }
+
+    def test_relation_to_missing_entity_is_skipped(self, graph):
+        graph.upsert_entity("Kabir", "person")
+        graph.upsert_relations([("Kabir", "likes", "Nobody")])
+        assert graph.all_relations() == []
+
+
+class TestTransaction:
+    def test_commits_on_exit(self, graph):
+        with graph.transaction():
+            graph.upsert_entities([("Kabir", "person"), ("Jetty", "animal")])
+            graph.upsert_relation("Kabir", "has_pet", "Jetty")
+            assert graph.get_entity("Jetty") is not None  # reads see the open transaction
+        assert len(graph.all_relations()) == 1
+
+    def test_rolls_back_on_error(self, graph):
+        graph.upsert_entity("Kabir", "person")
+        with pytest.raises(KeyError):
+            with graph.transaction():
+                graph.upsert_entity("Jetty", "animal")
+                graph.upsert_relation("Kabir", "has_pet", "Jetty")
+                raise KeyError("boom")
+        assert graph.get_entity("Jetty") is None
+        assert graph.all_relations() == []
+
+    def test_failed_statement_rolls_back(self, graph):
+        with pytest.raises(RuntimeError):
+            with graph.transaction():
+                graph.upsert_entity("Kabir", "person")
+                graph.query("CREATE (:Entity {name: 'Kabir', type: 'person'})")  # duplicate key
+        assert graph.get_entity("Kabir") is None
+        graph.upsert_entity("Jetty", "animal")  # connection is usable again
+        assert graph.get_entity("Jetty") is not None
+
+    def test_nested_blocks_join_outer(self, graph):
+        with pytest.raises(KeyError):
+            with graph.transaction():
+                with graph.transaction():
+                    graph.upsert_entity("Kabir", "person")
+                assert graph.get_entity("Kabir") is not None
+                raise KeyError("boom")
+        assert graph.get_entity("Kabir") is None
+
+    def test_sequential_transactions(self, graph):
+        for name in ("Kabir", "Jetty"):
+            with graph.transaction():
+                graph.upsert_entity(name, "person")
+        assert len(graph.all_entities()) == 2
+
+
+class TestGeneration:
+    def test_writes_bump_generation(self, graph):
+        start = graph.generation
+        graph.upsert_entity("Kabir", "person")
+        graph.upsert_entities([("Jetty", "animal")])
+        graph.upsert_relation("Kabir", "has_pet", "Jetty")
+        graph.upsert_relations([("Kabir", "likes", "Jetty")])
+        assert graph.generation == start + 4
+
+    def test_reads_and_empty_batches_do_not(self, graph):
+        graph.upsert_entity("Kabir", "person")
+        start = graph.generation
+        graph.get_neighbors("Kabir")
+        graph.all_entities()
+        graph.upsert_entities([])
+        assert graph.generation == start
+
+    def test_rollback_bumps_generation(self, graph):
+        start = graph.generation
+        with pytest.raises(KeyError):
+            with graph.transaction():
+                raise KeyError("boom")
+        assert graph.generation > start
+
+    @pytest.mark.parametrize("mirror", [False, True])
+    def test_commit_moves_generation_past_concurrent_reads(self, tmp_path, mirror):
+        graph = GraphStore(path=str(tmp_path / "test.db"), mirror=mirror)
+        graph.upsert_entities([("Kabir", "person"), ("Jetty", "animal")])
+        inside, read = threading.Event(), threading.Event()
+        seen = []
+
+        def writer():
+            with graph.transaction():
+                graph.upsert_relation("Kabir", "has_pet", "Jetty")
+                inside.set()
+                read.wait(5)
+
+        def reader():
+            inside.wait(5)
+            seen.append((graph.generation, graph.get_neighbors("Kabir")))
+            read.set()
+
+        threads = [threading.Thread(target=writer), threading.Thread(target=reader)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+        generation, neighbors = seen[0]
+        assert graph.get_neighbors("Kabir") == [["Jetty", "animal", "has_pet", {}]]
+        # A cache keyed on the generation read alongside the pre-commit state must not stay valid.
+        assert graph.generation != generation or neighbors == graph.get_neighbors("Kabir")
+
+
+class TestConcurrency:
+    def test_threads_get_their_own_connection(self, graph):
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            barrier = threading.Barrier(4)
+
+            def conn_id(_):
+                barrier.wait()
+                return id(graph._conn)
+
+            ids = set(pool.map(conn_id, range(4)))
+        assert len(ids) == 4
+        assert id(graph._conn) not in ids
+
+    def test_concurrent_sessions(self, graph):
+        sessions, turns = 8, 20
+        graph.upsert_entity("Kabir", "person")
+
+        def session(i):
+            for t in range(turns):
+                name = f"topic{i}_{t}"
+                with graph.transaction():
+                    graph.upsert_entities([(name, "topic")])
+                    graph.upsert_relation("Kabir", f"likes_{i}", name)
+                graph.get_neighbors("Kabir", rel_type=f"likes_{i}")
+                graph.query("MATCH (e:Entity) RETURN count(e)")
+            return len(graph.get_neighbors("Kabir", rel_type=f"likes_{i}"))
+
+        with ThreadPoolExecutor(max_workers=sessions) as pool:
+            counts = list(pool.map(session, range(sessions)))
+        assert counts == [turns] * sessions
+        assert len(graph.all_relations()) == sessions * turns
+
+    def test_writes_wait_for_open_transaction(self, graph):
+        inside, release = threading.Event(), threading.Event()
+        order = []
+
+        def long_transaction():
+            with graph.transaction():
+                graph.upsert_entity("Kabir", "person")
+                inside.set()
+                release.wait(5)
+                order.append("commit")
+
+        def writer():
+            inside.wait(5)
+            graph.upsert_entity("Jetty", "animal")
+            order.append("write")
+
+        threads = [threading.Thread(target=long_transaction), threading.Thread(target=writer)]
+        for t in threads:
+            t.start()
+        inside.wait(5)
+        assert graph.get_entity("Jetty") is None  # reads are not blocked
+        release.set()
+        for t in threads:
+            t.join(5)
+        assert order == ["commit", "write"]
+        assert len(graph.all_entities()) == 2
+
+
 class TestGetNeighbors:
     @pytest.fixture(autouse=True)
     def _setup(self, graph):
@@ -100,9 +412,209 @@ class TestGetNeighbors:
         assert self.graph.get_neighbors("Isolated") == []
 
 
+@pytest.fixture
+def pets(graph):
+    graph.upsert_entities([(n, "entity") for n in ("Kabir", "Mama", "Jetty", "Tom", "fish", "cat", "dinosaurs")])
+    graph.upsert_relations([
+        ("Mama", "parent_of", "Kabir"), ("Kabir", "has_pet", "Jetty"), ("Kabir", "has_pet", "Tom"),
+        ("Kabir", "likes", "dinosaurs"), ("Jetty", "pet_type", "fish"), ("Tom", "species", "cat"),
+        ("Tom", "likes", "fish"),
+    ])
+    return graph
+
+
+class TestExpand:
+    def test_one_hop_is_outgoing_edges(self, pets):
+        assert set(pets.expand("Kabir", hops=1)) == {
+            ("Kabir", "has_pet", "Jetty"), ("Kabir", "has_pet", "Tom"), ("Kabir", "likes", "dinosaurs"),
+        }
+
+    def test_two_hops_nearest_first(self, pets):
+        edges = pets.expand("Kabir", hops=2)
+        assert len(edges) == 6
+        assert {src for src, _, _ in edges[:3]} == {"Kabir"}
+        assert set(edges[3:]) == {("Jetty", "pet_type", "fish"), ("Tom", "species", "cat"), ("Tom", "likes", "fish")}
+
+    def test_rel_types_filter_the_walk(self, pets):
+        edges = pets.expand("Kabir", hops=3, rel_types=["has_pet", "species"])
+        assert set(edges) == {("Kabir", "has_pet", "Jetty"), ("Kabir", "has_pet", "Tom"), ("Tom", "species", "cat")}
+
+    def test_directions(self, pets):
+        assert pets.expand("Kabir", hops=3, direction="in") == [("Mama", "parent_of", "Kabir")]
+        edges = pets.expand("fish", hops=2, direction="both")
+        assert set(edges) == {("Jetty", "pet_type", "fish"), ("Tom", "likes", "fish"),
+                              ("Kabir", "has_pet", "Jetty"), ("Kabir", "has_pet", "Tom"), ("Tom", "species", "cat")}
+
+    def test_limit_and_unknown_start(self, pets):
+        assert pets.expand("Kabir", hops=2, limit=2) == pets.expand("Kabir", hops=2)[:2]
+        assert pets.expand("nobody") == []
+        with pytest.raises(ValueError):
+            pets.expand("Kabir", hops=0)
+
+    def test_mirror_walks_the_same_edges_in_the_same_order(self, pets, tmp_path):
+        mirrored = GraphStore(str(tmp_path / "mirror.db"), mirror=True)
+        mirrored.upsert_entities([(e["name"], e["type"]) for e in pets.all_entities()])
+        mirrored.upsert_relations([(r["from"], r["rel_type"], r["to"]) for r in reversed(pets.all_relations())])
+        for args in ({"hops": 2}, {"hops": 3, "direction": "both"}, {"hops": 2, "rel_types": ["has_pet", "pet_type"]}):
+            assert mirrored.expand("Kabir", **args) == pets.expand("Kabir", **args)
+        assert mirrored.get_neighbors("Kabir") == pets.get_neighbors("Kabir")
+        assert [row[0] for row in pets.get_neighbors("Kabir")] == ["Jetty", "Tom", "dinosaurs"]
+
+
+@pytest.fixture
+def family(graph):
+    graph.upsert_entities([("Kabir", "person"), ("Jetty", "animal"), ('O\'Neil, "Nan"\nof Leeds', "person")])
+    graph.upsert_relation("Kabir", "has_pet", "Jetty", {"since": 2024, "note": 'named, "Jetty"\nby Mira'})
+    graph.upsert_relation('O\'Neil, "Nan"\nof Leeds', "grandparent_of", "Kabir")
+    return graph
+
+
+class TestBulk:
+    @pytest.mark.parametrize("format", ["parquet", "csv"])
+    def test_round_trip_into_empty_store(self, family, tmp_path, format):
+        paths = family.export(str(tmp_path / "export"), format=format)
+        assert sorted(os.path.basename(p) for p in paths.values()) == [f"entities.{format}", f"relations.{format}"]
+        fresh = GraphStore(str(tmp_path / "fresh.db"))
+        assert fresh.import_(str(tmp_path / "export")) == {"entities": 3, "relations": 2}
+        assert fresh.all_entities() == family.all_entities()
+        assert fresh.all_relations() == family.all_relations()
+
+    def test_import_merges_into_existing_rows(self, family, tmp_path):
+        family.export(str(tmp_path / "export"))
+        other = GraphStore(str(tmp_path / "other.db"), mirror=True)
+        other.upsert_entities([("Kabir", "child"), ("Mira", "person")])
+        other.upsert_relation("Kabir", "has_pet", "Mira", {"old": True})
+        start = other.generation
+        assert other.import_(str(tmp_path / "export")) == {"entities": 3, "relations": 2}
+        assert other.generation > start
+        assert other.get_entity("Kabir") == {"name": "Kabir", "type": "person"}
+        assert len(other.all_entities()) == 4
+        assert {(r["from"], r["to"]) for r in other.all_relations()} == {
+            ("Kabir", "Jetty"), ("Kabir", "Mira"), ('O\'Neil, "Nan"\nof Leeds', "Kabir"),
+        }
+        mirrored = other.get_neighbors("Kabir", rel_type="has_pet")
+        assert len(mirrored) == 2
+        with _unmirrored(other) as kuzu:
+            assert sorted(mirrored) == sorted(kuzu.get_neighbors("Kabir", rel_type="has_pet"))
+
+    def test_import_twice_is_idempotent(self, family, tmp_path):
+        family.export(str(tmp_path / "export"), format="csv")
+        fresh = GraphStore(str(tmp_path / "fresh.db"))
+        fresh.import_(str(tmp_path / "export"))
+        fresh.import_(str(tmp_path / "export"))
+        assert fresh.all_relations() == family.all_relations()
+
+    def test_errors(self, family, tmp_path):
+        with pytest.raises(ValueError):
+            family.export(str(tmp_path / "export"), format="json")
+        with pytest.raises(FileNotFoundError):
+            family.import_(str(tmp_path))
+
+
+@pytest.fixture
+def mirrored(tmp_path):
+    graph = GraphStore(str(tmp_path / "mirror.db"), mirror=True)
+    graph.upsert_entities([("Kabir", "person"), ("Dada", "person"), ("Jetty", "animal"), ("fish", None)])
+    graph.upsert_relation("Kabir", "has_pet", "Jetty", {"since": 2024})
+    graph.upsert_relations([("Kabir", "likes", "fish"), ("Dada", "parent_of", "Kabir"), ("Jetty", "pet_type", "fish")])
+    return graph
+
+
+@contextlib.contextmanager
+def _unmirrored(graph):
+    """The same store with reads going straight to Kuzu."""
+    mirror, graph._mirror = graph._mirror, None
+    try:
+        yield graph
+    finally:
+        graph._mirror = mirror
+
+
+class TestMirror:
+    @pytest.mark.parametrize("name,rel_type,direction", [
+        ("Kabir", None, "out"), ("Kabir", "has_pet", "out"), ("Kabir", None, "in"),
+        ("fish", None, "in"), ("Jetty", None, "both"), ("Kabir", "likes", "both"), ("nobody", None, "out"),
+    ])
+    def test_neighbors_match_kuzu(self, mirrored, name, rel_type, direction):
+        rows = mirrored.get_neighbors(name, rel_type=rel_type, direction=direction)
+        with _unmirrored(mirrored) as kuzu:
+            assert rows == kuzu.get_neighbors(name, rel_type=rel_type, direction=direction)
+
+    def test_listings_match_kuzu(self, mirrored):
+        entities, relations, fish = mirrored.all_entities(), mirrored.all_relations(), mirrored.get_entity("fish")
+        with _unmirrored(mirrored) as kuzu:
+            assert entities == kuzu.all_entities()
+            assert relations == kuzu.all_relations()
+            assert fish == kuzu.get_entity("fish") == {"name": "fish", "type": "entity"}
+        assert mirrored.get_entity("nobody") is None
+
+    def test_write_through(self, mirrored):
+        mirrored.upsert_entity("fish", "value")
+        mirrored.upsert_relation("Kabir", "has_pet", "Jetty", {"since": 2025})
+        mirrored.upsert_entities([("Jetty", None)])
+        assert mirrored.get_entity("fish")["type"] == "value"
+        assert mirrored.get_entity("Jetty")["type"] == "animal"
+        assert mirrored.get_neighbors("Kabir", rel_type="has_pet") == [["Jetty", "animal", "has_pet", {"since": 2025}]]
+
+    def test_missing_endpoint_is_skipped(self, mirrored):
+        mirrored.upsert_relation("Kabir", "likes", "ghost")
+        assert mirrored.get_neighbors("Kabir", rel_type="likes") == [["fish", "entity", "likes", {}]]
+        relations = mirrored.all_relations()
+        with _unmirrored(mirrored) as kuzu:
+            assert relations == kuzu.all_relations()
+
+    def test_rollback_reloads_mirror(self, mirrored):
+        with pytest.raises(KeyError):
+            with mirrored.transaction():
+                mirrored.upsert_entity("Mira", "person")
+                mirrored.upsert_relation("Mira", "sibling_of", "Kabir")
+                raise KeyError("boom")
+        assert mirrored.get_entity("Mira") is None
+        assert mirrored.get_neighbors("Kabir", direction="in") == [["Dada", "person", "parent_of", {}]]
+
+    def test_loaded_at_open(self, tmp_path):
+        graph = GraphStore(str(tmp_path / "reopen.db"))
+        graph.upsert_entities([("Kabir", "person"), ("Jetty", "animal")])
+        graph.upsert_relation("Kabir", "has_pet", "Jetty")
+        relations = graph.all_relations()
+        del graph
+        gc.collect()  # release the database before reopening it
+        reopened = GraphStore(str(tmp_path / "reopen.db"), mirror=True)
+        assert reopened._mirror is not None
+        assert reopened.all_relations() == relations
+        assert reopened.get_neighbors("Jetty", direction="in") == [["Kabir", "person", "has_pet", {}]]
+
+
 class TestQuery:
     def test_raw_cypher_query(self, graph):
         graph.upsert_entity("Kabir", "person")
         graph.upsert_entity("Dada", "person")
         result = graph.query("MATCH (e:Entity {type: $type}) RETURN e.name ORDER BY e.name", {"type": "person"})
         assert [row[0] for row in result] == ["Dada", "Kabir"]
+
+    def test_repeated_query_reuses_prepared_statement(self, graph):
+        graph.upsert_entity("Kabir", "person")
+        cypher = "MATCH (e:Entity {name: $name}) RETURN e.type"
+        assert graph.query(cypher, {"name": "Kabir"}) == [["person"]]
+        statement = graph._local.query_cache[cypher]
+        assert graph.query(cypher, {"name": "Nobody"}) == []
+        assert graph._local.query_cache[cypher] is statement
+
+    def test_query_cache_is_bounded_lru(self, graph, monkeypatch):
+        monkeypatch.setattr("memorylib.graph._QUERY_CACHE_SIZE", 2)
+        graph.query("RETURN 1")
+        graph.query("RETURN 2")
+        graph.query("RETURN 1")
+        graph.query("RETURN 3")
+        assert list(graph._local.query_cache) == ["RETURN 1", "RETURN 3"]
+
+    def test_invalid_query_raises_and_is_not_cached(self, graph):
+        with pytest.raises(RuntimeError):
+            graph.query("MATCH (e:Nope) RETURN e")
+        assert "MATCH (e:Nope) RETURN e" not in graph._local.query_cache
+
+    def test_methods_prepare_each_statement_once(self, graph):
+        for _ in range(3):
+            graph.upsert_entity("Kabir", "person")
+            graph.get_neighbors("Kabir", rel_type="likes")
+        assert len(graph._local.statements) == 2
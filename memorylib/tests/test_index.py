@@ -0,0 +1,202 @@
+import numpy as np
+import pytest
+
+from memorylib.index import BinaryIndex, ExactIndex, Int8Index, IVFIndex, make_index
+
+
+def _unit_rows(n, dim=16, seed=0):
+    m = np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+    return m / np.linalg.norm(m, axis=1, keepdims=True)
+
+
+class TestMakeIndex:
+    def test_by_name(self):
+        assert isinstance(make_index("exact"), ExactIndex)
+        assert isinstance(make_index("ivf"), IVFIndex)
+
+    def test_instance_passes_through(self):
+        index = IVFIndex(nprobe=2)
+        assert make_index(index) is index
+
+    def test_unknown_name_raises(self):
+        with pytest.raises(ValueError):
+            make_index("annoy")
+
+
+class TestExactIndex:
+    def test_returns_best_first(self):
+        m = _unit_rows(50)
+        index = ExactIndex()
+        index.sync(m)
+        rows, scores = index.search(m, m[7], k=3)
+        assert rows[0] == 7
+        assert list(scores) == sorted(scores, reverse=True)
+
+    def test_exclude(self):
+        m = _unit_rows(5)
+        index = ExactIndex()
+        index.sync(m)
+        rows, _ = index.search(m, m[2], k=5, exclude=[2])
+        assert 2 not in rows
+        assert len(rows) == 4
+
+    def test_mask(self):
+        m = _unit_rows(50)
+        index = ExactIndex()
+        index.sync(m)
+        mask = np.arange(50) % 2 == 1
+        rows, scores = index.search(m, m[8], k=5, mask=mask)
+        assert len(rows) == 5
+        assert all(r % 2 == 1 for r in rows)
+        np.testing.assert_allclose(scores, m[rows] @ m[8])
+
+    def test_mask_with_fewer_rows_than_k(self):
+        m = _unit_rows(20)
+        index = ExactIndex()
+        index.sync(m)
+        mask = np.zeros(20, dtype=bool)
+        mask[[3, 11]] = True
+        rows, _ = index.search(m, m[0], k=5, mask=mask)
+        assert sorted(rows) == [3, 11]
+
+
+class TestIVFIndex:
+    def test_exact_until_trained(self):
+        m = _unit_rows(10)
+        index = IVFIndex(min_train=100)
+        index.sync(m)
+        rows, _ = index.search(m, m[3], k=1)
+        assert rows[0] == 3
+
+    def test_full_probe_matches_exact(self):
+        m = _unit_rows(400)
+        ivf = IVFIndex(nlist=8, nprobe=8, min_train=64)
+        ivf.sync(m)
+        q = _unit_rows(1, seed=1)[0]
+        exact_rows, _ = ExactIndex._exact(m, q, 10, ())
+        ivf_rows, _ = ivf.search(m, q, k=10)
+        np.testing.assert_array_equal(ivf_rows, exact_rows)
+
+    def test_incremental_inserts_are_searchable(self):
+        m = _unit_rows(300)
+        ivf = IVFIndex(nlist=4, nprobe=1, min_train=64, retrain_factor=100)
+        ivf.sync(m[:100])
+        for n in range(101, 301):
+            ivf.sync(m[:n])
+        assert len(ivf) == 300
+        rows, _ = ivf.search(m, m[250], k=1)
+        assert rows[0] == 250
+
+    def test_exclude(self):
+        m = _unit_rows(200)
+        ivf = IVFIndex(nlist=4, nprobe=4, min_train=64)
+        ivf.sync(m)
+        rows, _ = ivf.search(m, m[9], k=3, exclude=[9])
+        assert 9 not in rows
+
+    def test_mask_filters_probed_rows(self):
+        m = _unit_rows(400)
+        ivf = IVFIndex(nlist=8, nprobe=8, min_train=64)
+        ivf.sync(m)
+        mask = np.arange(400) < 300
+        rows, _ = ivf.search(m, m[350], k=10, mask=mask)
+        exact_rows, _ = ExactIndex._exact(m, m[350], 10, (), mask)
+        np.testing.assert_array_equal(rows, exact_rows)
+
+    def test_selective_mask_is_answered_exactly(self):
+        m = _unit_rows(400)
+        ivf = IVFIndex(nlist=8, nprobe=1, min_train=64)
+        ivf.sync(m)
+        mask = np.zeros(400, dtype=bool)
+        mask[::50] = True
+        q = _unit_rows(1, seed=5)[0]
+        rows, _ = ivf.search(m, q, k=8, mask=mask)
+        assert sorted(rows) == list(range(0, 400, 50))
+
+    def test_save_and_load(self, tmp_path):
+        m = _unit_rows(200)
+        path = str(tmp_path / "index.npz")
+        ivf = IVFIndex(nlist=4, nprobe=1, min_train=64)
+        ivf.sync(m)
+        ivf.save(path)
+
+        restored = IVFIndex(nlist=4, nprobe=1, min_train=64)
+        restored.load(path)
+        assert len(restored) == 200
+        q = m[42]
+        np.testing.assert_array_equal(restored.search(m, q, k=5)[0], ivf.search(m, q, k=5)[0])
+
+    def test_shrunk_matrix_resets(self):
+        m = _unit_rows(200)
+        ivf = IVFIndex(nlist=4, min_train=64)
+        ivf.sync(m)
+        ivf.sync(m[:10])
+        assert len(ivf) == 10
+        assert ivf.search(m[:10], m[3], k=1)[0][0] == 3
+
+
+@pytest.mark.parametrize("cls", [Int8Index, BinaryIndex])
+class TestQuantizedIndex:
+    def test_finds_exact_match(self, cls):
+        m = _unit_rows(500)
+        index = cls()
+        index.sync(m)
+        rows, scores = index.search(m, m[123], k=3)
+        assert rows[0] == 123
+        assert scores[0] == pytest.approx(1.0, abs=1e-5)
+
+    def test_scores_are_float_reranked(self, cls):
+        m = _unit_rows(500)
+        index = cls(rerank=1000)
+        index.sync(m)
+        q = _unit_rows(1, seed=3)[0]
+        rows, scores = index.search(m, q, k=5)
+        exact_rows, exact_scores = ExactIndex._exact(m, q, 5, ())
+        np.testing.assert_array_equal(rows, exact_rows)
+        np.testing.assert_allclose(scores, exact_scores)
+
+    def test_codes_are_smaller_than_floats(self, cls):
+        m = _unit_rows(100, dim=64)
+        index = cls()
+        index.sync(m)
+        assert index.nbytes <= m.nbytes // 4
+
+    def test_exclude(self, cls):
+        m = _unit_rows(50)
+        index = cls()
+        index.sync(m)
+        rows, _ = index.search(m, m[4], k=50, exclude=[4])
+        assert 4 not in rows
+        assert len(rows) == 49
+
+    def test_mask(self, cls):
+        m = _unit_rows(500)
+        index = cls(rerank=1000)
+        index.sync(m)
+        mask = np.arange(500) >= 250
+        q = _unit_rows(1, seed=4)[0]
+        rows, _ = index.search(m, q, k=5, mask=mask)
+        exact_rows, _ = ExactIndex._exact(m, q, 5, (), mask)
+        np.testing.assert_array_equal(rows, exact_rows)
+
+    def test_mask_prefilters_coarse_scan(self, cls):
+        m = _unit_rows(500)
+        index = cls(rerank=1, min_candidates=8)
+        index.sync(m)
+        mask = np.arange(500) % 5 == 0
+        rows, _ = index.search(m, m[100], k=3, mask=mask)
+        assert rows[0] == 100
+        assert all(r % 5 == 0 for r in rows)
+
+    def test_codes_persist_across_load(self, cls, tmp_path):
+        m = _unit_rows(100)
+        path = str(tmp_path / "episodic.index.npz")
+        index = cls()
+        index.load(path)
+        index.sync(m)
+        index.save(path)
+
+        restored = cls()
+        restored.load(path)
+        assert len(restored) == 100
+        assert restored.search(m, m[10], k=1)[0][0] == 10
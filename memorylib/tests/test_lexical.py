@@ -0,0 +1,59 @@
+import numpy as np
+
+from memorylib.lexical import BM25Index, tokenize
+
+
+def test_tokenize_casefolds_and_drops_punctuation():
+    assert tokenize("Biscuit the DOG! isn't") == ["biscuit", "the", "dog", "isn", "t"]
+
+
+class TestBM25Index:
+    def test_add_returns_doc_numbers(self):
+        index = BM25Index()
+        assert index.add("first") == 0
+        assert index.add("second") == 1
+        assert len(index) == 2
+
+    def test_only_matching_docs_returned(self):
+        index = BM25Index()
+        index.add("the cat sat")
+        index.add("the dog ran")
+        docs, scores = index.search("dog", k=5)
+        assert docs.tolist() == [1]
+        assert scores[0] > 0
+
+    def test_rare_term_outranks_common_term(self):
+        index = BM25Index()
+        for i in range(20):
+            index.add(f"we talked about the weather {i}")
+        index.add("we talked about Biscuit")
+        docs, _ = index.search("talked about Biscuit", k=3)
+        assert docs[0] == 20
+
+    def test_shorter_doc_wins_on_equal_tf(self):
+        index = BM25Index()
+        index.add("dinosaur " + "filler " * 20)
+        index.add("dinosaur facts")
+        docs, _ = index.search("dinosaur", k=2)
+        assert docs.tolist() == [1, 0]
+
+    def test_respects_k(self):
+        index = BM25Index()
+        for i in range(10):
+            index.add(f"entry {i}")
+        docs, scores = index.search("entry", k=3)
+        assert len(docs) == len(scores) == 3
+
+    def test_mask_drops_documents(self):
+        index = BM25Index()
+        index.add("dog one")
+        index.add("dog two")
+        docs, _ = index.search("dog", k=5, mask=np.array([False, True]))
+        assert docs.tolist() == [1]
+
+    def test_no_match_or_empty(self):
+        index = BM25Index()
+        assert len(index.search("anything", k=3)[0]) == 0
+        index.add("hello")
+        assert len(index.search("goodbye", k=3)[0]) == 0
+        assert len(index.search("", k=3)[0]) == 0
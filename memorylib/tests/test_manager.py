@@ -1,20 +1,20 @@
 import numpy as np
 import pytest
 
-from memorylib import MemoryManager
+from memorylib import MemoryManager, Reflector
+
+
+class _StubModel:
+    def encode(self, text, normalize_embeddings=False):
+        seed = sum(ord(c) for c in text) % 256
+        rng = np.random.default_rng(seed)
+        v = rng.standard_normal(16).astype(np.float32)
+        return v / np.linalg.norm(v)
 
 
 @pytest.fixture
 def mgr(tmp_path):
     m = MemoryManager(base_dir=str(tmp_path))
-
-    class _StubModel:
-        def encode(self, text, normalize_embeddings=False):
-            seed = sum(ord(c) for c in text) % 256
-            rng = np.random.default_rng(seed)
-            v = rng.standard_normal(16).astype(np.float32)
-            return v / np.linalg.norm(v)
-
     m.episodic._model = _StubModel()
     return m
 
@@ -53,6 +53,13 @@ class TestBuildContext:
         ctx = mgr.build_context("Alice", query="cats")
         assert "cats" in ctx.lower()
 
+    def test_episodes_are_diverse(self, mgr):
+        for _ in range(3):
+            mgr.record_exchange("I love cats", "Cats are great!")
+        mgr.record_exchange("Do cats sleep a lot?", "Yes, cats nap most of the day")
+        ctx = mgr.build_context("Alice", query="cats")
+        assert "cats nap" in ctx
+
 
 class TestRecordExchange:
     def test_increments_episodic_count(self, mgr):
@@ -122,3 +129,98 @@ class TestSpeakerIntegration:
         log = (tmp_path / "recordings" / "log.jsonl").read_text()
         entry = json.loads(log.strip())
         assert "speaker_name" not in entry
+
+
+class TestEpisodicDedupe:
+    def test_option_reaches_store(self, tmp_path):
+        m = MemoryManager(base_dir=str(tmp_path), episodic_dedupe=0.95)
+        m.episodic._model = _StubModel()
+        m.record_exchange("again!", "again!")
+        m.record_exchange("again!", "again!")
+        assert len(m.episodic) == 1
+        assert m.episodic.dedupe_stats()["suppressed"] == 1
+
+
+class TestPersistCache:
+    def test_close_saves_the_embedding_cache(self, tmp_path):
+        m = MemoryManager(base_dir=str(tmp_path), persist_cache=True)
+        m.episodic._model = _StubModel()
+        m.record_exchange("tell me a joke", "why did the chicken...")
+        assert not (tmp_path / "episodic.cache.npz").exists()  # fewer than save_every new entries
+        m.close()
+        reopened = MemoryManager(base_dir=str(tmp_path), persist_cache=True)
+        assert len(reopened.episodic.cache) == 1
+
+
+class TestWarmUp:
+    def test_loads_episodic_model_in_background(self, tmp_path):
+        loaded = []
+        m = MemoryManager(base_dir=str(tmp_path), embedder=lambda: loaded.append(1) or object())
+        futures = m.warm_up()
+        assert set(futures) == {"episodic"}
+        futures["episodic"].result(timeout=5)
+        assert loaded == [1]
+        assert m.episodic.ready
+        assert m.ready("episodic")
+
+    def test_second_call_does_not_reload(self, tmp_path):
+        loaded = []
+        m = MemoryManager(base_dir=str(tmp_path), embedder=lambda: loaded.append(1) or object())
+        m.warm_up()["episodic"].result(timeout=5)
+        m.warm_up()["episodic"].result(timeout=5)
+        assert loaded == [1]
+
+    def test_failed_load_is_kept_in_future(self, tmp_path):
+        def broken():
+            raise RuntimeError("no model")
+        m = MemoryManager(base_dir=str(tmp_path), embedder=broken)
+        future = m.warm_up()["episodic"]
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
+        assert not m.episodic.ready
+        assert m.ready("episodic")  # warm-up finished; the store falls back to lazy loading
+
+    def test_not_ready_while_warming(self, tmp_path):
+        import threading
+        release = threading.Event()
+        m = MemoryManager(base_dir=str(tmp_path), embedder=lambda: release.wait(5) and object())
+        future = m.warm_up()["episodic"]
+        assert not m.ready("episodic")
+        release.set()
+        future.result(timeout=5)
+        assert m.ready("episodic")
+
+    def test_ready_without_warm_up(self, mgr):
+        assert mgr.ready("episodic")
+
+    def test_missing_store_is_not_ready(self, mgr):
+        assert not mgr.ready("speaker")
+        assert not mgr.ready("face")
+
+    def test_includes_speaker_store(self, tmp_path, monkeypatch):
+        (tmp_path / "speakers.jsonl").write_text("")
+        m = MemoryManager(base_dir=str(tmp_path), embedder=object)
+        monkeypatch.setattr(m.speaker, "_ensure_encoder", lambda: setattr(m.speaker, "_encoder", object()))
+        futures = m.warm_up()
+        assert set(futures) == {"episodic", "speaker"}
+        futures["speaker"].result(timeout=5)
+        assert m.speaker.ready
+
+
+class TestReflector:
+    def test_mine_episodic_writes_triples(self, mgr):
+        mgr.remember("Kabir", "likes", "cats", subject_type="person")
+        mgr.record_exchange("I like trucks", "Trucks are loud!")
+        mgr.record_exchange("I like trains", "Choo choo!")
+
+        def extract(text):
+            return [("Kabir", "likes", text.split()[3])]
+
+        assert Reflector(mgr).mine_episodic(extract, batch_size=1) == 2
+        assert {r[0] for r in mgr.recall("Kabir", relation="likes")} == {"cats", "trucks", "trains"}
+        assert mgr.graph.get_entity("Kabir")["type"] == "person"
+        assert mgr.graph.get_entity("trains")["type"] == "entity"
+
+    def test_extractor_errors_are_skipped(self, mgr):
+        mgr.record_exchange("hello", "hi")
+        assert Reflector(mgr).mine_episodic(lambda text: 1 / 0) == 0
@@ -82,6 +82,17 @@ class TestEnroll:
         assert "Kabir" in s2.speakers()
         assert s2.sample_count("Kabir") == 1
 
+    def test_load_skips_malformed_lines(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "speakers.json")
+        _enroll_vectors(SpeakerStore(path=path), monkeypatch, [("Kabir", _unit([1, 0, 0])), ("Dada", _unit([0, 1, 0]))])
+        with open(path, "a") as f:
+            f.write('{"name": "Mama", "embedding": [0.0, 0.0, 1.0]}\n{"name": "Mira", "embed\n')
+            f.write('{"name": "Nani", "embedding": [1.0, 0.0]}\n{"embedding": [1.0, 0.0, 0.0]}\n')
+            f.write('{"name": "Kabir", "embedding": [0.8, 0.6, 0.0]}\n')
+        store = SpeakerStore(path=path)
+        assert store.speakers() == ["Kabir", "Dada", "Mama"]
+        assert store.sample_count("Kabir") == 2
+
     def test_sample_count(self, store):
         assert store.sample_count("Kabir") == 0
         store.enroll("Kabir", _make_wav(440))
@@ -122,6 +133,60 @@ class TestIdentify:
         assert store.identify(wav, threshold=1.1) is None
 
 
+# ---------------------------------------------------------------------------
+# Scoring
+# ---------------------------------------------------------------------------
+
+def _unit(v) -> np.ndarray:
+    v = np.asarray(v, dtype=np.float32)
+    return v / np.linalg.norm(v)
+
+
+def _enroll_vectors(store, monkeypatch, samples) -> None:
+    for name, vector in samples:
+        monkeypatch.setattr(store, "_embed", lambda _, v=vector: v)
+        store.enroll(name, b"")
+
+
+class TestScoring:
+    def test_max_uses_best_sample(self, store, monkeypatch):
+        # Kabir's mean points away from the query, but one sample matches it.
+        _enroll_vectors(store, monkeypatch, [
+            ("Kabir", _unit([1, 0, 0])), ("Dada", _unit([0.6, 0.8, 0])),
+            ("Kabir", _unit([0, 0, 1])), ("Kabir", _unit([0, 0, 1])),
+        ])
+        monkeypatch.setattr(store, "_embed", lambda _: _unit([1, 0, 0]))
+        assert store.identify(b"", threshold=0.5) == "Kabir"
+
+    def test_centroid_uses_mean(self, tmp_path, monkeypatch):
+        store = SpeakerStore(path=str(tmp_path / "speakers.json"), scoring="centroid")
+        _enroll_vectors(store, monkeypatch, [
+            ("Kabir", _unit([1, 0, 0])), ("Dada", _unit([0.6, 0.8, 0])),
+            ("Kabir", _unit([0, 0, 1])), ("Kabir", _unit([0, 0, 1])),
+        ])
+        monkeypatch.setattr(store, "_embed", lambda _: _unit([1, 0, 0]))
+        assert store.identify(b"", threshold=0.5) == "Dada"
+
+    def test_modes_agree_after_reload(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "speakers.json")
+        rng = np.random.default_rng(0)
+        voices = {name: rng.standard_normal(256) for name in ("Kabir", "Dada", "Mama")}
+        samples = [(name, _unit(voices[name] + 0.3 * rng.standard_normal(256)))
+                   for name, n in (("Kabir", 3), ("Dada", 2), ("Mama", 1)) for _ in range(n)]
+        _enroll_vectors(SpeakerStore(path=path), monkeypatch, samples)
+        for scoring in ("max", "centroid"):
+            store = SpeakerStore(path=path, scoring=scoring)
+            assert store.speakers() == ["Kabir", "Dada", "Mama"]
+            assert store.sample_count("Dada") == 2
+            for name, voice in voices.items():
+                monkeypatch.setattr(store, "_embed", lambda _, v=voice: _unit(v))
+                assert store.identify(b"", threshold=0.5) == name
+
+    def test_unknown_scoring_raises(self, tmp_path):
+        with pytest.raises(ValueError, match="scoring"):
+            SpeakerStore(path=str(tmp_path / "speakers.json"), scoring="mean")
+
+
 # ---------------------------------------------------------------------------
 # profiles_exist
 # ---------------------------------------------------------------------------
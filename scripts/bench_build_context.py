@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Prompt-build latency of RobotMemory.build_context.
+
+Fills a throwaway memory with a family, pets and preference facts through
+the same [MEMORY ...] annotations the conversation produces, then times
+the expand()-based build (two graph walks, served by the in-process
+mirror) against the previous implementation, which issued one
+get_neighbors query per relation and per pet, and against a cache hit
+(the graph has not changed since the last build). Also checks that both
+render the same block, line for line: get_neighbors and expand both list
+edges by relation and then name, so the two agree on order as well.
+
+Usage:
+    python scripts/bench_build_context.py
+    python scripts/bench_build_context.py --pets 5 --prefs 200 --repeat 500
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _root)
+sys.path.insert(0, os.path.join(_root, "memorylib", "src"))
+
+import numpy as np  # noqa: E402
+
+from src.lib.robot_memory import _PET_RELS, RobotMemory  # noqa: E402
+
+
+def _per_relation_context(memory: RobotMemory) -> str:
+    """build_context as it was: one get_neighbors round trip per relation and per pet."""
+    graph, user = memory.graph, memory._user_name
+    lines = []
+    for row in graph.get_neighbors(user, rel_type="parent_of", direction="in"):
+        lines.append(f"{row[0].lower()}: yes")
+    for row in graph.get_neighbors(user, rel_type="sibling_of", direction="in"):
+        lines.append(f"sibling: {row[0]}")
+    pets = graph.get_neighbors(user, rel_type="has_pet")
+    for pet_row in pets:
+        pet = pet_row[0]
+        lines.append(f"pet_name: {pet}")
+        for r in graph.get_neighbors(pet, rel_type="pet_type"):
+            lines.append(f"pet: {r[0]}")
+        for r in graph.get_neighbors(pet, rel_type="species"):
+            lines.append(f"pet_species: {r[0]}")
+    if not pets:
+        for row in graph.get_neighbors(user, rel_type="has_pet_type"):
+            lines.append(f"pet: {row[0]}")
+    for row in graph.get_neighbors(user):
+        if row[2] not in _PET_RELS:
+            lines.append(f"{row[2]}: {row[0]}")
+    if not lines:
+        return ""
+    return f"Facts about {user}:\n" + "\n".join(f"- {line}" for line in lines)
+
+
+def _fill(memory: RobotMemory, pets: int, prefs: int) -> None:
+    memory.process_annotations('[MEMORY profile called="Kabs" age="5" mama="yes" dada="Papa" sibling="Mira"]')
+    for i in range(pets):
+        memory.process_annotations(f'[MEMORY preference pet="animal{i}" pet_name="Pet{i}" pet_species="kind{i}"]')
+    for i in range(prefs):
+        memory.process_annotations(f'[MEMORY preference likes_{i % 7}="thing{i}"]')
+
+
+def _median_us(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pets", type=int, default=2)
+    parser.add_argument("--prefs", type=int, default=30, help="preference facts on the user")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = RobotMemory(base_dir=tmp, user_name="Kabir")
+        _fill(memory, args.pets, args.prefs)
+        legacy, current = _per_relation_context(memory), memory.build_context()
+        assert legacy == current, "facts blocks differ"
+        print(f"{len(current.splitlines()) - 1} facts, {len(current)} chars, {args.pets} pets")
+        print(f"{'implementation':>16} {'lookups':>8} {'p50 latency':>14}")
+        print(f"{'per-relation':>16} {4 + 2 * args.pets:>8} {_median_us(lambda: _per_relation_context(memory), args.repeat):>11.0f} us")
+        print(f"{'expand':>16} {2:>8} {_median_us(memory._read_context, args.repeat):>11.0f} us")
+        print(f"{'cached':>16} {0:>8} {_median_us(memory.build_context, args.repeat):>11.0f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+#!/bin/bash
+# This script downloads the ONNX export of all-MiniLM-L6-v2 for the episodic memory embedder.
+# Point EMBEDDING_ONNX_DIR at the result (set EMBEDDING_ONNX_QUANTIZED=true for the int8 graph).
+
+BASE_URL="https://huggingface.co/sentence-transformers/all-MiniLM-L6-v2/resolve/main"
+MODELS_ROOT="models"
+FINAL_DIR_NAME="$MODELS_ROOT/all-MiniLM-L6-v2"
+FILES=(
+    "tokenizer.json"
+    "onnx/model.onnx"
+    "onnx/model_qint8_arm64.onnx"
+    "onnx/model_quint8_avx2.onnx"
+)
+
+# Check if the model directory already exists
+if [ -d "$FINAL_DIR_NAME" ]; then
+    echo "Model directory '$FINAL_DIR_NAME' already exists. Skipping download."
+    exit 0
+fi
+
+mkdir -p "$FINAL_DIR_NAME/onnx"
+
+for file in "${FILES[@]}"; do
+    echo "Downloading $file..."
+    curl -L "$BASE_URL/$file" -o "$FINAL_DIR_NAME/$file" || exit 1
+done
+
+echo "Embedder setup complete. Set EMBEDDING_ONNX_DIR=$FINAL_DIR_NAME in your .env file."
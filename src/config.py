@@ -20,5 +20,11 @@ AUDIO_INPUT_DEVICE_INDEX = int(_device_index) if _device_index is not None else
 
 USER_NAME = os.getenv("USER_NAME", "Kabir")
 
+# Episodic memory embedder
+# Set EMBEDDING_ONNX_DIR to a directory from scripts/download_embedder.sh to
+# embed with ONNX Runtime instead of PyTorch (much lighter on the Pi).
+EMBEDDING_ONNX_DIR = os.getenv("EMBEDDING_ONNX_DIR")
+EMBEDDING_ONNX_QUANTIZED = os.getenv("EMBEDDING_ONNX_QUANTIZED", "false").lower() == "true"
+
 BRAVE_API_KEY = os.getenv("BRAVE_API_KEY")
 
@@ -2,9 +2,11 @@ import logging
 import os
 import re
 from datetime import datetime
-from typing import Optional
+from functools import partial
+from typing import Callable, Optional
 
 from memorylib import MemoryManager
+from memorylib.embedders import OnnxEmbedder
 
 from .. import config
 
@@ -17,64 +19,57 @@ _BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..",
 
 _PET_RELS = {"has_pet", "has_pet_type"}
 
+_FAMILY_RELS = ["parent_of", "sibling_of"]
+_PET_DETAIL_RELS = {"pet_type", "species"}
+
 
 def strip_annotations(text: str) -> str:
     return _MEMORY_BLOCK_RE.sub("", text).strip()
 
 
+def _latest(rows: list) -> Optional[str]:
+    """The neighbour whose edge was written last; edges from older stores have no last_seen and lose."""
+    if not rows:
+        return None
+    return max(rows, key=lambda row: row[3].get("last_seen", datetime.min))[0]
+
+
 class RobotMemory(MemoryManager):
     """
     MemoryManager subclass with robot-specific annotation parsing and
     context formatting for the child-robot use case.
+
+    The facts block and robot name are cached against graph.generation, so
+    building the system prompt only walks the graph after it changed; a
+    child's graph is small, so lookups and walks use the in-process mirror.
+    Children repeat themselves across sessions, so the episodic embedding
+    cache is kept on disk (persist_cache).
     """
 
     def __init__(self, base_dir: str = _BASE_DIR, user_name: Optional[str] = None):
-        super().__init__(base_dir)
+        embedder = None
+        if config.EMBEDDING_ONNX_DIR:
+            embedder = partial(OnnxEmbedder, config.EMBEDDING_ONNX_DIR, quantized=config.EMBEDDING_ONNX_QUANTIZED)
+        super().__init__(base_dir, embedder=embedder, graph_mirror=True, persist_cache=True)
         self._user_name = user_name or config.USER_NAME
-        self.graph.upsert_entity(self._user_name, "person")
-        self.graph.upsert_entity("Robot", "robot")
+        self._graph_cache: dict = {}  # key -> (graph generation, value)
+        self.graph.upsert_entities([(self._user_name, "person"), ("Robot", "robot")])
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
     def get_robot_name(self) -> Optional[str]:
-        rows = self.graph.get_neighbors("Robot", rel_type="named")
-        return rows[0][0] if rows else None
+        return self._cached("robot_name", self._read_robot_name)
 
     def build_context(self, query: str = "") -> str:  # type: ignore[override]
-        user = self._user_name
-        lines = []
-
-        for row in self.graph.get_neighbors(user, rel_type="parent_of", direction="in"):
-            lines.append(f"{row[0].lower()}: yes")
-        for row in self.graph.get_neighbors(user, rel_type="sibling_of", direction="in"):
-            lines.append(f"sibling: {row[0]}")
-
-        pets = self.graph.get_neighbors(user, rel_type="has_pet")
-        for pet_row in pets:
-            pet = pet_row[0]
-            lines.append(f"pet_name: {pet}")
-            for r in self.graph.get_neighbors(pet, rel_type="pet_type"):
-                lines.append(f"pet: {r[0]}")
-            for r in self.graph.get_neighbors(pet, rel_type="species"):
-                lines.append(f"pet_species: {r[0]}")
-
-        if not pets:
-            for row in self.graph.get_neighbors(user, rel_type="has_pet_type"):
-                lines.append(f"pet: {row[0]}")
-
-        for row in self.graph.get_neighbors(user):
-            rel = row[2]
-            if rel in _PET_RELS:
-                continue
-            lines.append(f"{rel}: {row[0]}")
-
-        if not lines:
-            return ""
-
-        bullet_list = "\n".join(f"- {line}" for line in lines)
-        return f"Facts about {user}:\n{bullet_list}"
+        """
+        The facts block: parents, siblings, each pet with its type and
+        species, then the user's other facts grouped by relation. Names
+        are sorted within each group, so the block does not depend on the
+        order the facts were learned in.
+        """
+        return self._cached("context", self._read_context)
 
     def record_turn(self, user_text: str, robot_text: str, speaker_name: Optional[str] = None) -> None:
         """Record a conversation turn with speaker attribution."""
@@ -82,80 +77,134 @@ class RobotMemory(MemoryManager):
         self.record_exchange(user_text, robot_text, metadata=metadata)
         if speaker_name and speaker_name != self._user_name:
             date = datetime.now().strftime("%Y-%m-%d")
-            self.graph.upsert_entity(speaker_name, "person")
-            self.graph.upsert_entity(date, "date")
-            self.graph.upsert_relation(speaker_name, "last_seen", date)
+            with self.graph.transaction():
+                self.graph.upsert_entities([(speaker_name, "person"), (date, "date")])
+                self.graph.upsert_relation(speaker_name, "last_seen", date)
 
     def process_annotations(self, text: str) -> str:
-        """Extract [MEMORY ...] tags, write to graph, return clean text."""
+        """Extract [MEMORY ...] tags, write to graph in one transaction, return clean text."""
+        blocks = []
         for block in _MEMORY_BLOCK_RE.finditer(text):
             raw = block.group(0)
             type_match = _STORE_TYPE_RE.match(raw)
             if not type_match:
                 continue
-            store_type = type_match.group(1)
-            pairs = dict(_KV_RE.findall(raw))
-            self._write_to_graph(store_type, pairs)
+            blocks.append((type_match.group(1), dict(_KV_RE.findall(raw))))
+        if blocks:
+            with self.graph.transaction():
+                for store_type, pairs in blocks:
+                    self._write_to_graph(store_type, pairs)
         return strip_annotations(text)
 
     # ------------------------------------------------------------------
     # Internal
     # ------------------------------------------------------------------
 
+    def _cached(self, key: str, compute: Callable):
+        """Return compute(), reusing the last result until graph.generation moves."""
+        generation = self.graph.generation
+        hit = self._graph_cache.get(key)
+        if hit is not None and hit[0] == generation:
+            return hit[1]
+        value = compute()
+        self._graph_cache[key] = (generation, value)
+        return value
+
+    def _read_robot_name(self) -> Optional[str]:
+        return _latest(self.graph.get_neighbors("Robot", rel_type="named"))
+
+    def _read_context(self) -> str:
+        user = self._user_name
+        # parent_of / sibling_of edges into the user, then every edge out of
+        # the user plus the next hop, which holds each pet's pet_type / species.
+        family = self.graph.expand(user, hops=1, rel_types=_FAMILY_RELS, direction="in")
+        edges = self.graph.expand(user, hops=2)
+        incoming: dict = {rel: [src for src, r, _ in family if r == rel] for rel in _FAMILY_RELS}
+        outgoing = [(rel, dst) for src, rel, dst in edges if src == user]
+        pet_facts: dict = {}  # (pet, pet_type | species) -> values
+        for src, rel, dst in edges:
+            if src != user and rel in _PET_DETAIL_RELS:
+                pet_facts.setdefault((src, rel), []).append(dst)
+
+        lines = [f"{name.lower()}: yes" for name in incoming["parent_of"]]
+        lines += [f"sibling: {name}" for name in incoming["sibling_of"]]
+
+        pets = [name for rel, name in outgoing if rel == "has_pet"]
+        for pet in pets:
+            lines.append(f"pet_name: {pet}")
+            lines += [f"pet: {v}" for v in pet_facts.get((pet, "pet_type"), [])]
+            lines += [f"pet_species: {v}" for v in pet_facts.get((pet, "species"), [])]
+
+        if not pets:
+            lines += [f"pet: {name}" for rel, name in outgoing if rel == "has_pet_type"]
+
+        lines += [f"{rel}: {name}" for rel, name in outgoing if rel not in _PET_RELS]
+
+        if not lines:
+            return ""
+
+        bullet_list = "\n".join(f"- {line}" for line in lines)
+        return f"Facts about {user}:\n{bullet_list}"
+
     def _write_to_graph(self, store_type: str, pairs: dict) -> None:
         user = self._user_name
         pairs = dict(pairs)
+        entities: list[tuple[str, str]] = []  # (name, type)
+        relations: list[tuple[str, str, str]] = []  # (from, rel_type, to)
 
         if store_type == "profile":
             for key, value in pairs.items():
                 if key == "called":
-                    self.graph.upsert_entity(value, "alias")
-                    self.graph.upsert_relation(user, "called", value)
+                    entities.append((value, "alias"))
+                    relations.append((user, "called", value))
                 elif key == "age":
-                    self.graph.upsert_entity(value, "value")
-                    self.graph.upsert_relation(user, "age", value)
+                    entities.append((value, "value"))
+                    relations.append((user, "age", value))
                 elif key == "robot_name":
-                    self.graph.upsert_entity(value, "robot_name")
-                    self.graph.upsert_relation("Robot", "named", value)
+                    entities.append((value, "robot_name"))
+                    relations.append(("Robot", "named", value))
                 elif key in ("mama", "dada"):
                     name = value if value.lower() != "yes" else key.capitalize()
-                    self.graph.upsert_entity(name, "person")
-                    self.graph.upsert_relation(name, "parent_of", user)
+                    entities.append((name, "person"))
+                    relations.append((name, "parent_of", user))
                 elif key == "sibling":
-                    self.graph.upsert_entity(value, "person")
-                    self.graph.upsert_relation(value, "sibling_of", user)
+                    entities.append((value, "person"))
+                    relations.append((value, "sibling_of", user))
                 else:
-                    self.graph.upsert_entity(value, "value")
-                    self.graph.upsert_relation(user, key, value)
+                    entities.append((value, "value"))
+                    relations.append((user, key, value))
                 logger.info(f"[Memory] Profile fact: {key}={value}")
 
         else:  # preference
             pet_name = pairs.pop("pet_name", None)
             if pet_name:
-                self.graph.upsert_entity(pet_name, "pet")
-                self.graph.upsert_relation(user, "has_pet", pet_name)
+                entities.append((pet_name, "pet"))
+                relations.append((user, "has_pet", pet_name))
                 if "pet" in pairs:
                     v = pairs.pop("pet")
-                    self.graph.upsert_entity(v, "value")
-                    self.graph.upsert_relation(pet_name, "pet_type", v)
+                    entities.append((v, "value"))
+                    relations.append((pet_name, "pet_type", v))
                 if "pet_species" in pairs:
                     v = pairs.pop("pet_species")
-                    self.graph.upsert_entity(v, "value")
-                    self.graph.upsert_relation(pet_name, "species", v)
+                    entities.append((v, "value"))
+                    relations.append((pet_name, "species", v))
             elif "pet" in pairs:
                 v = pairs.pop("pet")
-                self.graph.upsert_entity(v, "value")
-                self.graph.upsert_relation(user, "has_pet_type", v)
+                entities.append((v, "value"))
+                relations.append((user, "has_pet_type", v))
 
             if "pet_species" in pairs:
                 v = pairs.pop("pet_species")
                 existing = self.graph.get_neighbors(user, rel_type="has_pet")
-                target = existing[-1][0] if existing else user
-                self.graph.upsert_entity(v, "value")
-                self.graph.upsert_relation(target, "species", v)
+                target = _latest(existing) or user
+                entities.append((v, "value"))
+                relations.append((target, "species", v))
 
             for key, value in pairs.items():
-                self.graph.upsert_entity(value, "topic")
-                self.graph.upsert_relation(user, key, value)
+                entities.append((value, "topic"))
+                relations.append((user, key, value))
                 logger.info(f"[Memory] Preference: {key}={value}")
 
+        self.graph.upsert_entities(entities)
+        seen = {"last_seen": datetime.now()}
+        self.graph.upsert_relations((*relation, seen) for relation in relations)
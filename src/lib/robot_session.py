@@ -107,7 +107,7 @@ class RobotSession:
         loop = asyncio.get_running_loop()
         sentence_queue: asyncio.Queue = asyncio.Queue()
 
-        speaker_name = self._memory.speaker.identify(wav) if self._memory.speaker else None
+        speaker_name = self._identify_speaker(wav)
 
         def store_turn(user_text, robot_text, user_label, assistant_label):
             self._memory.record_turn(user_text, robot_text, speaker_name=speaker_name)
@@ -145,6 +145,15 @@ class RobotSession:
 
         yield {"type": "state", "state": "sleeping"}
 
+    def _identify_speaker(self, wav: bytes):
+        """Identify the speaker unless the voice model is still warming up."""
+        if self._memory.speaker is None:
+            return None
+        if not self._memory.ready("speaker"):
+            logger.info("[Session] Speaker model still loading; skipping identification")
+            return None
+        return self._memory.speaker.identify(wav)
+
     async def _after_response(self) -> AsyncIterator[dict]:
         self._wake.reset()
         self._recorder = CommandRecorder()
@@ -19,6 +19,8 @@ def create_app(camera=None, speaker=None) -> FastAPI:
     app = FastAPI()
 
     memory = RobotMemory()
+    memory.warm_up()
+    app.add_event_handler("shutdown", memory.close)
 
     if camera is not None:
         if not any(t.name == "capture_image" for t in CHILD_ROBOT_CONFIG.tools):
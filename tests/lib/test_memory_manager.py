@@ -1,3 +1,5 @@
+import gc
+
 import pytest
 
 from src.lib.robot_memory import RobotMemory, strip_annotations
@@ -83,6 +85,108 @@ class TestRobotMemory:
         assert "pet_name: Jetty" in ctx
         assert "pet: fish" in ctx
 
+    def test_build_context_full_block(self, memory):
+        memory.process_annotations('[MEMORY profile called="Kabs" mama="yes" sibling="Mira"]')
+        memory.process_annotations('[MEMORY preference pet="fish" pet_name="Jetty" pet_species="zebra loach"]')
+        memory.process_annotations('[MEMORY preference likes="trucks"]')
+        assert memory.build_context() == (
+            "Facts about Kabir:\n"
+            "- mama: yes\n"
+            "- sibling: Mira\n"
+            "- pet_name: Jetty\n"
+            "- pet: fish\n"
+            "- pet_species: zebra loach\n"
+            "- called: Kabs\n"
+            "- likes: trucks"
+        )
+
+    def test_build_context_orders_by_relation_then_name(self, memory):
+        memory.process_annotations('[MEMORY preference likes="trains"]')
+        memory.process_annotations('[MEMORY profile mama="yes" called="Kabs" dada="yes"]')
+        memory.process_annotations('[MEMORY preference pet="cat" pet_name="Tom" likes="dinosaurs"]')
+        memory.process_annotations('[MEMORY preference pet="dog" pet_name="Biscuit"]')
+        assert memory.build_context() == (
+            "Facts about Kabir:\n"
+            "- dada: yes\n"
+            "- mama: yes\n"
+            "- pet_name: Biscuit\n"
+            "- pet: dog\n"
+            "- pet_name: Tom\n"
+            "- pet: cat\n"
+            "- called: Kabs\n"
+            "- likes: dinosaurs\n"
+            "- likes: trains"
+        )
+
+    def test_build_context_groups_details_by_pet(self, memory):
+        memory.process_annotations('[MEMORY preference pet="fish" pet_name="Jetty"]')
+        memory.process_annotations('[MEMORY preference pet="dog" pet_name="Biscuit" pet_species="beagle"]')
+        lines = memory.build_context().splitlines()
+        jetty, biscuit = lines.index("- pet_name: Jetty"), lines.index("- pet_name: Biscuit")
+        assert lines[jetty + 1] == "- pet: fish"
+        assert lines[biscuit + 1:biscuit + 3] == ["- pet: dog", "- pet_species: beagle"]
+
+    def test_build_context_pet_type_without_named_pet(self, memory):
+        memory.process_annotations('[MEMORY preference pet="cat"]')
+        assert memory.build_context() == "Facts about Kabir:\n- pet: cat"
+
+    @pytest.mark.parametrize("reopen", [False, True])
+    def test_pet_species_attaches_to_latest_pet(self, tmp_path, reopen):
+        memory = RobotMemory(base_dir=str(tmp_path), user_name="Kabir")
+        memory.process_annotations('[MEMORY preference pet="cat" pet_name="Tom"]')
+        memory.process_annotations('[MEMORY preference pet="dog" pet_name="Biscuit"]')
+        if reopen:
+            del memory
+            gc.collect()  # close graph.db before reopening it
+            memory = RobotMemory(base_dir=str(tmp_path), user_name="Kabir")
+        memory.process_annotations('[MEMORY preference pet_species="tabby"]')
+        assert [row[0] for row in memory.graph.get_neighbors("Biscuit", rel_type="species")] == ["tabby"]
+        assert memory.graph.get_neighbors("Tom", rel_type="species") == []
+
+    def test_build_context_is_the_same_after_reopen(self, tmp_path):
+        memory = RobotMemory(base_dir=str(tmp_path), user_name="Kabir")
+        memory.process_annotations('[MEMORY preference likes="trains"]')
+        memory.process_annotations('[MEMORY profile called="Kabs" sibling="Mira" dada="yes" mama="yes"]')
+        memory.process_annotations('[MEMORY preference pet="dog" pet_name="Tom" likes="dinosaurs"]')
+        memory.process_annotations('[MEMORY preference pet="fish" pet_name="Biscuit" pet_species="beagle"]')
+        live = memory.build_context()
+        del memory
+        gc.collect()
+        assert RobotMemory(base_dir=str(tmp_path), user_name="Kabir").build_context() == live
+
+    def test_build_context_is_cached_until_graph_changes(self, memory, monkeypatch):
+        memory.process_annotations('[MEMORY preference likes="trucks"]')
+        first = memory.build_context()
+        calls = []
+        expand = memory.graph.expand
+        monkeypatch.setattr(memory.graph, "expand", lambda *a, **kw: calls.append(a) or expand(*a, **kw))
+        assert memory.build_context() == first
+        assert calls == []
+        memory.process_annotations('[MEMORY preference likes_more="trains"]')
+        assert "likes_more: trains" in memory.build_context()
+        assert len(calls) == 2
+
+    def test_robot_name_survives_invalidation(self, memory):
+        memory.process_annotations('[MEMORY profile robot_name="Beep"]')
+        assert memory.get_robot_name() == "Beep"
+        assert memory.get_robot_name() == "Beep"
+        memory.graph.upsert_entity("Robot", "robot")  # any write invalidates
+        assert memory.get_robot_name() == "Beep"
+
+    def test_concurrent_sessions(self, memory):
+        from concurrent.futures import ThreadPoolExecutor
+
+        def session(i):
+            for t in range(10):
+                memory.process_annotations(f'Nice! [MEMORY preference likes_{i}="thing{t}"]')
+                assert f"likes_{i}: thing{t}" in memory.build_context()
+                memory.get_robot_name()
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            list(pool.map(session, range(6)))
+        context = memory.build_context()
+        assert all(f"likes_{i}: thing{t}" in context for i in range(6) for t in range(10))
+
     def test_get_robot_name_none_by_default(self, memory):
         assert memory.get_robot_name() is None
 
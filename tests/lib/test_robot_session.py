@@ -1,8 +1,10 @@
 import asyncio
 import time
+from concurrent.futures import Future
 
 import pytest
 
+from memorylib import MemoryManager
 from src.lib.robot_session import (
     _BUSY,
     _FOLLOW_UP,
@@ -75,6 +77,34 @@ class _Memory:
         pass
 
 
+class _SpeakerStore:
+    ready = False
+
+    def __init__(self):
+        self.identified = []
+
+    def identify(self, wav):
+        self.identified.append(wav)
+        return "Kabir"
+
+
+class _WarmingMemory(_Memory):
+    """_Memory with a speaker store whose warm-up future the test controls."""
+
+    episodic = None
+    face = None
+    ready = MemoryManager.ready
+    _model_stores = MemoryManager._model_stores
+
+    def __init__(self):
+        self.speaker = _SpeakerStore()
+        self.warmups = {"speaker": Future()}
+        self.audio_tags = []
+
+    def save_audio(self, wav, **tags):
+        self.audio_tags.append(tags)
+
+
 # ---------------------------------------------------------------------------
 # Fixture
 # ---------------------------------------------------------------------------
@@ -227,3 +257,27 @@ class TestAfterResponse:
         session._llm = _LLM(sleep_requested=True)
         self._run_response(session)
         assert session._llm._sleep_requested is False
+
+
+# ---------------------------------------------------------------------------
+# Speaker identification while the voice model warms up
+# ---------------------------------------------------------------------------
+
+class TestSpeakerWarmUp:
+    @pytest.fixture
+    def memory(self, session):
+        session._memory = _WarmingMemory()
+        session._state = _PUSH_TO_TALK
+        session._recorder = _Recorder(finalize_result=b"fakeWAV")
+        return session._memory
+
+    def test_skipped_while_warm_up_pending(self, session, memory):
+        run(session.handle({"type": "push_to_talk_end"}))
+        assert memory.speaker.identified == []
+        assert memory.audio_tags == [{"speaker_name": None}]
+
+    def test_identifies_once_warm_up_done(self, session, memory):
+        memory.warmups["speaker"].set_result(None)
+        run(session.handle({"type": "push_to_talk_end"}))
+        assert memory.speaker.identified == [b"fakeWAV"]
+        assert memory.audio_tags == [{"speaker_name": "Kabir"}]